@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
+import sys
 import matplotlib.pyplot as plot
 import mplcursors
-import pandas
+
+# loader shared with the support tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'support'))
+import fdr_data  # noqa: E402
+import fdr_events  # noqa: E402
+import fdr_plot  # noqa: E402
+import fdr_profile  # noqa: E402
 
 # initialize argument parser
 parser = argparse.ArgumentParser(description='FDR file analysis')
@@ -15,24 +23,70 @@ parser.add_argument(
     required=True,
     help='FDR file to analyze'
 )
+parser.add_argument(
+    '--from',
+    type=float,
+    dest='start',
+    help='Start of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--to',
+    type=float,
+    dest='end',
+    help='End of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--phase',
+    dest='phase',
+    choices=fdr_events.PHASE_NAMES,
+    help='Analyze only the first occurrence of this flight phase (replaces --from/--to)'
+)
+parser.add_argument(
+    '--profile',
+    nargs='?',
+    const=fdr_profile.DEFAULT_PROFILE,
+    dest='profile',
+    help='Write the timing profile (Chrome trace) to this file (default: {})'.format(fdr_profile.DEFAULT_PROFILE)
+)
 # parse arguments
 args = parser.parse_args()
 
-# load csv file
-fdr = pandas.read_csv(args.file[0])
+# time the steps of the analysis if requested
+fdr_profile.start(args.profile)
+
+# columns used by this chart, only these are parsed
+columns = [
+    'ap_sm.time.simulation_time', 'data.inputElevator', 'fbw.sim.data.alpha_deg',
+    'fbw.sim.data_speeds_aoa.alpha_filtered_deg', 'fbw.sim.data_speeds_aoa.alpha_prot_deg',
+    'fbw.sim.data_speeds_aoa.alpha_floor_deg', 'fbw.sim.data_speeds_aoa.alpha_max_deg', 'fbw.sim.data.Theta_deg',
+    'fbw.sim.data.eta_deg', 'athr.data.engine_N1_1_percent', 'athr.data.engine_N1_2_percent',
+    'data.high_aoa_protection', 'data.alpha_floor_condition',
+]
+
+# load csv file, only the rows of the selected time range or flight phase
+fdr_profile.phase('load')
+start, end = args.start, args.end
+if args.phase:
+    times = fdr_events.find_phase(args.file[0], args.phase)
+    if times is None:
+        print("Flight phase not found: " + args.phase)
+    else:
+        start, end = times
+fdr = fdr_data.read_range(args.file[0], columns, start, end)
 
 # get simulation time
-time = fdr['fbw.sim.time.simulation_time']
+time = fdr['ap_sm.time.simulation_time']
 
 # support math text
 plot.rcParams.update({'mathtext.default': 'regular'})
 
 # create figure with subplots
+fdr_profile.phase('plot')
 figure, axes = plot.subplots(5, sharex=True)
 
 # axis 1
 ax1 = axes[0]
-ax1.plot(time, fdr['fbw.sim.input.delta_eta_pos'], label=r'$\delta\eta$')
+ax1.plot(time, fdr['data.inputElevator'], label=r'$\delta\eta$')
 ax1.grid(True)
 ax1.set_ylim(-1, +1)
 ax1.legend()
@@ -66,8 +120,8 @@ ax4.legend()
 
 # axis 5
 ax5 = axes[4]
-ax5.plot(time, fdr['fbw.sim.data_computed.high_aoa_prot_active'], label='high_aoa_prot_active')
-ax5.plot(time, fdr['fbw.sim.data_computed.alpha_floor_command'], label='alpha_floor_command')
+ax5.plot(time, fdr['data.high_aoa_protection'], label='high_aoa_prot_active')
+ax5.plot(time, fdr['data.alpha_floor_condition'], label='alpha_floor_command')
 ax5.grid(True)
 ax5.set_ylim(-0.1, 1.1)
 ax5.legend()
@@ -96,8 +150,15 @@ mplcursors.cursor(multiple=True).connect(
     )
 )
 
+# decimate to the screen resolution, redone on zoom
+fdr_profile.phase('render')
+fdr_plot.decimate(figure)
+
 # maximize window
 plot.get_current_fig_manager().window.state('zoomed')
 
+# draw once for the profile and write it
+fdr_profile.finish(figure)
+
 # show it
 plot.show()
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
+import sys
 import matplotlib.pyplot as plot
 import mplcursors
-import pandas
+
+# loader shared with the support tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'support'))
+import fdr_data  # noqa: E402
+import fdr_events  # noqa: E402
+import fdr_plot  # noqa: E402
+import fdr_profile  # noqa: E402
 
 # initialize argument parser
 parser = argparse.ArgumentParser(description='FDR file analysis')
@@ -15,47 +23,92 @@ parser.add_argument(
     required=True,
     help='FDR file to analyze'
 )
+parser.add_argument(
+    '--from',
+    type=float,
+    dest='start',
+    help='Start of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--to',
+    type=float,
+    dest='end',
+    help='End of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--phase',
+    dest='phase',
+    choices=fdr_events.PHASE_NAMES,
+    help='Analyze only the first occurrence of this flight phase (replaces --from/--to)'
+)
+parser.add_argument(
+    '--profile',
+    nargs='?',
+    const=fdr_profile.DEFAULT_PROFILE,
+    dest='profile',
+    help='Write the timing profile (Chrome trace) to this file (default: {})'.format(fdr_profile.DEFAULT_PROFILE)
+)
 # parse arguments
 args = parser.parse_args()
 
-# load csv file
-fdr = pandas.read_csv(args.file[0])
+# time the steps of the analysis if requested
+fdr_profile.start(args.profile)
+
+# columns used by this chart, only these are parsed
+columns = [
+    'ap_sm.time.simulation_time', 'data.inputElevator', 'data.inputAileron',
+    'data.inputRudder', 'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push',
+    'ap_sm.input.AP_DISCONNECT_push', 'data.high_aoa_protection',
+    'data.alpha_floor_condition', 'ap_sm.output.enabled_AP1', 'ap_sm.output.enabled_AP2',
+]
+
+# load csv file, only the rows of the selected time range or flight phase
+fdr_profile.phase('load')
+start, end = args.start, args.end
+if args.phase:
+    times = fdr_events.find_phase(args.file[0], args.phase)
+    if times is None:
+        print("Flight phase not found: " + args.phase)
+    else:
+        start, end = times
+fdr = fdr_data.read_range(args.file[0], columns, start, end)
 
 # get simulation time
-time = fdr['fbw.sim.time.simulation_time']
+time = fdr['ap_sm.time.simulation_time']
 
 # support math text
 plot.rcParams.update({'mathtext.default': 'regular'})
 
 # create figure with subplots
+fdr_profile.phase('plot')
 figure, axes = plot.subplots(5, sharex=True)
 
 # axis 1
 ax1 = axes[0]
-ax1.plot(time, fdr['fbw.sim.input.delta_eta_pos'], label=r'$\delta\eta$')
-ax1.fill_between(time, -1.0, -0.5, alpha=0.1, color='red')
-ax1.fill_between(time, -0.5, 0.5, alpha=0.1, color='green')
-ax1.fill_between(time, 0.5, 1.0, alpha=0.1, color='red')
+ax1.plot(time, fdr['data.inputElevator'], label=r'$\delta\eta$')
+ax1.axhspan(-1.0, -0.5, alpha=0.1, color='red')
+ax1.axhspan(-0.5, 0.5, alpha=0.1, color='green')
+ax1.axhspan(0.5, 1.0, alpha=0.1, color='red')
 ax1.grid(True)
 ax1.set_ylim(-1.1, 1.1)
 ax1.legend()
 
 # axis 2
 ax2 = axes[1]
-ax2.plot(time, fdr['fbw.sim.input.delta_xi_pos'], label=r'$\delta\xi$')
-ax2.fill_between(time, -1.0, -0.5, alpha=0.1, color='red')
-ax2.fill_between(time, -0.5, 0.5, alpha=0.1, color='green')
-ax2.fill_between(time, 0.5, 1.0, alpha=0.1, color='red')
+ax2.plot(time, fdr['data.inputAileron'], label=r'$\delta\xi$')
+ax2.axhspan(-1.0, -0.5, alpha=0.1, color='red')
+ax2.axhspan(-0.5, 0.5, alpha=0.1, color='green')
+ax2.axhspan(0.5, 1.0, alpha=0.1, color='red')
 ax2.grid(True)
 ax2.set_ylim(-1.1, 1.1)
 ax2.legend()
 
 # axis 3
 ax3 = axes[2]
-ax3.plot(time, fdr['fbw.sim.input.delta_zeta_pos'], label=r'$\delta\zeta$')
-ax3.fill_between(time, -1.0, -0.4, alpha=0.1, color='red')
-ax3.fill_between(time, -0.4, 0.4, alpha=0.1, color='green')
-ax3.fill_between(time, 0.4, 1.0, alpha=0.1, color='red')
+ax3.plot(time, fdr['data.inputRudder'], label=r'$\delta\zeta$')
+ax3.axhspan(-1.0, -0.4, alpha=0.1, color='red')
+ax3.axhspan(-0.4, 0.4, alpha=0.1, color='green')
+ax3.axhspan(0.4, 1.0, alpha=0.1, color='red')
 ax3.grid(True)
 ax3.set_ylim(-1.1, 1.1)
 ax3.legend()
@@ -65,8 +118,8 @@ ax4 = axes[3]
 ax4.plot(time, fdr['ap_sm.input.AP_1_push'], label=r'$AP1_{push}$')
 ax4.plot(time, fdr['ap_sm.input.AP_2_push'], label=r'$AP2_{push}$')
 ax4.plot(time, fdr['ap_sm.input.AP_DISCONNECT_push'], label=r'$AP_{disconnect}$')
-ax4.plot(time, fdr['fbw.sim.data_computed.high_aoa_prot_active'], label='High-AoA')
-ax4.plot(time, fdr['fbw.sim.data_computed.alpha_floor_command'], label=r'$\alpha_{floor}$')
+ax4.plot(time, fdr['data.high_aoa_protection'], label='High-AoA')
+ax4.plot(time, fdr['data.alpha_floor_condition'], label=r'$\alpha_{floor}$')
 ax4.grid(True)
 ax4.set_ylim(-0.1, 1.1)
 ax4.legend()
@@ -103,8 +156,15 @@ mplcursors.cursor(multiple=True).connect(
     )
 )
 
+# decimate to the screen resolution, redone on zoom
+fdr_profile.phase('render')
+fdr_plot.decimate(figure)
+
 # maximize window
 plot.get_current_fig_manager().window.state('zoomed')
 
+# draw once for the profile and write it
+fdr_profile.finish(figure)
+
 # show it
 plot.show()
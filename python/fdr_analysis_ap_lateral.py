@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
+import sys
 import matplotlib.pyplot as plot
 import mplcursors
-import pandas
 from enum import Enum
 
+# loader shared with the support tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'support'))
+import fdr_data  # noqa: E402
+import fdr_events  # noqa: E402
+import fdr_plot  # noqa: E402
+import fdr_profile  # noqa: E402
+
 # initialize argument parser
 parser = argparse.ArgumentParser(description='FDR file analysis')
 parser.add_argument(
@@ -16,14 +24,58 @@ parser.add_argument(
     required=True,
     help='FDR file to analyze'
 )
+parser.add_argument(
+    '--from',
+    type=float,
+    dest='start',
+    help='Start of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--to',
+    type=float,
+    dest='end',
+    help='End of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--phase',
+    dest='phase',
+    choices=fdr_events.PHASE_NAMES,
+    help='Analyze only the first occurrence of this flight phase (replaces --from/--to)'
+)
+parser.add_argument(
+    '--profile',
+    nargs='?',
+    const=fdr_profile.DEFAULT_PROFILE,
+    dest='profile',
+    help='Write the timing profile (Chrome trace) to this file (default: {})'.format(fdr_profile.DEFAULT_PROFILE)
+)
 # parse arguments
 args = parser.parse_args()
 
-# load csv file
-fdr = pandas.read_csv(args.file[0])
+# time the steps of the analysis if requested
+fdr_profile.start(args.profile)
+
+# columns used by this chart, only these are parsed
+columns = [
+    'ap_sm.time.simulation_time', 'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push',
+    'ap_sm.input.AP_DISCONNECT_push', 'ap_sm.input.HDG_push', 'ap_sm.input.HDG_pull', 'ap_sm.input.APPR_push',
+    'ap_sm.input.LOC_push', 'ap_sm.output.lateral_mode', 'ap_sm.output.lateral_mode_armed', 'ap_sm.input.FD_active',
+    'ap_sm.output.enabled_AP1', 'ap_sm.output.enabled_AP2',
+]
+
+# load csv file, only the rows of the selected time range or flight phase
+fdr_profile.phase('load')
+start, end = args.start, args.end
+if args.phase:
+    times = fdr_events.find_phase(args.file[0], args.phase)
+    if times is None:
+        print("Flight phase not found: " + args.phase)
+    else:
+        start, end = times
+fdr = fdr_data.read_range(args.file[0], columns, start, end)
 
 # get simulation time
-time = fdr['fbw.sim.time.simulation_time']
+time = fdr['ap_sm.time.simulation_time']
 
 # define enums
 class LateralMode(Enum):
@@ -51,6 +103,7 @@ class LateralArmed(Enum):
 plot.rcParams.update({'mathtext.default': 'regular'})
 
 # create figure with subplots
+fdr_profile.phase('plot')
 figure, axes = plot.subplots(4, sharex=True)
 
 # axis 1
@@ -129,8 +182,15 @@ mplcursors.cursor(ax3, multiple=True).connect(
     )
 )
 
+# decimate to the screen resolution, redone on zoom
+fdr_profile.phase('render')
+fdr_plot.decimate(figure)
+
 # maximize window
 plot.get_current_fig_manager().window.state('zoomed')
 
+# draw once for the profile and write it
+fdr_profile.finish(figure)
+
 # show it
 plot.show()
@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
+import sys
 import matplotlib.pyplot as plot
 import mplcursors
-import pandas
+
+# loader shared with the support tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'support'))
+import fdr_data  # noqa: E402
+import fdr_events  # noqa: E402
+import fdr_plot  # noqa: E402
+import fdr_profile  # noqa: E402
+import fdr_stats  # noqa: E402
 
 # initialize argument parser
 parser = argparse.ArgumentParser(description='FDR file analysis')
@@ -15,49 +24,96 @@ parser.add_argument(
     required=True,
     help='FDR file to analyze'
 )
+parser.add_argument(
+    '--from',
+    type=float,
+    dest='start',
+    help='Start of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--to',
+    type=float,
+    dest='end',
+    help='End of the analyzed time range (simulation time in seconds)'
+)
+parser.add_argument(
+    '--phase',
+    dest='phase',
+    choices=fdr_events.PHASE_NAMES,
+    help='Analyze only the first occurrence of this flight phase (replaces --from/--to)'
+)
+parser.add_argument(
+    '--profile',
+    nargs='?',
+    const=fdr_profile.DEFAULT_PROFILE,
+    dest='profile',
+    help='Write the timing profile (Chrome trace) to this file (default: {})'.format(fdr_profile.DEFAULT_PROFILE)
+)
 # parse arguments
 args = parser.parse_args()
 
-# load csv file
-fdr = pandas.read_csv(args.file[0])
+# time the steps of the analysis if requested
+fdr_profile.start(args.profile)
+
+# columns used by this chart, only these are parsed
+columns = [
+    'ap_sm.time.simulation_time', 'data.simulation_rate', 'ap_sm.time.dt',
+]
+
+# load csv file, only the rows of the selected time range or flight phase
+fdr_profile.phase('load')
+start, end = args.start, args.end
+if args.phase:
+    times = fdr_events.find_phase(args.file[0], args.phase)
+    if times is None:
+        print("Flight phase not found: " + args.phase)
+    else:
+        start, end = times
+fdr = fdr_data.read_range(args.file[0], columns, start, end)
+
+# print the frame rate statistics
+fdr_profile.phase('derive')
+for name, value in fdr_stats.frame_health(fdr).items():
+    print("{:30s} {}".format(name, value))
 
 # get simulation time
-time = fdr['fbw.sim.time.simulation_time']
+time = fdr['ap_sm.time.simulation_time']
 
 # support math text
 plot.rcParams.update({'mathtext.default': 'regular'})
 
 # create figure with subplots
+fdr_profile.phase('plot')
 figure, axes = plot.subplots(4, sharex=True)
 
 # axis 1
 ax1 = axes[0]
-ax1.plot(time, fdr['fbw.sim.data.simulation_rate'], label='Simulation Rate')
+ax1.plot(time, fdr['data.simulation_rate'], label='Simulation Rate')
 ax1.grid(True)
 ax1.set_ylim(-0.1, 8)
 ax1.legend()
 
 # axis 2
 ax2 = axes[1]
-ax2.plot(time, fdr['fbw.sim.time.dt'], label=r'$\deltaT$')
-ax2.fill_between(time, 1/10, 1, alpha=0.1, color='red')
-ax2.fill_between(time, 1/15, 1/10, alpha=0.1, color='orange')
+ax2.plot(time, fdr['ap_sm.time.dt'], label=r'$\delta T$')
+ax2.axhspan(1/10, 1, alpha=0.1, color='red')
+ax2.axhspan(1/15, 1/10, alpha=0.1, color='orange')
 ax2.grid(True)
 ax2.set_ylim(0, 0.2)
 ax2.legend()
 
 # axis 3
 ax3 = axes[2]
-ax3.plot(time, fdr['fbw.sim.data.simulation_rate'] / fdr['fbw.sim.time.dt'], label='FPS')
+ax3.plot(time, fdr['data.simulation_rate'] / fdr['ap_sm.time.dt'], label='FPS')
 ax3.grid(True)
 ax3.set_ylim(0, 80)
 ax3.legend()
 
 # axis 3
 ax4 = axes[3]
-ax4.plot(time, 1 / fdr['fbw.sim.time.dt'], label='Sample Rate')
-ax4.fill_between(time, 10, 15, alpha=0.1, color='orange')
-ax4.fill_between(time, 0, 10, alpha=0.1, color='red')
+ax4.plot(time, 1 / fdr['ap_sm.time.dt'], label='Sample Rate')
+ax4.axhspan(10, 15, alpha=0.1, color='orange')
+ax4.axhspan(0, 10, alpha=0.1, color='red')
 ax4.grid(True)
 ax4.set_ylim(0, 80)
 ax4.legend()
@@ -86,8 +142,15 @@ mplcursors.cursor(multiple=True).connect(
     )
 )
 
+# decimate to the screen resolution, redone on zoom
+fdr_profile.phase('render')
+fdr_plot.decimate(figure)
+
 # maximize window
 plot.get_current_fig_manager().window.state('zoomed')
 
+# draw once for the profile and write it
+fdr_profile.finish(figure)
+
 # show it
 plot.show()
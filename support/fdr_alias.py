@@ -0,0 +1,92 @@
+import pandas as pd
+
+# The charts and scripts use the canonical field names, the names of the current format. Older format versions
+# recorded some of these fields under other names (see docs/data_fields.txt). The alias table maps the canonical names
+# onto the physical columns of a file of such a version, so the same chart code reads every format version:
+#
+#   {last version with these names: {canonical name: physical name}}
+#
+# Fields which are recorded under their canonical name (e.g. ap_sm.time.simulation_time, which the old format records
+# next to fbw.sim.time.simulation_time) need no alias.
+# The old format also records the aircraft state of the fly-by-wire (fbw.sim.data.*) next to the one of the autopilot
+# (ap_sm.data.*, athr.data.*). These are different signals, so they are not aliased: the scripts plotting the old
+# fly-by-wire laws read fbw.sim.data.* by that name.
+ALIASES = {
+    22: {
+        'data.inputElevator': 'fbw.sim.input.delta_eta_pos',
+        'data.inputAileron': 'fbw.sim.input.delta_xi_pos',
+        'data.inputRudder': 'fbw.sim.input.delta_zeta_pos',
+        'data.simulation_rate': 'fbw.sim.data.simulation_rate',
+        'data.ambient_wind_velocity_kn': 'fbw.sim.data.ambient_wind_velocity_kn',
+        'data.ambient_pressure_mbar': 'fbw.sim.data.ambient_pressure_mbar',
+        'data.total_air_temperature_celsius': 'fbw.sim.data.total_air_temperature_celsius',
+        'data.ice_structure_percent': 'fbw.sim.data.ice_structure_percent',
+        'data.slew_on': 'fbw.sim.data.slew_on',
+        'data.wasPaused': 'fbw.sim.data.pause_on',
+        'data.high_aoa_protection': 'fbw.sim.data_computed.high_aoa_prot_active',
+        'data.alpha_floor_condition': 'fbw.sim.data_computed.alpha_floor_command',
+    },
+}
+
+# A field only recorded up to a version. Converted files (CSV, Parquet, store) do not record the version, it is
+# detected from their fields.
+VERSION_FIELDS = {
+    22: 'fbw.sim.time.simulation_time',
+}
+
+
+# Detects the format version of a header by the fields only older versions recorded. Returns None for the current
+# versions.
+def detect_version(header):
+    for version in sorted(VERSION_FIELDS):
+        if VERSION_FIELDS[version] in header:
+            return version
+    return None
+
+
+# Returns the alias table (canonical name -> physical name) of a format version, empty for the current versions.
+def aliases(version):
+    if version is None:
+        return {}
+    for last in sorted(ALIASES):
+        if int(version) <= last:
+            return ALIASES[last]
+    return {}
+
+
+# Returns the header of a file with the canonical names of its aliased columns.
+def canonical_header(header, version=None):
+    if version is None:
+        version = detect_version(header)
+    physical = {name: canonical for canonical, name in aliases(version).items()}
+    return [physical.get(column, column) for column in header]
+
+
+# Maps the requested columns (canonical or physical names) to the physical columns of a header. Columns the file does
+# not have are left out.
+def resolve(columns, header, version=None):
+    if version is None:
+        version = detect_version(header)
+    table = aliases(version)
+    present = set(header)
+    mapping = {}
+    for column in columns:
+        if column in present:
+            mapping[column] = column
+        elif table.get(column) in present:
+            mapping[column] = table[column]
+    return mapping
+
+
+# Returns the physical columns of a mapping from resolve(), in order and without duplicates.
+def physical_columns(mapping):
+    return list(dict.fromkeys(mapping.values()))
+
+
+# Names the physical columns of a frame by the requested names. The columns of the new frame are views of the columns
+# of the frame (no data is copied). Returns the frame itself if no column is renamed.
+def rename(frame, mapping):
+    if all(name == physical for name, physical in mapping.items()) and len(mapping) == len(frame.columns):
+        return frame
+    return pd.DataFrame({name: frame[physical] for name, physical in mapping.items() if physical in frame},
+                        copy=False)
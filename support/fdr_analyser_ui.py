@@ -1,15 +1,111 @@
 import argparse
+import json
+import multiprocessing
 import os
+import queue
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from enum import Enum
 
-import gmplot
-import matplotlib.pyplot as plt
-import mplcursors
-import pandas as pd
 # from past.builtins import raw_input
-import PySimpleGUI as sg
+# matplotlib, mplcursors, gmplot and PySimpleGUI take most of the start-up time. They are imported by the functions
+# which draw a chart or open the window, so the other commands start fast (see fdr_startup.py). The same holds for
+# pandas: fdr_data, fdr_events, fdr_fleet and fdr_stats are imported by the functions which load data, so --help and
+# the version command do not import it.
+
+import fdr_decoder
+import fdr_map
+import fdr_phase
+import fdr_plot
+import fdr_profile
+
+# Value of the FDR2CSV EXE field when the FDR file is decoded in-process instead of with a fdr2csv exe
+NATIVE_DECODER = 'native'
+
+# Columns required by each chart. Only these columns are parsed when a chart is drawn.
+CHART_COLUMNS = {
+    'map': [
+        'ap_sm.data.aircraft_position.lat', 'ap_sm.data.aircraft_position.lon',
+        'ap_sm.data.flight_phase', 'ap_law.ap_on',
+    ],
+    'ap': [
+        'ap_sm.time.simulation_time', 'ap_sm.time.dt',
+        'ap_sm.data.H_ft', 'ap_sm.data.V_gnd_kn', 'ap_sm.data.V_ias_kn', 'ap_sm.data.Psi_magnetic_deg',
+        'ap_sm.data.total_weight_kg', 'data.ambient_wind_velocity_kn', 'data.ambient_pressure_mbar',
+        'data.total_air_temperature_celsius', 'athr.data.ISA_degC', 'athr.data.OAT_degC',
+        'data.ice_structure_percent', 'ap_sm.data.throttle_lever_1_pos', 'ap_sm.data.throttle_lever_2_pos',
+        'ap_sm.data.flaps_handle_index', 'ap_sm.data.Theta_deg', 'ap_sm.data.Phi_deg',
+        'data.inputElevator', 'data.inputAileron', 'data.inputRudder',
+        'ap_law.ap_on', 'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push', 'ap_sm.input.AP_DISCONNECT_push',
+        'data.high_aoa_protection', 'data.alpha_floor_condition', 'data.failuresActive', 'data.wasPaused',
+        'data.slew_on', 'ap_sm.input.FDR_event', 'data.simulation_rate',
+    ],
+    'input': [
+        'ap_sm.time.simulation_time',
+        'ap_sm.data.H_ft', 'ap_sm.data.V_gnd_kn', 'ap_sm.data.V_ias_kn', 'ap_sm.data.Psi_magnetic_deg',
+        'ap_sm.data.throttle_lever_1_pos', 'ap_sm.data.throttle_lever_2_pos',
+        'engine.engineEngine1N1', 'engine.engineEngine2N1', 'data.gear_handle_pos', 'data.park_brake_lever_pos',
+        'ap_sm.data.flaps_handle_index', 'data.spoilers_handle_pos', 'data.spoilers_armed',
+        'data.inputElevator', 'data.inputAileron', 'data.inputRudder',
+        'data.brake_pedal_left_pos', 'data.brake_pedal_right_pos', 'data.brake_left_sim_pos',
+        'data.brake_right_sim_pos', 'data.autobrake_armed_mode', 'data.autobrake_decel_light',
+        'ap_sm.input.FDR_event',
+    ],
+    'thr': [
+        'ap_sm.time.simulation_time',
+        'ap_sm.data.H_ft', 'ap_sm.data.V_gnd_kn', 'ap_sm.data.V_ias_kn', 'ap_sm.data.Psi_magnetic_deg',
+        'athr.output.status', 'athr.input.ATHR_push', 'athr.input.ATHR_disconnect',
+        'ap_sm.output.autothrust_mode', 'athr.output.mode', 'athr.input.TLA_1_deg', 'athr.input.TLA_2_deg',
+        'athr.output.sim_throttle_lever_1_pos', 'athr.output.sim_throttle_lever_2_pos',
+        'athr.output.N1_TLA_1_percent', 'athr.output.N1_c_1_percent', 'athr.data.commanded_engine_N1_1_percent',
+        'athr.output.N1_TLA_2_percent', 'athr.output.N1_c_2_percent', 'athr.data.commanded_engine_N1_2_percent',
+        'engine.engineEngine1N1', 'engine.engineEngine2N1',
+        'ap_sm.data.flaps_handle_index', 'athr.output.is_in_reverse_1', 'athr.output.is_in_reverse_2',
+    ],
+    'apl': [
+        'ap_sm.time.simulation_time',
+        'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push', 'ap_sm.input.AP_DISCONNECT_push',
+        'ap_sm.input.HDG_push', 'ap_sm.input.HDG_pull', 'ap_sm.input.APPR_push', 'ap_sm.input.LOC_push',
+        'ap_sm.output.lateral_mode', 'ap_sm.output.lateral_mode_armed',
+        'ap_sm.input.FD_active', 'ap_sm.output.enabled_AP1', 'ap_sm.output.enabled_AP2',
+    ],
+    'apv': [
+        'ap_sm.time.simulation_time',
+        'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push', 'ap_sm.input.AP_DISCONNECT_push',
+        'ap_sm.input.ALT_push', 'ap_sm.input.ALT_pull', 'ap_sm.input.VS_push', 'ap_sm.input.VS_pull',
+        'ap_sm.input.EXPED_push', 'ap_sm.input.APPR_push', 'ap_sm.input.LOC_push',
+        'ap_sm.output.vertical_mode', 'ap_sm.output.vertical_mode_armed',
+        'ap_sm.input.FD_active', 'ap_sm.output.enabled_AP1', 'ap_sm.output.enabled_AP2',
+    ],
+    'athr': [
+        'ap_sm.time.simulation_time',
+        'athr.input.ATHR_push', 'athr.input.ATHR_disconnect', 'ap_sm.output.autothrust_mode',
+        'athr.input.TLA_1_deg', 'athr.input.TLA_2_deg',
+        'athr.output.status', 'athr.output.mode', 'athr.output.mode_message',
+    ],
+}
+
+# Columns a chart shows if they are recorded but can be drawn without (older format versions)
+OPTIONAL_COLUMNS = {
+    'map': ['ap_sm.data.flight_phase', 'ap_law.ap_on'],
+}
+
+# Chart drawn by each analysis button
+BUTTON_CHARTS = {
+    '__ANALYZE_MAP__': 'map',
+    '__ANALYZE_AP__': 'ap',
+    '__ANALYZE_APL__': 'apl',
+    '__ANALYZE_APV__': 'apv',
+    '__ANALYZE_ATHR__': 'athr',
+    '__ANALYZE_INPUTS__': 'input',
+    '__ANALYZE_THRUST__': 'thr',
+}
+
+# Chart drawn by each choice of the command line menu
+MENU_CHARTS = {1: 'map', 2: 'ap', 4: 'apl', 5: 'apv', 6: 'athr', 7: 'input', 8: 'thr'}
 
 
 def main(argv):
@@ -39,7 +135,14 @@ def main(argv):
         nargs=1,
         dest='exefile',
         required=False,
-        help='EXE file for fdr2csv conversion (only for ui)'
+        help='EXE file for fdr2csv conversion (only for ui), "native" to use the built-in decoder'
+    )
+    parser.add_argument(
+        '-native',
+        '--native',
+        help='Decode with the built-in decoder instead of the fdr2csv exe if a format descriptor exists for the '
+             'version (Version Detection and batch mode)',
+        action="store_true"
     )
     parser.add_argument(
         '-c',
@@ -47,7 +150,11 @@ def main(argv):
         nargs=1,
         dest='command',
         required=False,
-        help='FDR Chart Command (map, ap, aoa, apl, apv, athr, thr)'
+        help='FDR Chart Command (map, ap, aoa, apl, apv, athr, thr), cache to write the columnar cache, store to '
+             'write the memory mapped store for files larger than the memory, events to write the table of mode and '
+             'switch transitions, disconnects to classify the AP disconnects of a file or directory, health for the '
+             'frame rate statistics of a file or directory, fleet for statistics over all files of a directory or '
+             'version to detect the version of the FDR file'
     )
     parser.add_argument(
         '-cl',
@@ -55,15 +162,137 @@ def main(argv):
         help='Command line usage - no ui',
         action="store_true"
     )
+    parser.add_argument(
+        '-flight',
+        '--flight',
+        help='Analyze the whole flight if it was recorded into several files (same directory, named by start time)',
+        action="store_true"
+    )
+    parser.add_argument(
+        '-from',
+        '--from',
+        type=float,
+        dest='start',
+        help='Start of the charted time range (simulation time in seconds)'
+    )
+    parser.add_argument(
+        '-to',
+        '--to',
+        type=float,
+        dest='end',
+        help='End of the charted time range (simulation time in seconds)'
+    )
+    parser.add_argument(
+        '-phase',
+        '--phase',
+        dest='phase',
+        choices=fdr_phase.PHASE_NAMES,
+        help='Chart only the first occurrence of this flight phase, also limits events, disconnects and health to it'
+    )
+    parser.add_argument(
+        '-mapcolour',
+        '--mapcolour',
+        dest='mapcolour',
+        choices=['phase', 'ap', 'none'],
+        default='phase',
+        help='Colour the map track by flight phase, AP engagement or not at all (default: phase)'
+    )
+    parser.add_argument(
+        '-tolerance',
+        '--tolerance',
+        type=float,
+        dest='tolerance',
+        default=fdr_map.DEFAULT_TOLERANCE,
+        help='Metres the simplified map track may deviate from the recorded track (default: {:.0f})'.format(
+            fdr_map.DEFAULT_TOLERANCE)
+    )
+    parser.add_argument(
+        '-offlinemap',
+        '--offlinemap',
+        help='Draw the map without Google Maps (no network or browser needed)',
+        action="store_true"
+    )
+    parser.add_argument(
+        '-window',
+        '--window',
+        type=float,
+        dest='window',
+        default=30.0,
+        help='Seconds before and after each AP disconnect exported by the disconnects command (default: 30)'
+    )
+    parser.add_argument(
+        '-reducers',
+        '--reducers',
+        dest='reducers',
+        help='Comma separated statistics computed by the fleet command (land, athr_idle, touchdown, default: all)'
+    )
+    parser.add_argument(
+        '-batch',
+        '--batchdir',
+        nargs=1,
+        dest='batchdir',
+        required=False,
+        help='Convert all FDR files in this directory in parallel - no ui'
+    )
+    parser.add_argument(
+        '-render',
+        '--renderdir',
+        nargs=1,
+        dest='renderdir',
+        required=False,
+        help='Write chart images for all CSV/Parquet files in this directory in parallel - no ui'
+    )
+    parser.add_argument(
+        '-charts',
+        '--charts',
+        dest='charts',
+        default=','.join(RENDER_CHARTS),
+        help='Comma separated charts written by render mode (default: {})'.format(','.join(RENDER_CHARTS))
+    )
+    parser.add_argument(
+        '-format',
+        '--format',
+        dest='format',
+        default='png',
+        help='Image format written by render mode (png, svg, pdf, geojson for the map only, default: png)'
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        dest='jobs',
+        required=False,
+        help='Number of parallel conversions, renderings or reductions for batch, render and fleet mode (default: '
+             'number of cores)'
+    )
+    parser.add_argument(
+        '-profile',
+        '--profile',
+        nargs='?',
+        const=fdr_profile.DEFAULT_PROFILE,
+        dest='profile',
+        metavar='FILE',
+        help='Write the timing of load, parse, derive, plot and render and the peak memory as a Chrome trace to this '
+             'file (default: {}), the workers of batch, render and fleet mode are not traced'.format(
+                 fdr_profile.DEFAULT_PROFILE)
+    )
     # parse arguments
     args = parser.parse_args()
+    # time the steps of the analysis if requested
+    fdr_profile.start(args.profile)
 
     # #############################
     # Interface chooser
     # #############################
 
+    # convert a whole directory
+    if args.batchdir:
+        batch_convert(args.batchdir[0], args.jobs, args.native)
+    # write the charts of a whole directory
+    elif args.renderdir:
+        render_directory(args.renderdir[0], args.charts.split(','), args.format, args.jobs)
     # use ui
-    if not args.command and not args.commandline:
+    elif not args.command and not args.commandline:
         userinterface_windows(args)
     # use command line
     elif args.commandline:
@@ -71,22 +300,88 @@ def main(argv):
     # execute only one command and exit
     else:
         single_command(args)
+    fdr_profile.finish()
 
 
 # Executes a single command given via command line option and exits.
 def single_command(args):
+    if args.command[0] == 'version':
+        if not args.fdrfile:
+            print("No FDR file provided")
+            exit()
+        value, error = check_version(args.fdrfile[0])
+        print("Version " + value)
+        return
+
+    import fdr_data
+    import fdr_events
+
     if not args.csvfile:
         print("No CSV file provided")
         exit()
 
-    if not os.path.isfile(args.csvfile[0]):
+    if args.phase and args.command[0] in ('cache', 'store', 'fleet'):
+        print("-phase does not apply to the {} command".format(args.command[0]))
+        exit()
+
+    if args.command[0] == 'disconnects' and os.path.isdir(args.csvfile[0]):
+        write_disconnects(args.csvfile[0], os.path.join(args.csvfile[0], 'fdr_disconnects.csv'), args)
+        return
+
+    if args.command[0] == 'fleet':
+        write_fleet(args.csvfile[0], args)
+        return
+
+    if args.command[0] == 'health' and os.path.isdir(args.csvfile[0]):
+        write_health(args.csvfile[0], os.path.join(args.csvfile[0], 'fdr_health.csv'), args)
+        return
+
+    # a file or a memory mapped store directory
+    if not os.path.exists(args.csvfile[0]):
         print("CSV file not found: " + args.csvfile[0])
         exit()
 
-    fdr = pd.read_csv(args.csvfile[0])
+    if args.command[0] == 'store':
+        print("Memory Mapped Store")
+        print("Store written: " + fdr_data.write_store(args.csvfile[0]))
+        return
+
+    if args.command[0] == 'cache':
+        print("Columnar Cache")
+        cachefile = fdr_data.write_cache(args.csvfile[0])
+        if cachefile:
+            print("Cache written: " + cachefile)
+        return
+
+    if args.command[0] == 'events':
+        print("Mode Transitions")
+        start, end = args.start, args.end
+        if args.phase:
+            start, end = fdr_events.find_phase(args.csvfile[0], args.phase, args.flight) or (start, end)
+        events = fdr_events.load_events(args.csvfile[0], args.flight, start, end)
+        eventsfile = os.path.splitext(args.csvfile[0])[0] + '_events.csv'
+        events.to_csv(eventsfile, index=False)
+        modes = events[events['field'].isin(list(fdr_events.FIELD_ENUMS) + ['ap_law.ap_on'])]
+        for event in modes.itertuples():
+            print("{:10.2f} {:35s} {} -> {}".format(event.time, event.field, event.old_name, event.new_name))
+        print("{} events written: {}".format(len(events), eventsfile))
+        return
+
+    if args.command[0] == 'health':
+        write_health(args.csvfile[0], os.path.splitext(args.csvfile[0])[0] + '_health.csv', args)
+        return
+
+    if args.command[0] == 'disconnects':
+        write_disconnects(args.csvfile[0], os.path.splitext(args.csvfile[0])[0] + '_disconnects.csv', args)
+        return
+
+    if args.command[0] in CHART_COLUMNS and not chart_available(args.csvfile[0], args.command[0]):
+        return
+
+    fdr = chart_frame(args.csvfile[0], args.command[0], args.flight, args.start, args.end, args.phase)
     if args.command[0] == 'map':
         print("Map")
-        draw_map_graph(fdr)
+        draw_map_graph(fdr, colour_by=args.mapcolour, tolerance=args.tolerance, offline=args.offlinemap)
     elif args.command[0] == 'ap':
         print("AP Disconnect Chart")
         draw_ap_graph(fdr)
@@ -112,12 +407,118 @@ def single_command(args):
         print("Unknown command: " + args.command[0])
 
 
+# Classifies the AP disconnects of a file or directory, exports the windows around them and writes the summary.
+def write_disconnects(path, summaryfile, args):
+    import fdr_events
+    print("AP Disconnects")
+    disconnects = fdr_events.scan_disconnects(path, args.window, CHART_COLUMNS['ap'], args.flight, args.phase)
+    disconnects.to_csv(summaryfile, index=False)
+    for disconnect in disconnects.itertuples():
+        print("{} {:10.2f} {:12s} {}".format(disconnect.file, disconnect.time, disconnect.cause, disconnect.inputs))
+    print("{} disconnects written: {}".format(len(disconnects), summaryfile))
+
+
+# Computes the frame rate statistics of a file or directory, prints them and writes them to a table.
+def write_health(path, summaryfile, args):
+    import fdr_stats
+    print("Frame Rate Health")
+    health = fdr_stats.scan_health(path, args.flight, args.phase)
+    health.to_csv(summaryfile, index=False)
+    for row in health.to_dict('records'):
+        print(row.pop('file'))
+        for name, value in row.items():
+            print("  {:30s} {}".format(name, value))
+    print("{} {} written: {}".format(len(health), 'flights' if args.flight else 'files', summaryfile))
+
+
+# Aggregates the statistics of the reducers over all converted files of a directory and writes the summary.
+def write_fleet(directory, args):
+    import fdr_fleet
+    print("Fleet Statistics")
+    if not os.path.isdir(directory):
+        print("Not a directory: " + directory)
+        return
+    names = args.reducers.split(',') if args.reducers else list(fdr_fleet.REDUCERS)
+    unknown = [name for name in names if name not in fdr_fleet.REDUCERS]
+    if unknown:
+        print("Unknown reducers: " + ', '.join(unknown))
+        return
+    summary = fdr_fleet.aggregate(directory, names, args.jobs)
+    summaryfile = fdr_fleet.write_summary(os.path.join(directory, 'fdr_fleet.json'), summary)
+    print("{} files".format(summary['files']))
+    for name, count in summary['counts'].items():
+        print("  {:40s} {}".format(name, count))
+    for name, entry in summary['values'].items():
+        quantiles = ' '.join('{} {:.1f}'.format(q, value) for q, value in entry.get('quantiles', {}).items())
+        print("  {:40s} n={} {}".format(name, entry['count'], quantiles))
+    print("Summary written: " + summaryfile)
+
+
+# Returns the columns of a chart missing in a header.
+def missing_columns(chart, header):
+    return [column for column in CHART_COLUMNS[chart]
+            if column not in header and column not in OPTIONAL_COLUMNS.get(chart, [])]
+
+
+# Returns the charts which cannot be drawn for a file with the columns they miss. Only the header of the file is read,
+# no data is parsed. All charts are unavailable if the file does not exist or is no FDR data file.
+def unavailable_charts(path):
+    import fdr_data
+    try:
+        header = fdr_data.probe_header(path)
+    except (OSError, ValueError, fdr_decoder.FormatError):
+        return {chart: [] for chart in CHART_COLUMNS}
+    unavailable = {}
+    for chart in CHART_COLUMNS:
+        missing = missing_columns(chart, header)
+        if missing:
+            unavailable[chart] = missing
+    return unavailable
+
+
+# Checks the header of a file for the columns of a chart before any data is parsed and prints the missing ones.
+def chart_available(csvfile, chart):
+    missing = unavailable_charts(csvfile).get(chart)
+    if missing is None:
+        return True
+    if missing:
+        print("Chart not available for this file (older format version?), missing fields: " + ', '.join(missing))
+    else:
+        print("No FDR data file: " + csvfile)
+    return False
+
+
+# Loads the columns needed by a chart, either of the given file only or of the whole flight the file belongs to.
+# If a time range or a flight phase is given only its rows are read.
+def chart_frame(csvfile, command, flight=False, start=None, end=None, phase=None):
+    import fdr_data
+    import fdr_events
+    columns = CHART_COLUMNS.get(command, [])
+    if phase:
+        times = fdr_events.find_phase(csvfile, phase, flight)
+        if times is None:
+            print("Flight phase not found: " + phase)
+        else:
+            start, end = times
+    if flight:
+        return fdr_data.load_flight(csvfile, columns, start, end)
+    return fdr_data.load_range(csvfile, columns, start, end)
+
+
+# Converts the text of a time input field to seconds, None if empty or invalid.
+def time_value(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
 # Presents a command line driven menu of options. No graphical interface.
 def userinterface_commandline(args):
-    if not args.file:
+    if not args.csvfile:
         print("No CSV file provided")
         exit()
-    fdr = pd.read_csv(args.file[0])
+    csvfile = args.csvfile[0]
     while True:  # use while True
         menu_choice = ('Enter 1 for Route Map\n'
                        'Enter 2 for AP Disconnect Chart\n'
@@ -130,30 +531,33 @@ def userinterface_commandline(args):
                        'Enter 0 to Exit\n'
                        'Choice: ')
         choice = int(input(menu_choice))
+        if choice in MENU_CHARTS and not chart_available(csvfile, MENU_CHARTS[choice]):
+            continue
         if choice == 1:
             print("Map")
-            draw_map_graph(fdr)
+            fdr = chart_frame(csvfile, 'map', args.flight, args.start, args.end, args.phase)
+            draw_map_graph(fdr, colour_by=args.mapcolour, tolerance=args.tolerance, offline=args.offlinemap)
         elif choice == 2:
             print("AP Disconnect Chart")
-            draw_ap_graph(fdr)
+            draw_ap_graph(chart_frame(csvfile, 'ap', args.flight, args.start, args.end, args.phase))
         # elif choice == 3:
         #     print("Angle of Attack Chart")
         #     draw_aoa_graph(fdr)
         elif choice == 4:
             print("AP Lateral Chart")
-            draw_ap_lateral_graph(fdr)
+            draw_ap_lateral_graph(chart_frame(csvfile, 'apl', args.flight, args.start, args.end, args.phase))
         elif choice == 5:
             print("AP Vertical Chart")
-            draw_ap_vertical_graph(fdr)
+            draw_ap_vertical_graph(chart_frame(csvfile, 'apv', args.flight, args.start, args.end, args.phase))
         elif choice == 6:
             print("A/THR Chart")
-            draw_ath_graph(fdr)
+            draw_ath_graph(chart_frame(csvfile, 'athr', args.flight, args.start, args.end, args.phase))
         elif choice == 7:
             print("Controller Inputs Chart")
-            draw_ath_graph(fdr)
+            draw_input_graph(chart_frame(csvfile, 'input', args.flight, args.start, args.end, args.phase))
         elif choice == 8:
             print("Thrust Chart")
-            draw_thrust_graph(fdr)
+            draw_thrust_graph(chart_frame(csvfile, 'thr', args.flight, args.start, args.end, args.phase))
         elif choice == 0:
             print("Exit")
             break
@@ -161,6 +565,7 @@ def userinterface_commandline(args):
 
 # Presents a graphical Windows interface.
 def userinterface_windows(args):
+    import PySimpleGUI as sg
     exefile = ''
     fdrfile = ''
     csvfile = ''
@@ -185,12 +590,21 @@ def userinterface_windows(args):
                sg.Text('n/a', key='version')],
 
               [sg.Text('FDR2CSV EXE', size=(15, 1)), sg.Input(default_text=exefile, key='exefile', enable_events=True),
-               sg.FileBrowse(target='exefile', file_types=(('ALL Files', '*.exe'),))],
+               sg.FileBrowse(target='exefile', file_types=(('ALL Files', '*.exe'),)),
+               sg.Checkbox('Built-in decoder', key='native', default=args.native)],
 
-              [sg.Button('FDR 2 CSV', key='__FDR2CSV__', disabled=True)],
+              [sg.Button('FDR 2 CSV', key='__FDR2CSV__', disabled=True),
+               sg.Button('Cancel', key='__CANCEL__', disabled=True),
+               sg.Checkbox('Write columnar cache', key='cache', default=True)],
 
               [sg.Text('CSV File', size=(15, 1)), sg.Input(default_text=csvfile, key='csvfile', enable_events=True),
-               sg.FileBrowse(target='csvfile', file_types=(('ALL Files', '*.csv'),), )],
+               sg.FileBrowse(target='csvfile', file_types=(('ALL Files', '*.csv *.parquet'),), )],
+
+              [sg.Checkbox('Whole flight (stitch split files)', key='flight', default=args.flight),
+               sg.Text('From (s)'), sg.Input(default_text=args.start or '', key='start', size=(10, 1)),
+               sg.Text('To (s)'), sg.Input(default_text=args.end or '', key='end', size=(10, 1)),
+               sg.Text('Phase'), sg.Combo([''] + fdr_phase.PHASE_NAMES, default_value=args.phase or '', key='phase',
+                                          readonly=True)],
 
               [sg.HorizontalSeparator(color='black')],
               [sg.Button('Flight Route Map', key='__ANALYZE_MAP__', disabled=True)],
@@ -213,6 +627,12 @@ def userinterface_windows(args):
 
     # Create the window
     window = sg.Window("FDR Analysis Tool", layout)
+    # conversions run in the background
+    worker = ConversionWorker(window)
+    conversions = 0
+    # file whose charts were last checked and the charts unavailable for it
+    probed = None
+    unavailable = CHART_COLUMNS
 
     # ##########################
     # UI event loop
@@ -231,30 +651,24 @@ def userinterface_windows(args):
             window['__VERSIONCHECK__'].update(disabled=True)
 
         # Update fdr2vsc button's state
-        if os.path.isfile(values.get('exefile')) and os.path.isfile(values.get('fdrfile')):
+        if (os.path.isfile(values.get('exefile')) or values.get('exefile') == NATIVE_DECODER) \
+                and os.path.isfile(values.get('fdrfile')):
             window['__FDR2CSV__'].update(disabled=False)
         else:
             window['__FDR2CSV__'].update(disabled=True)
 
-        # Update analysis buttons' states
-        if os.path.isfile(values.get('csvfile')):
-            window['__ANALYZE_MAP__'].update(disabled=False)
-            window['__ANALYZE_AP__'].update(disabled=False)
-            # window['__ANALYZE_AOA__'].update(disabled=False)
-            window['__ANALYZE_APV__'].update(disabled=False)
-            window['__ANALYZE_APL__'].update(disabled=False)
-            window['__ANALYZE_ATHR__'].update(disabled=False)
-            window['__ANALYZE_INPUTS__'].update(disabled=False)
-            window['__ANALYZE_THRUST__'].update(disabled=False)
-        else:
-            window['__ANALYZE_MAP__'].update(disabled=True)
-            window['__ANALYZE_AP__'].update(disabled=True)
-            # window['__ANALYZE_AOA__'].update(disabled=True)
-            window['__ANALYZE_APV__'].update(disabled=True)
-            window['__ANALYZE_APL__'].update(disabled=True)
-            window['__ANALYZE_ATHR__'].update(disabled=True)
-            window['__ANALYZE_INPUTS__'].update(disabled=True)
-            window['__ANALYZE_THRUST__'].update(disabled=True)
+        # Update analysis buttons' states - charts whose fields are not in the header of the file stay disabled. The
+        # header is only read when another file is chosen, not on every tick of the loop.
+        if values.get('csvfile') != probed:
+            probed = values.get('csvfile')
+            if os.path.isfile(probed):
+                unavailable = unavailable_charts(probed)
+                if unavailable:
+                    status_update("Not in this format version: " + ', '.join(unavailable), window)
+            else:
+                unavailable = CHART_COLUMNS
+            for button, chart in BUTTON_CHARTS.items():
+                window[button].update(disabled=chart in unavailable)
 
         # Versioncheck button pressed
         if event == '__VERSIONCHECK__':
@@ -265,48 +679,75 @@ def userinterface_windows(args):
                 status_update(value, window)
             else:
                 window['version'].update(value)
-                window['exefile'].update(get_exe_path(value))
+                if values.get('native') and fdr_decoder.has_format(value):
+                    window['exefile'].update(NATIVE_DECODER)
+                else:
+                    window['exefile'].update(get_exe_path(value))
                 status_reset(window)
             continue
 
-        # FDR2CSV button pressed
+        # FDR2CSV button pressed - queue the conversion
         if event == '__FDR2CSV__':
             print("FDR 2 CSV " + values.get('fdrfile'))
-            window['csvfile'].update("")
-            status_update("Converting...please wait!", window)
-            window.refresh()
-            value = convert(values.get('exefile'), values.get('fdrfile'))
-            status_reset(window)
-            window['csvfile'].update(value)
-            window.refresh()
+            worker.submit(values.get('exefile'), values.get('fdrfile'), values.get('cache'))
+            conversions += 1
+            window['__CANCEL__'].update(disabled=False)
+            status_update("Converting...{} queued".format(conversions), window)
+            continue
+
+        # Cancel button pressed - stop the running conversion
+        if event == '__CANCEL__':
+            worker.cancel_current()
+            continue
+
+        # Conversion progress reported by the worker
+        if event == '__CONVERT_PROGRESS__':
+            status_update(values[event], window)
+            continue
+
+        # Conversion finished
+        if event == '__CONVERT_DONE__':
+            fdrfile, value = values[event]
+            conversions -= 1
+            window['__CANCEL__'].update(disabled=conversions == 0)
+            if os.path.isfile(value):
+                status_reset(window)
+                window['csvfile'].update(value)
+                # the file may have been converted again, check its header on the next tick
+                probed = None
+            else:
+                status_update(value, window)
             continue
 
         # Analysis button pressed and valid csvfile available
         if values.get('csvfile'):
+            csvfile, flight, phase = values.get('csvfile'), values.get('flight'), values.get('phase')
+            start, end = time_value(values.get('start')), time_value(values.get('end'))
             if event == '__ANALYZE_MAP__':
                 print("Map: " + values.get('csvfile'))
-                draw_map_graph(pd.read_csv(values.get('csvfile')))
+                fdr = chart_frame(csvfile, 'map', flight, start, end, phase)
+                draw_map_graph(fdr, colour_by=args.mapcolour, tolerance=args.tolerance, offline=args.offlinemap)
             elif event == '__ANALYZE_AP__':
                 print("AP Disconnect Chart: " + values.get('csvfile'))
-                draw_ap_graph(pd.read_csv(values.get('csvfile')))
+                draw_ap_graph(chart_frame(csvfile, 'ap', flight, start, end, phase))
             # elif event == '__ANALYZE_AOA__':
             #     print("Angle of Attack Chart: " + values.get('csvfile'))
-            #     draw_aoa_graph(pd.read_csv(values.get('csvfile')))
+            #     draw_aoa_graph(fdr_data.load_frame(values.get('csvfile')))
             elif event == '__ANALYZE_APL__':
                 print("AP Lateral Chart: " + values.get('csvfile'))
-                draw_ap_lateral_graph(pd.read_csv(values.get('csvfile')))
+                draw_ap_lateral_graph(chart_frame(csvfile, 'apl', flight, start, end, phase))
             elif event == '__ANALYZE_APV__':
                 print("AP Vertical Chart: " + values.get('csvfile'))
-                draw_ap_vertical_graph(pd.read_csv(values.get('csvfile')))
+                draw_ap_vertical_graph(chart_frame(csvfile, 'apv', flight, start, end, phase))
             elif event == '__ANALYZE_ATHR__':
                 print("A/THR Chart: " + values.get('csvfile'))
-                draw_ath_graph(pd.read_csv(values.get('csvfile')))
+                draw_ath_graph(chart_frame(csvfile, 'athr', flight, start, end, phase))
             elif event == '__ANALYZE_INPUTS__':
                 print("Controller Inputs Chart: " + values.get('csvfile'))
-                draw_input_graph(pd.read_csv(values.get('csvfile')))
+                draw_input_graph(chart_frame(csvfile, 'input', flight, start, end, phase))
             elif event == '__ANALYZE_THRUST__':
                 print("Thrust Chart: " + values.get('csvfile'))
-                draw_thrust_graph(pd.read_csv(values.get('csvfile')))
+                draw_thrust_graph(chart_frame(csvfile, 'thr', flight, start, end, phase))
             continue
 
         if event == "__TIMEOUT__":
@@ -325,19 +766,14 @@ def status_reset(window):
     window['msg'].update('Status: Ok', text_color='white')
 
 
-# Calls the VersionDetection.exe tool and returns the result separated in output and error message
+# Reads the format version from the header of the fdr file and returns the result separated in output and error
+# message. The version is formatted like the fdr2csv exe names (e.g. "07").
 def check_version(fdrfile):
-    csvfile = fdrfile.replace(".fdr", ".csv")
-    # print("CSV Filename: " + csvfile)
-    command = [r"fdr2csv\VersionDetection.exe", "-g", "-i", fdrfile]
-    result = subprocess.run(command, shell=True, capture_output=True)
-    out = str(result.stdout.strip(), 'UTF-8')
-    err = str(result.stderr.strip(), 'UTF-8')
-    # print("Result out: " + out)
-    # print("Result err: " + err)
-    if out.find("Failed") != -1:
-        err = out
-    return out, err
+    try:
+        version = fdr_decoder.read_version(fdrfile)
+    except (fdr_decoder.FormatError, OSError) as error:
+        return "Failed: " + str(error), str(error)
+    return "{:02d}".format(version), ''
 
 
 # Builds the exe file name for the fdr2exe tools from the given version
@@ -348,33 +784,283 @@ def get_exe_path(version):
 
 
 # Call the fdr2csv tool to convert fdr to csv. Returns the csvfile name or error message.
-def convert(exefile, fdrfile):
+# With the native decoder the fdr file is decoded in-process into a Parquet file (CSV if pyarrow is not available).
+# The optional progress function is called with a status text while converting, setting the optional cancel event
+# (threading.Event) stops the conversion and removes the partially written file.
+def convert(exefile, fdrfile, progress=None, cancel=None):
+    started = time.monotonic()
+    if exefile == NATIVE_DECODER:
+        def decoder_progress(done, total):
+            if progress:
+                progress(progress_text(fdrfile, done, total, started))
+
+        try:
+            outfile = fdr_decoder.convert(fdrfile, decoder_progress, cancel)
+        except (fdr_decoder.FormatError, fdr_decoder.ConversionCancelled, OSError) as error:
+            outfile = str(error)
+        print("Converting done.")
+        return outfile
     csvfile = fdrfile.replace(".fdr", ".csv")
     # print("CSV Filename: " + csvfile)
     command = [exefile, "-i", fdrfile, "-o", csvfile]
     # print("CWD: " + os.getcwd())
     # print("Converting FDR to CSV with command: " + ' '.join([str(v) for v in command]))
-    result = subprocess.run(command, shell=True, capture_output=True)
-    # print("Result out: " + str(result.stdout))
-    # print("Result err: " + str(result.stderr))
+    # no shell so that cancelling terminates the converter itself
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as error:
+        return str(error)
+    while True:
+        try:
+            out, err = process.communicate(timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel is not None and cancel.is_set():
+                process.kill()
+                process.communicate()
+                if os.path.isfile(csvfile):
+                    os.remove(csvfile)
+                print("Converting cancelled.")
+                return "Conversion cancelled: " + fdrfile
+            if progress and os.path.isfile(csvfile):
+                # the size of the csv file is not known in advance, only report what has been written
+                progress("{}: {:.1f} MB written, {:.0f} s".format(
+                    os.path.basename(fdrfile), os.path.getsize(csvfile) / 1e6, time.monotonic() - started))
+    # print("Result out: " + str(out))
+    # print("Result err: " + str(err))
     print("Converting done.")
-    if result.returncode:
-        csvfile = result.stderr
+    if process.returncode:
+        csvfile = str(err.strip(), 'UTF-8')
     return csvfile
 
 
-def draw_map_graph(fdr):
-    lat_samples = fdr['ap_sm.data.aircraft_position.lat'][1::50]
-    lon_samples = fdr['ap_sm.data.aircraft_position.lon'][1::50]
-
-    gmapOne = gmplot.GoogleMapPlotter(lat_samples[1], lon_samples[1], 6)
-    gmapOne.scatter(lat_samples, lon_samples, '#ff0000', size=50, marker=False)
-    gmapOne.plot(lat_samples, lon_samples, 'blue', edge_width=2.5)
-    gmapOne.draw("map.html")
+# File name of the summary written by the batch conversion into the converted directory
+BATCH_MANIFEST = 'fdr_manifest.json'
+
+
+# Converts all fdr files of a directory with a process pool. Files whose converted output is newer than the fdr file
+# are skipped. A summary of all files is written to BATCH_MANIFEST in the directory. With native the versions which
+# have a format descriptor are decoded by the built-in decoder, all others by their fdr2csv exe.
+def batch_convert(directory, jobs=None, native=False):
+    fdrfiles = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.lower().endswith('.fdr'))
+    print("Found {} FDR files in {}".format(len(fdrfiles), directory))
+    results = []
+    pending = []
+    for fdrfile in fdrfiles:
+        version, error = check_version(fdrfile)
+        result = {'fdrfile': os.path.basename(fdrfile), 'version': None if error else version}
+        outfile = converted_file(fdrfile)
+        if error:
+            result.update(status='failed', error=error)
+        elif outfile:
+            result.update(status='up-to-date', output=os.path.basename(outfile))
+        else:
+            pending.append((fdrfile, result))
+            continue
+        print("{}: {}".format(result['fdrfile'], result['status']))
+        results.append(result)
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {}
+        for fdrfile, result in pending:
+            if native and fdr_decoder.has_format(result['version']):
+                exefile = NATIVE_DECODER
+            else:
+                exefile = get_exe_path(result['version'])
+            result['converter'] = exefile
+            futures[executor.submit(batch_convert_file, exefile, fdrfile)] = result
+        for future in as_completed(futures):
+            result = futures[future]
+            outfile, seconds = future.result()
+            if os.path.isfile(outfile):
+                result.update(status='converted', output=os.path.basename(outfile), seconds=round(seconds, 1))
+            else:
+                result.update(status='failed', error=outfile)
+            print("{}: {}".format(result['fdrfile'], result['status']))
+            results.append(result)
+
+    results.sort(key=lambda entry: entry['fdrfile'])
+    with open(os.path.join(directory, BATCH_MANIFEST), 'w') as file:
+        json.dump({'directory': os.path.abspath(directory), 'files': results}, file, indent=2)
+    print("Manifest written: " + os.path.join(directory, BATCH_MANIFEST))
+
+
+# Converts one file in a batch worker process and writes the columnar cache for a CSV output. Returns the output file
+# name (or error message) and the time it took.
+def batch_convert_file(exefile, fdrfile):
+    import fdr_data
+    started = time.monotonic()
+    outfile = convert(exefile, fdrfile)
+    if os.path.isfile(outfile) and outfile.endswith('.csv'):
+        fdr_data.write_cache(outfile)
+    return outfile, time.monotonic() - started
+
+
+# Returns the converted file (Parquet or CSV) of a fdr file if it is at least as new as the fdr file.
+def converted_file(fdrfile):
+    for extension in ('.parquet', '.csv'):
+        outfile = os.path.splitext(fdrfile)[0] + extension
+        if os.path.isfile(outfile) and os.path.getmtime(outfile) >= os.path.getmtime(fdrfile):
+            return outfile
+    return None
+
+
+# Writes the chart images of all converted files (CSV or Parquet) of a directory with a process pool, one worker per
+# file. Only recordings are submitted (see fdr_data.data_files()), not the tables the tools write into the directory.
+# Charts which are newer than their file are skipped.
+def render_directory(directory, charts, image_format='png', jobs=None):
+    import fdr_data
+    unknown = [chart for chart in charts if chart not in RENDER_CHARTS]
+    if unknown:
+        print("Unknown charts: " + ', '.join(unknown))
+        return
+    datafiles = fdr_data.data_files(directory)
+    print("Found {} files in {}".format(len(datafiles), directory))
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {executor.submit(render_file, datafile, charts, image_format): datafile for datafile in datafiles}
+        for future in as_completed(futures):
+            for chart, result in future.result():
+                print("{} {}: {}".format(os.path.basename(futures[future]), chart, result))
+
+
+# Renders charts of one file in a worker process without a window. The charts are checked against the header first,
+# then the file is loaded once with the columns of all charts which can be drawn. Returns a list of (chart, image file
+# or error message).
+def render_file(datafile, charts, image_format):
+    import matplotlib
+    import fdr_data
+    matplotlib.use('Agg')
+    outputs = {chart: '{}_{}.{}'.format(os.path.splitext(datafile)[0], chart, image_format) for chart in charts}
+    charts = [chart for chart in charts
+              if not os.path.isfile(outputs[chart]) or os.path.getmtime(outputs[chart]) < os.path.getmtime(datafile)]
+    if not charts:
+        return [('all', 'up-to-date')]
+    header = fdr_data.read_header(datafile)
+    if fdr_data.TIME_COLUMN not in header:
+        return [('all', 'skipped, no FDR data')]
+    results = []
+    drawable = []
+    for chart in charts:
+        missing = missing_columns(chart, header)
+        if image_format == 'geojson' and chart != 'map':
+            results.append((chart, 'skipped, geojson is written for the map only'))
+        elif missing:
+            results.append((chart, 'failed, missing fields: ' + ', '.join(missing)))
+        else:
+            drawable.append(chart)
+    if not drawable:
+        return results
+    columns = [column for column in dict.fromkeys(sum((CHART_COLUMNS[chart] for chart in drawable), []))
+               if column in header]
+    fdr = fdr_data.load_frame(datafile, columns)
+    for chart in drawable:
+        RENDER_CHARTS[chart](fdr, outputs[chart])
+        results.append((chart, os.path.basename(outputs[chart])))
+    return results
+
+
+# Builds the progress status text from the bytes of the fdr file processed so far.
+def progress_text(fdrfile, done, total, started):
+    text = "{}: {:.1f} / {:.1f} MB".format(os.path.basename(fdrfile), done / 1e6, total / 1e6)
+    if done:
+        remaining = (time.monotonic() - started) * (total - done) / done
+        text += ", ETA {:d}:{:02d}".format(int(remaining) // 60, int(remaining) % 60)
+    return text
+
+
+# Runs queued conversions one after the other in a background thread so the window stays responsive. Progress and
+# results are sent to the window as __CONVERT_PROGRESS__ and __CONVERT_DONE__ events.
+class ConversionWorker:
+    def __init__(self, window):
+        self.window = window
+        self.jobs = queue.Queue()
+        self.cancel = threading.Event()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, exefile, fdrfile, write_cache):
+        self.jobs.put((exefile, fdrfile, write_cache))
+
+    # Cancels the running conversion. Queued conversions are started afterwards.
+    def cancel_current(self):
+        self.cancel.set()
+
+    def run(self):
+        import fdr_data
+        while True:
+            exefile, fdrfile, write_cache = self.jobs.get()
+            self.cancel.clear()
+            outfile = convert(exefile, fdrfile, self.progress, self.cancel)
+            if write_cache and os.path.isfile(outfile) and outfile.endswith('.csv') and not self.cancel.is_set():
+                self.progress("Writing columnar cache...please wait!")
+                fdr_data.write_cache(outfile)
+            self.window.write_event_value('__CONVERT_DONE__', (fdrfile, outfile))
+
+    def progress(self, text):
+        self.window.write_event_value('__CONVERT_PROGRESS__', text)
+
+
+# Shows a chart. If an output file is given the chart is written to it instead (format by the extension, e.g. .png or
+# .svg) with the given size in inches, without a window. Returns the figure.
+def show_graph(figure, output=None, maximize=False, size=(16, 12)):
+    import matplotlib.pyplot as plt
+    # decimate to the screen resolution, redone on zoom
+    fdr_plot.decimate(figure)
+    if output:
+        figure.set_size_inches(*size)
+        with fdr_profile.span('render', 'savefig'):
+            figure.savefig(output)
+        plt.close(figure)
+        return figure
+    if maximize:
+        plt.get_current_fig_manager().window.state('zoomed')
+    if fdr_profile.enabled():
+        # draw once for the profile, the window draws again when shown
+        with fdr_profile.span('render', 'draw'):
+            figure.canvas.draw()
+        fdr_profile.flush()
+    with fdr_profile.span(fdr_profile.WINDOW_CATEGORY, 'show'):
+        plt.show()
+    return figure
+
+
+# Draws the track on a map. The track is simplified to the tolerance in metres (dense points in turns, few en route)
+# and coloured by flight phase or AP engagement (colour_by 'phase', 'ap' or 'none').
+# Google Maps is used unless the map is drawn offline or written to a file: .geojson and .svg files are written
+# directly (fast enough for thumbnails of a whole archive), other formats and the offline window with matplotlib.
+@fdr_profile.traced('plot')
+def draw_map_graph(fdr, output=None, colour_by='phase', tolerance=fdr_map.DEFAULT_TOLERANCE, offline=False):
+    runs = fdr_map.coloured_track(fdr, colour_by, tolerance)
+    if not len(runs[0][1]):
+        print("No aircraft position recorded")
+        return None
+
+    extension = os.path.splitext(output)[1].lower() if output else None
+    if extension == '.geojson':
+        return fdr_map.write_geojson(output, runs)
+    if extension == '.svg':
+        return fdr_map.write_svg(output, runs)
+    if output or offline:
+        import matplotlib.pyplot as plt
+        figure, axes = plt.subplots()
+        figure.suptitle('Route Map')
+        fdr_map.plot_track(axes, runs)
+        axes.grid(True)
+        return show_graph(figure, output, size=(8, 8))
+
+    import gmplot
+    gmapOne = gmplot.GoogleMapPlotter(runs[0][1][0], runs[0][2][0], 6)
+    for colour, lat_samples, lon_samples in runs:
+        gmapOne.plot(lat_samples, lon_samples, colour, edge_width=2.5)
+    with fdr_profile.span('render', 'map.html'):
+        gmapOne.draw("map.html")
     os.system('map.html')
 
 
-def draw_ap_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_ap_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
     # create figure with subplots
@@ -421,18 +1107,18 @@ def draw_ap_graph(fdr):
     axes[i].plot(time, fdr['data.inputElevator'], label='Elevator Input', color="black")
     axes[i].plot(time, fdr['data.inputAileron'], label='Aileron Input', color="red")
     axes[i].plot(time, fdr['data.inputRudder'], label='Rudder Input', color="green")
-    axes[i].fill_between(time, -1.0, -0.5, alpha=0.1, color='red')
-    axes[i].fill_between(time, -0.5, -0.4, alpha=0.1, color='yellow')
-    axes[i].fill_between(time, -0.5, 0.5, alpha=0.1, color='green')
-    axes[i].fill_between(time, 0.4, 0.5, alpha=0.1, color='yellow')
-    axes[i].fill_between(time, 0.5, 1.0, alpha=0.1, color='red')
+    axes[i].axhspan(-1.0, -0.5, alpha=0.1, color='red')
+    axes[i].axhspan(-0.5, -0.4, alpha=0.1, color='yellow')
+    axes[i].axhspan(-0.5, 0.5, alpha=0.1, color='green')
+    axes[i].axhspan(0.4, 0.5, alpha=0.1, color='yellow')
+    axes[i].axhspan(0.5, 1.0, alpha=0.1, color='red')
     axes[i].grid(True)
     axes[i].set_ylim(-1.1, +1.1)
     axes[i].legend()
     i += 1
     # AP
     axes[i].plot(time, fdr['ap_law.ap_on'], label='Autopilot On', color="lightblue", linewidth=1.0)
-    axes[i].fill_between(time, fdr['ap_law.ap_on'], color="lightblue")
+    fdr_plot.fill_between(axes[i], time, fdr['ap_law.ap_on'], color="lightblue")
     axes[i].plot(time, fdr['ap_sm.input.AP_1_push'], label='AP1 Push', linewidth=2.0, color="blue")
     axes[i].plot(time, fdr['ap_sm.input.AP_2_push'], label='AP2 Push', linewidth=2.0, color="green")
     axes[i].plot(time, fdr['ap_sm.input.AP_DISCONNECT_push'], label='AP Disconnect', linewidth=2.0, color="black")
@@ -477,10 +1163,13 @@ def draw_ap_graph(fdr):
     # annotations
     mplcursors.cursor()
     # show it
-    plt.show()
+    return show_graph(figure, output)
 
 
-def draw_input_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_input_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
     # create figure with subplots
@@ -529,11 +1218,11 @@ def draw_input_graph(fdr):
     axes[i].plot(time, fdr['data.inputElevator'], label='Elevator Input', color="black")
     axes[i].plot(time, fdr['data.inputAileron'], label='Aileron Input', color="red")
     axes[i].plot(time, fdr['data.inputRudder'], label='Rudder Input', color="green")
-    axes[i].fill_between(time, -1.0, -0.5, alpha=0.1, color='red')
-    axes[i].fill_between(time, -0.5, -0.4, alpha=0.1, color='yellow')
-    axes[i].fill_between(time, -0.5, 0.5, alpha=0.1, color='green')
-    axes[i].fill_between(time, 0.4, 0.5, alpha=0.1, color='yellow')
-    axes[i].fill_between(time, 0.5, 1.0, alpha=0.1, color='red')
+    axes[i].axhspan(-1.0, -0.5, alpha=0.1, color='red')
+    axes[i].axhspan(-0.5, -0.4, alpha=0.1, color='yellow')
+    axes[i].axhspan(-0.5, 0.5, alpha=0.1, color='green')
+    axes[i].axhspan(0.4, 0.5, alpha=0.1, color='yellow')
+    axes[i].axhspan(0.5, 1.0, alpha=0.1, color='red')
     axes[i].grid(True)
     axes[i].set_ylim(-1.1, +1.1)
     axes[i].legend()
@@ -563,7 +1252,7 @@ def draw_input_graph(fdr):
     axes[i].plot(time, fdr['ap_sm.input.FDR_event'], label='FDR Event', color="red", linewidth=1.0)
     axes[i].grid(False)
     axes[i].set_ylim(-0.1, +1)
-    axes[i].fill_between(time, fdr['ap_sm.input.FDR_event'], color="red")
+    fdr_plot.fill_between(axes[i], time, fdr['ap_sm.input.FDR_event'], color="red")
     axes[i].legend()
     i += 1
 
@@ -585,7 +1274,7 @@ def draw_input_graph(fdr):
     # annotations
     mplcursors.cursor()
     # show it
-    plt.show()
+    return show_graph(figure, output)
 
 
 # Thrust analysis
@@ -598,7 +1287,11 @@ def draw_input_graph(fdr):
 # engineEngine1N1 = current N1 from engine model (e.g. correct at start ig sein, where sim value is not correct)
 # athr.input.TLA_1_deg = fbw.sim.data.thrust_lever_1_pos ==> ap_sm.data.throttle_lever_1_pos???
 #
-def draw_thrust_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_thrust_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
+    import fdr_events
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
     # support math text
@@ -623,23 +1316,18 @@ def draw_thrust_graph(fdr):
     # ==================================================================================================================
     # A/THR
     axes[i].plot(time, fdr['athr.output.status'], label='ATHR Status', color="green")
-    axes[i].fill_between(time, fdr['athr.output.status'], alpha=0.1, color="green")
+    fdr_plot.fill_between(axes[i], time, fdr['athr.output.status'], alpha=0.1, color="green")
     axes[i].plot(time, fdr['athr.input.ATHR_push'], label='ATHR Push', color="blue")
     axes[i].plot(time, fdr['athr.input.ATHR_disconnect'], label='ATHR Disconnect', color="red")
     axes[i].grid(True)
     axes[i].set_ylim(-0.1, 2.1)
     axes[i].legend()
 
-    class AutothrustStatus(Enum):
-        DISENGAGED = 0
-        ENGAGED_ARMED = 1
-        ENGAGED_ACTIVE = 2
-
     mplcursors.cursor(axes[i], multiple=True).connect(
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustStatus(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustStatus(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -654,17 +1342,11 @@ def draw_thrust_graph(fdr):
     axes[i].set_ylim(-0.1, 3.1)
     axes[i].legend()
 
-    class AutothrustRequestedMode(Enum):
-        NONE = 0
-        SPEED = 1
-        THRUST_IDLE = 2
-        THRUST_CLB = 3
-
     mplcursors.cursor(axes[i], multiple=True).connect(
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustRequestedMode(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustRequestedMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -677,28 +1359,11 @@ def draw_thrust_graph(fdr):
     axes[i].set_ylim(-0.1, 14.1)
     axes[i].legend()
 
-    class AutothrustMode(Enum):
-        NONE = 0
-        MAN_TOGA = 1
-        MAN_GA_SOFT = 2
-        MAN_FLEX = 3
-        MAN_DTO = 4
-        MAN_MCT = 5
-        MAN_THR = 6
-        SPEED = 7
-        MACH = 8
-        THR_MCT = 9
-        THR_CLB = 10
-        THR_LVR = 11
-        THR_IDLE = 12
-        A_FLOOR = 13
-        TOGA_LK = 14
-
     mplcursors.cursor(axes[i], multiple=True).connect(
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustMode(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -797,7 +1462,7 @@ def draw_thrust_graph(fdr):
     # plt.get_current_fig_manager().window.state('zoomed')
     # show it
     # mplcursors.cursor()
-    plt.show()
+    return show_graph(figure, output)
 
 # deactivated as the aoa data is no longer available in the FDR
 # def draw_aoa_graph(fdr):
@@ -885,31 +1550,14 @@ def draw_thrust_graph(fdr):
 #     plt.show()
 
 
-def draw_ap_lateral_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_ap_lateral_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
+    import fdr_events
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
 
-    # define enums
-    class LateralMode(Enum):
-        NONE = 0
-        HDG = 10
-        TRACK = 11
-        NAV = 20
-        LOC_CPT = 30
-        LOC_TRACK = 31
-        LAND = 32
-        FLARE = 33
-        ROLLOUT = 34
-        RWY = 40
-        RWY_TRACK = 41
-        GA_TRACK = 50
-
-    class LateralArmed(Enum):
-        NONE = 0
-        NAV = 1
-        LOC = 2
-        NAVLOC = 3
-
     # support math text
     plt.rcParams.update({'mathtext.default': 'regular'})
 
@@ -979,7 +1627,7 @@ def draw_ap_lateral_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=LateralMode(int(sel.target[1])).name),
+                                                  y=fdr_events.LateralMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -988,58 +1636,24 @@ def draw_ap_lateral_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=LateralArmed(int(sel.target[1])).name),
+                                                  y=fdr_events.LateralArmed(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
     )
 
-    # maximize window
-    plt.get_current_fig_manager().window.state('zoomed')
-
-    # show it
-    plt.show()
+    # show it maximized
+    return show_graph(figure, output, maximize=True)
 
 
-def draw_ap_vertical_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_ap_vertical_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
+    import fdr_events
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
 
-    # define enums
-    class VerticalMode(Enum):
-        NONE = 0
-        ALT = 10
-        ALT_CPT = 11
-        OP_CLB = 12
-        OP_DES = 13
-        VS = 14
-        FPA = 15
-        ALT_CST = 20
-        ALT_CST_CPT = 21
-        CLB = 22
-        DES = 23
-        GS_CPT = 30
-        GS_TRACK = 31
-        LAND = 32
-        FLARE = 33
-        ROLLOUT = 34
-        SRS = 40
-        SRS_GA = 41
-
-    class VerticalArmed(Enum):
-        NONE = 0
-        ALT = 1
-        ALT_CST = 2
-        ALT_ALT_CST = 3
-        CLB = 4
-        ALT_CLB = 5
-        DES = 8
-        GS = 16
-        ALT_GS = 17
-        ALT_CST_GS = 18
-        CLB_GS = 20
-        DES_GS = 24
-
     # support math text
     plt.rcParams.update({'mathtext.default': 'regular'})
 
@@ -1111,7 +1725,7 @@ def draw_ap_vertical_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=VerticalMode(int(sel.target[1])).name),
+                                                  y=fdr_events.VerticalMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -1120,68 +1734,24 @@ def draw_ap_vertical_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=VerticalArmed(int(sel.target[1])).name),
+                                                  y=fdr_events.VerticalArmed(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
     )
 
-    # maximize window
-    plt.get_current_fig_manager().window.state('zoomed')
+    # show it maximized
+    return show_graph(figure, output, maximize=True)
 
-    # show it
-    plt.show()
 
-
-def draw_ath_graph(fdr):
+@fdr_profile.traced('plot')
+def draw_ath_graph(fdr, output=None):
+    import matplotlib.pyplot as plt
+    import mplcursors
+    import fdr_events
     # get simulation time
     time = fdr['ap_sm.time.simulation_time']
 
-    # define enums
-    class AutothrustRequestedMode(Enum):
-        NONE = 0
-        SPEED = 1
-        THRUST_IDLE = 2
-        THRUST_CLB = 3
-
-    class AutothrustStatus(Enum):
-        DISENGAGED = 0
-        ENGAGED_ARMED = 1
-        ENGAGED_ACTIVE = 2
-
-    class AutothrustMode(Enum):
-        NONE = 0
-        MAN_TOGA = 1
-        MAN_GA_SOFT = 2
-        MAN_FLEX = 3
-        MAN_DTO = 4
-        MAN_MCT = 5
-        MAN_THR = 6
-        SPEED = 7
-        MACH = 8
-        THR_MCT = 9
-        THR_CLB = 10
-        THR_LVR = 11
-        THR_IDLE = 12
-        A_FLOOR = 13
-        TOGA_LK = 14
-
-    class AutothrustModeMessage(Enum):
-        NONE = 0
-        THRLK = 1
-        LVRTOGA = 2
-        LVRCLB = 3
-        LVRMCT = 4
-        LVRASYM = 5
-
-    class AutothrustThrustLimit(Enum):
-        NONE = 0
-        CLB = 1
-        MCT = 2
-        FLEX = 3
-        TOGA = 4
-        REVERSE = 5
-
     # support math text
     plt.rcParams.update({'mathtext.default': 'regular'})
 
@@ -1259,7 +1829,7 @@ def draw_ath_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustRequestedMode(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustRequestedMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -1268,7 +1838,7 @@ def draw_ath_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustStatus(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustStatus(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -1277,7 +1847,7 @@ def draw_ath_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustMode(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustMode(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
@@ -1286,18 +1856,29 @@ def draw_ath_graph(fdr):
         "add",
         lambda sel: sel.annotation.set(
             text="{l:s}\n{y:s}\nt={x:.2f}".format(l=sel.artist.get_label(), x=sel.target[0],
-                                                  y=AutothrustModeMessage(int(sel.target[1])).name),
+                                                  y=fdr_events.AutothrustModeMessage(int(sel.target[1])).name),
             fontfamily='monospace',
             ma="right"
         )
     )
 
-    # maximize window
-    plt.get_current_fig_manager().window.state('zoomed')
+    # show it maximized
+    return show_graph(figure, output, maximize=True)
 
-    # show it
-    plt.show()
+
+# Charts written by render mode and their drawing functions
+RENDER_CHARTS = {
+    'map': draw_map_graph,
+    'ap': draw_ap_graph,
+    'apl': draw_ap_lateral_graph,
+    'apv': draw_ap_vertical_graph,
+    'athr': draw_ath_graph,
+    'thr': draw_thrust_graph,
+    'input': draw_input_graph,
+}
 
 
 if __name__ == "__main__":
+    # required for the batch process pool in the frozen exe
+    multiprocessing.freeze_support()
     main(sys.argv[1:])
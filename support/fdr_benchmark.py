@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import fdr_analyser_ui
+import fdr_data
+import fdr_events
+import fdr_plot
+import fdr_store
+import fdr_synthetic
+
+# Times loading, column projection, decimation, event extraction and rendering of every chart on synthetic flights
+# (see fdr_synthetic.py), so performance regressions are caught with numbers:
+#
+#   python fdr_benchmark.py                                  # one 1 h flight at 20 frames per second
+#   python fdr_benchmark.py -durations 1h 5h 12h -o results.json
+#   python fdr_benchmark.py -baseline results.json           # compare, exit with 1 on a regression
+#   python fdr_benchmark.py -only load render.ap
+#
+# Every flight is written once as CSV, Parquet and store into the work directory and reused by later runs. Each case
+# is repeated and the fastest run is compared, the files are read from the system's file cache after the first run.
+
+WORK_DIRECTORY = os.path.join(tempfile.gettempdir(), 'fdr_benchmark')
+
+# Width in pixels the series are decimated to (a full HD screen)
+DECIMATE_PIXELS = 1920
+
+# Seconds of the time range read by the range cases, from the middle of the flight
+RANGE_SECONDS = 600
+
+# Slowdown (fraction of the baseline) from which a case counts as a regression...
+DEFAULT_TOLERANCE = 0.25
+
+# ...if it is also slower by at least this many seconds (timer noise of the fast cases)
+MIN_DIFFERENCE = 0.005
+
+# Chart whose columns the projection and range cases read
+PROJECTION_CHART = 'ap'
+
+
+# Writes the synthetic flight of a duration and rate as CSV, Parquet and store unless it exists. Returns the paths.
+def flight_files(directory, duration, rate, seed):
+    directory = os.path.join(directory, '{:g}s_{:g}fps_seed{}'.format(duration, rate, seed))
+    paths = {
+        'csv': os.path.join(directory, 'csv', 'flight.csv'),
+        'parquet': os.path.join(directory, 'parquet', 'flight.parquet'),
+        'store': os.path.join(directory, 'store', 'flight' + fdr_store.STORE_EXTENSION),
+    }
+    if all(os.path.exists(path) for path in paths.values()):
+        return paths
+    print("Writing synthetic flight of {:g} s at {:g} frames per second to {}".format(duration, rate, directory))
+    for path in paths.values():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    columns = fdr_synthetic.synthetic_fields()
+    fields, shared = fdr_synthetic.flight_fields(duration, rate, seed)
+    fdr_synthetic.write_csv(paths['csv'], fdr_synthetic.synthetic_chunks(columns, fields, shared))
+    fdr_synthetic.write_parquet(paths['parquet'], fdr_synthetic.synthetic_chunks(columns, fields, shared))
+    fdr_store.write_store(paths['store'], fdr_synthetic.synthetic_chunks(columns, fields, shared))
+    return paths
+
+
+# Returns the benchmark cases of a flight: {name: function}. The frames the analysis and render cases work on are
+# loaded from the Parquet file beforehand, so these cases do not include loading.
+def flight_cases(paths, output_directory):
+    chart_columns = fdr_analyser_ui.CHART_COLUMNS
+    projection = chart_columns[PROJECTION_CHART]
+    header = fdr_data.read_header(paths['parquet'])
+    columns = sum(chart_columns.values(), []) + fdr_events.PHASE_COLUMNS + fdr_events.DISCONNECT_COLUMNS
+    fdr = fdr_data.read_columns(paths['parquet'], list(dict.fromkeys(columns)))
+    events = fdr_data.read_columns(paths['parquet'], [fdr_data.TIME_COLUMN] + fdr_events.event_columns(header))
+    time_values = fdr[fdr_data.TIME_COLUMN].to_numpy()
+    start = float(time_values[len(time_values) // 2])
+    series = [fdr[column].to_numpy(dtype=np.float64) for column in projection]
+
+    def decimate():
+        for values in series:
+            fdr_plot.minmax_indices(values, 0, len(values), DECIMATE_PIXELS)
+
+    cases = {}
+    for kind, path in paths.items():
+        cases['load.' + kind] = lambda path=path: fdr_data.read_columns(path)
+        cases['projection.' + kind] = lambda path=path: fdr_data.read_columns(path, projection)
+        cases['range.' + kind] = lambda path=path: fdr_data.read_range(path, projection, start, start + RANGE_SECONDS)
+    cases['decimation'] = decimate
+    cases['events.extract'] = lambda: fdr_events.extract_events(events)
+    cases['events.phases'] = lambda: fdr_events.flight_phases(fdr)
+    cases['events.disconnects'] = lambda: fdr_events.find_disconnects(fdr)
+    for chart, draw in fdr_analyser_ui.RENDER_CHARTS.items():
+        output = os.path.join(output_directory, chart + '.png')
+        cases['render.' + chart] = lambda draw=draw, output=output: draw(fdr, output)
+    return cases
+
+
+# Runs a case the given number of times. Returns the fastest and the median run in seconds.
+def run_case(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {'min': min(timings), 'median': float(np.median(timings)), 'repeat': repeat}
+
+
+# Returns True if the name of a case is selected by one of the prefixes (all cases without prefixes).
+def selected(name, prefixes):
+    return not prefixes or any(name == prefix or name.startswith(prefix + '.') for prefix in prefixes)
+
+
+# Compares results with a baseline. Returns (name, result, baseline result, change) of the cases in both and the names
+# of the regressions.
+def compare(results, baseline, tolerance):
+    rows = []
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, result, None, None))
+            continue
+        change = result['min'] / base['min'] - 1 if base['min'] else 0.0
+        rows.append((name, result, base, change))
+        if change > tolerance and result['min'] - base['min'] >= MIN_DIFFERENCE:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_results(rows, regressions):
+    print("{:40s} {:>10s} {:>10s} {:>10s} {:>8s}".format('Case', 'Min s', 'Median s', 'Baseline', 'Change'))
+    for name, result, base, change in rows:
+        line = "{:40s} {:10.4f} {:10.4f}".format(name, result['min'], result['median'])
+        if base is not None:
+            line += " {:10.4f} {:+7.0%}".format(base['min'], change)
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='FDR analyser benchmarks on synthetic flights')
+    parser.add_argument('-durations', nargs='+', default=['1h'],
+                        help='Flight durations: 1h, 5h, 12h or a number of seconds (default: 1h)')
+    parser.add_argument('-rate', type=float, default=fdr_synthetic.DEFAULT_RATE,
+                        help='Frames per second of the sim (default: {})'.format(fdr_synthetic.DEFAULT_RATE))
+    parser.add_argument('-seed', type=int, default=0, help='Seed of the synthetic flights (default: 0)')
+    parser.add_argument('-repeat', type=int, default=3, help='Runs of each case (default: 3)')
+    parser.add_argument('-only', nargs='+', default=[],
+                        help='Cases or groups to run, e.g. load render.ap (default: all)')
+    parser.add_argument('-d', '-directory', dest='directory', default=WORK_DIRECTORY,
+                        help='Work directory for the synthetic flights (default: {})'.format(WORK_DIRECTORY))
+    parser.add_argument('-o', '-output', dest='output', help='Write the results to a JSON file')
+    parser.add_argument('-baseline', help='Compare with the results of an earlier run (JSON file)')
+    parser.add_argument('-tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Slowdown counted as a regression (default: {})'.format(DEFAULT_TOLERANCE))
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    results = {}
+    output_directory = os.path.join(args.directory, 'charts')
+    os.makedirs(output_directory, exist_ok=True)
+    for text in args.durations:
+        duration = fdr_synthetic.parse_duration(text)
+        paths = flight_files(args.directory, duration, args.rate, args.seed)
+        for name, function in flight_cases(paths, output_directory).items():
+            if selected(name, args.only):
+                key = '{}@{:g}fps/{}'.format(text, args.rate, name)
+                results[key] = run_case(function, args.repeat)
+                print("{:40s} {:10.4f} s".format(key, results[key]['min']))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+    rows, regressions = compare(results, baseline, args.tolerance)
+    print()
+    print_results(rows, regressions)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'date': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, file, indent=2)
+        print("Results written to " + args.output)
+    if regressions:
+        print("{} regressions: {}".format(len(regressions), ', '.join(regressions)))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
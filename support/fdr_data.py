@@ -0,0 +1,704 @@
+import csv
+import io
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import fdr_alias
+import fdr_decoder
+import fdr_profile
+import fdr_schema
+import fdr_store
+
+try:
+    import pyarrow
+    import pyarrow.csv
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Time column all charts and analyses are plotted against
+TIME_COLUMN = 'ap_sm.time.simulation_time'
+
+# Aircraft position, used to check that split files continue the same flight
+LAT_COLUMN = 'ap_sm.data.aircraft_position.lat'
+LON_COLUMN = 'ap_sm.data.aircraft_position.lon'
+
+# FDR files are named after the time the recording started, e.g. 2021-11-15-12-57-13.fdr
+FLIGHT_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2})\.(fdr|csv|parquet)$', re.IGNORECASE)
+
+# A file continues the previous file of a flight if it was started at most this many seconds after the previous
+# file's recording ended...
+MAX_SEGMENT_GAP = 300
+
+# ...and the aircraft has not moved more than this many degrees between the last and the first sample.
+MAX_SEGMENT_JUMP = 0.05
+
+# Rows between two entries of the time index of a CSV file
+INDEX_STEP = 4096
+
+# Rows per row group of the columnar cache. Time range loads read only the row groups overlapping the range.
+ROW_GROUP_ROWS = 65536
+
+# First element of the frame cache keys of stitched flights (the keys of single files start with the path)
+FLIGHT_KEY = 'flight'
+
+# Bytes read from the end of a CSV file to find its last row, doubled until a complete row is found
+TAIL_BYTES = 64 * 1024
+
+# Upper limit for the memory used by cached frames. The most recently used frame is always kept even if it alone
+# exceeds this limit.
+DEFAULT_CACHE_BYTES = 4 * 1024 ** 3
+
+
+# Keeps loaded FDR frames for the whole session so that opening several charts for the same file parses it only once.
+# Entries are keyed by path, modification time and size so a re-converted file is never served from a stale entry.
+# The least recently used frames are evicted once the memory limit is reached.
+class FrameCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.headers = {}
+
+    # Returns the frame for the given file with at least the requested columns (all columns if None). Columns which
+    # are not cached yet are loaded from the file and added to the cached frame.
+    def get(self, path, columns=None):
+        key = file_key(path)
+        header = self.header(path)
+        self.entries.move_to_end(key)
+        if columns is None:
+            columns = header
+        frame = self.entries[key]
+        missing = [column for column in columns if column in header and (frame is None or column not in frame)]
+        if frame is None or missing:
+            loaded = read_columns(path, missing)
+            if frame is None:
+                frame = loaded
+            else:
+                for column in loaded:
+                    frame[column] = loaded[column]
+            self.entries[key] = frame
+            self.evict()
+        return frame
+
+    # Returns the column names of a file. Only the header is read (no data is parsed), once per version of the file.
+    def header(self, path):
+        key = file_key(path)
+        if key not in self.entries:
+            # drop entries of older versions of the same file
+            self.remove(path)
+            header = read_header(path)
+            self.entries[key] = None
+            self.headers[key] = header
+        return self.headers[key]
+
+    # Returns the stitched frame of a flight recorded in several files (see FlightDataset) with the given columns and
+    # time range. It is built once by the build function and then kept and evicted like the frames of single files.
+    def flight(self, paths, columns, start, end, build):
+        key = (FLIGHT_KEY, tuple(file_key(path) for path in paths), tuple(columns), start, end)
+        if key not in self.entries:
+            self.entries[key] = build()
+            self.evict()
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    # Removes all entries of the given file, including the stitched flights it is part of.
+    def remove(self, path):
+        path = os.path.abspath(path)
+        for key in [key for key in self.entries if key[0] == path or (
+                key[0] == FLIGHT_KEY and any(segment[0] == path for segment in key[1]))]:
+            del self.entries[key]
+            self.headers.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+        self.headers.clear()
+
+    # Total memory used by all cached frames in bytes.
+    def size(self):
+        return sum(frame_bytes(frame) for frame in self.entries.values() if frame is not None)
+
+    # Evicts the least recently used frames until the cache fits into its memory limit.
+    def evict(self):
+        while len(self.entries) > 1 and self.size() > self.max_bytes:
+            key, frame = self.entries.popitem(last=False)
+            self.headers.pop(key, None)
+
+
+# Builds the cache key of a file from its absolute path, modification time and size.
+def file_key(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+# Memory used by a frame in bytes. Columns memory mapped from a store are not counted, the system pages them in and
+# out as needed.
+def frame_bytes(frame):
+    usage = frame.memory_usage(index=True, deep=False)
+    mapped = [column for column in frame.columns if fdr_store.is_mapped(frame[column])]
+    return int(usage.drop(mapped).sum())
+
+
+# Session wide frame cache shared by all charts.
+frame_cache = FrameCache()
+
+
+# Path of the columnar cache file written next to a CSV file.
+def cache_path(csvfile):
+    return os.path.splitext(csvfile)[0] + '.parquet'
+
+
+# Returns the path of the columnar cache of a CSV file if it exists and is at least as new as the CSV file.
+def fresh_cache(csvfile):
+    if pyarrow is None:
+        return None
+    cachefile = cache_path(csvfile)
+    if os.path.isfile(cachefile) and os.path.getmtime(cachefile) >= os.path.getmtime(csvfile):
+        return cachefile
+    return None
+
+
+# Writes a typed columnar (Parquet) cache next to the CSV file. The CSV is streamed block by block so the whole
+# file is never held in memory. Returns the cache file name or None if pyarrow is not available.
+def write_cache(csvfile):
+    if pyarrow is None:
+        print("pyarrow not installed - no columnar cache written")
+        return None
+    cachefile = cache_path(csvfile)
+    tmpfile = cachefile + '.tmp'
+    columns = read_csv_header(csvfile)
+    column_types = {column: pyarrow.from_numpy_dtype(np.dtype(dtype))
+                    for column, dtype in fdr_schema.dtypes(columns).items()}
+    try:
+        stream_csv_to_parquet(csvfile, tmpfile, column_types)
+    except pyarrow.ArrowInvalid:
+        # values not matching the schema - keep full precision, the schema is applied when loading
+        stream_csv_to_parquet(csvfile, tmpfile, {column: pyarrow.float64() for column in columns})
+    os.replace(tmpfile, cachefile)
+    return cachefile
+
+
+def stream_csv_to_parquet(csvfile, parquetfile, column_types):
+    reader = pyarrow.csv.open_csv(
+        csvfile,
+        read_options=pyarrow.csv.ReadOptions(block_size=64 * 1024 ** 2),
+        convert_options=pyarrow.csv.ConvertOptions(column_types=column_types)
+    )
+    with pyarrow.parquet.ParquetWriter(parquetfile, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=ROW_GROUP_ROWS)
+
+
+# Writes a memory mapped store (see fdr_store) next to a FDR file (CSV, Parquet or .fdr), streaming the file chunk by
+# chunk. Later loads of the file use the store and only page in the fields and rows they use. Returns the store path.
+def write_store(path):
+    storepath = fdr_store.store_path(path)
+    if is_fdr(path):
+        columns = fdr_decoder.read_header(path)
+        return fdr_store.write_store(storepath, (fdr_decoder.frames_to_frame(frames, columns)
+                                                 for frames in fdr_decoder.iter_frames(path)))
+    if is_parquet(path):
+        batches = pyarrow.parquet.ParquetFile(path).iter_batches()
+        return fdr_store.write_store(storepath, (batch.to_pandas() for batch in batches))
+    return fdr_store.write_csv_store(path)
+
+
+# Converts the columns of a frame to the compact types of the field schema. Columns whose values cannot be
+# represented without loss in the schema type (e.g. fractional values in an enum field) keep their type.
+def apply_schema(frame):
+    for column, dtype in fdr_schema.dtypes(frame.columns).items():
+        if frame[column].dtype == dtype:
+            continue
+        try:
+            converted = frame[column].astype(dtype)
+        except (ValueError, TypeError):
+            continue
+        if dtype.startswith('float') or (converted == frame[column]).all():
+            frame[column] = converted
+    return frame
+
+
+# Reads only the header line of a CSV file and returns its column names.
+def read_csv_header(path):
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        return next(csv.reader(file), [])
+
+
+# Returns the physical column names of a FDR file (CSV, Parquet, store or .fdr), from the store or columnar cache if a
+# fresh one exists.
+def read_file_header(path):
+    storepath = path if fdr_store.is_store(path) else fdr_store.fresh_store(path)
+    if storepath:
+        return fdr_store.read_store_header(storepath)
+    if is_fdr(path):
+        return fdr_decoder.read_header(path)
+    cachefile = path if is_parquet(path) else fresh_cache(path)
+    if cachefile:
+        return pyarrow.parquet.read_schema(cachefile).names
+    return read_csv_header(path)
+
+
+# Returns the format version of a FDR file: recorded in .fdr files, detected from the header for converted files (None
+# for the current versions).
+def file_version(path, header):
+    if is_fdr(path):
+        return fdr_decoder.read_version(path)
+    return fdr_alias.detect_version(header)
+
+
+# Returns the column names of a FDR file with the canonical names of fields older format versions recorded under
+# other names (see fdr_alias). All loaders accept these names.
+def read_header(path):
+    header = read_file_header(path)
+    return fdr_alias.canonical_header(header, file_version(path, header))
+
+
+def is_fdr(path):
+    return path.lower().endswith('.fdr')
+
+
+def is_parquet(path):
+    return path.lower().endswith('.parquet')
+
+
+# Reads the given columns (canonical or physical names, all if None) of a FDR file (CSV, Parquet, store or .fdr) with
+# the compact types of the field schema. Only these columns are parsed, columns the file does not have are skipped.
+# A fresh store (memory mapped, not read into memory) or columnar cache is preferred over the CSV file. The columns
+# are named as requested.
+@fdr_profile.traced('parse')
+def read_columns(path, columns=None):
+    header = read_file_header(path)
+    version = file_version(path, header)
+    if columns is None:
+        columns = fdr_alias.canonical_header(header, version)
+    mapping = fdr_alias.resolve(columns, header, version)
+    physical = fdr_alias.physical_columns(mapping)
+    storepath = path if fdr_store.is_store(path) else fdr_store.fresh_store(path)
+    cachefile = None if storepath or is_fdr(path) else (path if is_parquet(path) else fresh_cache(path))
+    if storepath:
+        frame = fdr_store.read_store(storepath, physical)
+    elif is_fdr(path):
+        frame = apply_schema(fdr_decoder.read_fdr(path, physical))
+    elif cachefile:
+        frame = apply_schema(pd.read_parquet(cachefile, columns=physical))
+    else:
+        try:
+            frame = pd.read_csv(path, usecols=physical, dtype=fdr_schema.dtypes(physical))
+        except (ValueError, TypeError):
+            # values not matching the schema - let pandas infer the types and convert what can be converted
+            frame = apply_schema(pd.read_csv(path, usecols=physical))
+    return fdr_alias.rename(frame, mapping)
+
+
+# Loads a FDR file (CSV, Parquet, store or .fdr) through the session wide frame cache. If columns are given (e.g. a
+# chart's column manifest) only these columns are parsed. Columns not available in the file are skipped.
+@fdr_profile.traced('load')
+def load_frame(path, columns=None):
+    return frame_cache.get(path, columns)
+
+
+# Returns the column names of a file through the session wide frame cache, so checking the fields of the chosen file
+# (e.g. on every UI event) reads its header only once.
+def probe_header(path):
+    return frame_cache.header(path)
+
+
+# Path of the time index file written next to a CSV file.
+def index_path(csvfile):
+    return csvfile + '.tidx'
+
+
+# Builds the sparse time index of a CSV file: the time and byte offset of every INDEX_STEP-th row and of the last
+# row. Written once next to the file and rebuilt when the file is newer. Returns the times, the offsets and the end
+# of the file.
+def time_index(csvfile, time_column=TIME_COLUMN):
+    indexfile = index_path(csvfile)
+    if os.path.isfile(indexfile) and os.path.getmtime(indexfile) >= os.path.getmtime(csvfile):
+        with np.load(indexfile) as index:
+            if str(index['time_column']) == time_column:
+                return index['times'], index['offsets'], int(index['size'])
+    position = read_csv_header(csvfile).index(time_column)
+    times, offsets = [], []
+    with open(csvfile, 'rb') as file:
+        offset = len(file.readline())
+        line = None
+        for row, line in enumerate(file):
+            if row % INDEX_STEP == 0:
+                times.append(float(line.split(b',', position + 1)[position]))
+                offsets.append(offset)
+            offset += len(line)
+        # the last row closes the index so a range after the last entry is bounded
+        if line is not None and (row % INDEX_STEP):
+            times.append(float(line.split(b',', position + 1)[position]))
+            offsets.append(offset - len(line))
+    times, offsets = np.array(times, dtype=np.float64), np.array(offsets, dtype=np.int64)
+    with open(indexfile, 'wb') as file:
+        np.savez(file, times=times, offsets=offsets, size=offset, time_column=time_column)
+    return times, offsets, offset
+
+
+# Reads the rows of the given columns of a CSV file between two byte offsets with the types of the field schema.
+def read_csv_rows(csvfile, columns, begin, end):
+    header = read_csv_header(csvfile)
+    with open(csvfile, 'rb') as file:
+        file.seek(begin)
+        data = file.read(end - begin)
+    try:
+        return pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=columns,
+                           dtype=fdr_schema.dtypes(columns))
+    except (ValueError, TypeError):
+        return apply_schema(pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=columns))
+
+
+# Reads the given columns of the rows with start <= time <= end (either may be None) of a FDR file. Only the needed
+# part of the file is read: rows around the range located with the time index for CSV files, the row groups whose
+# time statistics overlap the range for Parquet files and a binary search for stores. A .fdr file is decoded
+# completely. Columns are named as requested like read_columns().
+@fdr_profile.traced('parse')
+def read_range(path, columns, start=None, end=None, time_column=TIME_COLUMN):
+    header = read_file_header(path)
+    mapping = fdr_alias.resolve([time_column] + list(columns), header, file_version(path, header))
+    wanted = fdr_alias.physical_columns(mapping)
+    time_column = mapping.get(time_column, time_column)
+    storepath = path if fdr_store.is_store(path) else fdr_store.fresh_store(path)
+    cachefile = None if storepath or is_fdr(path) else (path if is_parquet(path) else fresh_cache(path))
+    if storepath:
+        first, last = fdr_store.time_range(storepath, time_column, start, end)
+        frame = fdr_store.read_store(storepath, wanted, first, last)
+    elif cachefile:
+        parquet = pyarrow.parquet.ParquetFile(cachefile)
+        position = parquet.schema_arrow.get_field_index(time_column)
+        groups = []
+        for group in range(parquet.metadata.num_row_groups):
+            statistics = parquet.metadata.row_group(group).column(position).statistics
+            if statistics is None or not statistics.has_min_max or (
+                    (start is None or statistics.max >= start) and (end is None or statistics.min <= end)):
+                groups.append(group)
+        frame = apply_schema(parquet.read_row_groups(groups, columns=wanted).to_pandas())
+    elif is_fdr(path):
+        frame = read_columns(path, wanted)
+    else:
+        times, offsets, size = time_index(path, time_column)
+        first = max(int(np.searchsorted(times, start, side='right')) - 1, 0) if start is not None else 0
+        last = int(np.searchsorted(times, end, side='right')) if end is not None else len(times)
+        begin = int(offsets[first]) if len(offsets) else size
+        stop = int(offsets[last]) if last < len(offsets) else size
+        frame = read_csv_rows(path, wanted, begin, stop)
+    time = frame[time_column]
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= (time >= start).to_numpy()
+    if end is not None:
+        mask &= (time <= end).to_numpy()
+    return fdr_alias.rename(frame[mask].reset_index(drop=True), mapping)
+
+
+# Loads the rows of a time range of a FDR file. A file already cached with all requested columns is sliced from
+# memory, otherwise only the range is read. Without a range the file is loaded through the frame cache.
+@fdr_profile.traced('load')
+def load_range(path, columns, start=None, end=None):
+    if start is None and end is None:
+        return load_frame(path, columns)
+    frame = cached_range(path, columns, start, end)
+    if frame is not None:
+        return frame
+    header = read_header(path)
+    return read_range(path, [column for column in columns if column in header], start, end)
+
+
+# Slices the rows of a time range from the frame cache if the file is cached with all requested columns, returns None
+# otherwise.
+def cached_range(path, columns, start=None, end=None):
+    key = file_key(path)
+    frame = frame_cache.entries.get(key)
+    if frame is None or TIME_COLUMN not in frame:
+        return None
+    header = frame_cache.headers[key]
+    if not all(column in frame for column in columns if column in header):
+        return None
+    time = frame[TIME_COLUMN]
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= (time >= start).to_numpy()
+    if end is not None:
+        mask &= (time <= end).to_numpy()
+    return frame[[column for column in columns if column in frame]][mask].reset_index(drop=True)
+
+
+# Reads the rows of a time range (all rows without a range) of a FDR file like load_range() but without adding the
+# file to the frame cache, so a flight stitched from it is the only copy in memory.
+def read_segment(path, columns, start=None, end=None):
+    frame = cached_range(path, columns, start, end)
+    if frame is not None:
+        return frame
+    header = read_header(path)
+    columns = [column for column in columns if column in header]
+    if start is None and end is None:
+        return read_columns(path, columns)
+    return read_range(path, columns, start, end)
+
+
+# Reads the first two rows and the last row of the given columns of a FDR file, enough to tell where a recording
+# starts and ends and its sample interval. Only these rows are parsed: the first lines and the last line of a CSV
+# file, the first and the last row group of a Parquet file or the rows of a store. A .fdr file is decoded completely.
+@fdr_profile.traced('parse')
+def read_ends(path, columns):
+    header = read_file_header(path)
+    mapping = fdr_alias.resolve(columns, header, file_version(path, header))
+    physical = fdr_alias.physical_columns(mapping)
+    storepath = path if fdr_store.is_store(path) else fdr_store.fresh_store(path)
+    cachefile = None if storepath or is_fdr(path) else (path if is_parquet(path) else fresh_cache(path))
+    if storepath:
+        frame = fdr_store.read_store(storepath, physical)
+    elif is_fdr(path):
+        frame = read_columns(path, physical)
+    elif cachefile:
+        parquet = pyarrow.parquet.ParquetFile(cachefile)
+        groups = sorted({0, parquet.metadata.num_row_groups - 1}) if parquet.metadata.num_row_groups else []
+        frame = apply_schema(parquet.read_row_groups(groups, columns=physical).to_pandas()) if groups else \
+            apply_schema(parquet.schema_arrow.empty_table().select(physical).to_pandas())
+    else:
+        frame = read_csv_ends(path, physical)
+    rows = sorted({row for row in (0, 1, len(frame) - 1) if 0 <= row < len(frame)})
+    return fdr_alias.rename(frame.iloc[rows].reset_index(drop=True), mapping)
+
+
+# Reads the first two rows and the last row of a CSV file. The last row is found by reading the end of the file.
+def read_csv_ends(csvfile, columns):
+    with open(csvfile, 'rb') as file:
+        file.readline()
+        begin = file.tell()
+        file.readline()
+        file.readline()
+        head_end = file.tell()
+        size = file.seek(0, os.SEEK_END)
+        tail_bytes = TAIL_BYTES
+        last = size
+        while head_end < size:
+            position = max(head_end, size - tail_bytes)
+            file.seek(position)
+            tail = file.read().rstrip(b'\r\n')
+            if b'\n' in tail:
+                last = position + tail.rindex(b'\n') + 1
+                break
+            if position == head_end:
+                # the rows after the first two are a single row
+                last = position if tail else size
+                break
+            tail_bytes *= 2
+    if head_end == begin:
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in fdr_schema.dtypes(columns).items()})
+    frames = [read_csv_rows(csvfile, columns, begin, head_end)]
+    if last < size:
+        frames.append(read_csv_rows(csvfile, columns, last, size))
+    return pd.concat(frames, ignore_index=True)
+
+
+# Returns the converted files (CSV or Parquet) of a directory, one per recording: a CSV file is read with its Parquet
+# cache, so the cache is not returned separately. Only files whose header has the time field are recordings, the
+# tables the tools write into the directory (e.g. *_events.csv, fdr_health.csv) are skipped.
+def data_files(directory):
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        base, extension = os.path.splitext(name)
+        if extension.lower() == '.csv' or (extension.lower() == '.parquet' and base not in files):
+            files[base] = os.path.join(directory, name)
+    return [path for path in files.values() if is_recording(path)]
+
+
+# Checks the header (only the header is read) of a converted file for the time field.
+def is_recording(path):
+    try:
+        return TIME_COLUMN in read_header(path)
+    except (OSError, ValueError):
+        return False
+
+
+# Returns the recording start time encoded in a FDR file name or None if the name does not follow the pattern.
+def file_start_time(path):
+    match = FLIGHT_FILE_PATTERN.match(os.path.basename(path))
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), '%Y-%m-%d-%H-%M-%S')
+
+
+# Groups FDR files of one type (e.g. all CSV files of a work folder) into flights. Files are ordered by the start
+# time in their names and a file is added to the previous flight if it starts shortly after the previous file ends
+# and the aircraft position continues. Returns a list of flights, each a list of file names.
+def group_flights(paths):
+    paths = sorted((path for path in paths if file_start_time(path)), key=file_start_time)
+    flights = []
+    previous = None
+    for path in paths:
+        segment = read_segment_ends(path)
+        if previous is not None and continues(previous, path, segment):
+            flights[-1].append(path)
+        else:
+            flights.append([path])
+        previous = (path, segment)
+    return flights
+
+
+# First two rows and last row of the time and position of a file (see read_ends()).
+def read_segment_ends(path):
+    return read_ends(path, [TIME_COLUMN, LAT_COLUMN, LON_COLUMN])
+
+
+# Groups the files of a directory scan into flights like group_flights(), a file whose name has no start time is a
+# flight of its own. Returns a list of flights, each a list of file names.
+def flight_files(paths):
+    return group_flights(paths) + [[path] for path in paths if not file_start_time(path)]
+
+
+# Returns the files a scan of a file or directory (disconnects, health) reads, as a list of flights each a list of
+# files. Without flight every file is a flight of its own, with flight the files of a split flight are grouped so
+# each flight is scanned once.
+def scanned_files(path, flight=False):
+    if not os.path.isdir(path):
+        return [find_flight(path) if flight else [path]]
+    paths = data_files(path)
+    return flight_files(paths) if flight else [[datafile] for datafile in paths]
+
+
+# Checks if the file continues the previous file of a flight. The segments need only the first and the last row.
+def continues(previous, path, segment):
+    previous_path, previous_segment = previous
+    if previous_segment.empty or segment.empty or TIME_COLUMN not in previous_segment:
+        return False
+    time = previous_segment[TIME_COLUMN]
+    previous_end = (file_start_time(previous_path) - datetime.min).total_seconds() + time.iloc[-1] - time.iloc[0]
+    gap = (file_start_time(path) - datetime.min).total_seconds() - previous_end
+    if gap > MAX_SEGMENT_GAP:
+        return False
+    if LAT_COLUMN in segment and LAT_COLUMN in previous_segment:
+        jump = max(abs(segment[LAT_COLUMN].iloc[0] - previous_segment[LAT_COLUMN].iloc[-1]),
+                   abs(segment[LON_COLUMN].iloc[0] - previous_segment[LON_COLUMN].iloc[-1]))
+        if jump > MAX_SEGMENT_JUMP:
+            return False
+    return True
+
+
+# Returns the files of the flight the given file belongs to, searched in the same directory among files of the same
+# type. A file whose name has no start time is a flight of its own.
+def find_flight(path):
+    if not file_start_time(path):
+        return [path]
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    extension = os.path.splitext(path)[1].lower()
+    candidates = sorted((os.path.join(directory, name) for name in os.listdir(directory)
+                         if os.path.splitext(name)[1].lower() == extension and FLIGHT_FILE_PATTERN.match(name)),
+                        key=file_start_time)
+    if path not in candidates:
+        return [path]
+    # only the neighbours are read, from the file outwards until a file does not continue the flight
+    position = candidates.index(path)
+    ends = {path: read_segment_ends(path)}
+    first = position
+    while first > 0:
+        previous = candidates[first - 1]
+        ends[previous] = read_segment_ends(previous)
+        if not continues((previous, ends[previous]), candidates[first], ends[candidates[first]]):
+            break
+        first -= 1
+    last = position
+    while last + 1 < len(candidates):
+        following = candidates[last + 1]
+        ends[following] = read_segment_ends(following)
+        if not continues((candidates[last], ends[candidates[last]]), following, ends[following]):
+            break
+        last += 1
+    return candidates[first:last + 1]
+
+
+# A flight recorded in several files, presented as one continuous dataset. The simulation time of each file is shifted
+# so that it continues where the previous file ended. Only the requested columns and the rows of the time range are
+# read from each file, the files themselves are not kept in the frame cache.
+class FlightDataset:
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.ends = None
+        self.offsets = None
+
+    # Time shift of each segment, computed from the first and last rows of the files on first use.
+    def segment_offsets(self):
+        if self.offsets is None:
+            self.ends = [read_ends(path, [TIME_COLUMN])[TIME_COLUMN] for path in self.paths]
+            self.offsets = []
+            end = None
+            for time in self.ends:
+                if end is None or time.empty:
+                    offset = 0.0
+                else:
+                    step = float(time.iloc[1] - time.iloc[0]) if len(time) > 1 else 0.0
+                    offset = end + step - float(time.iloc[0])
+                self.offsets.append(offset)
+                if not time.empty:
+                    end = float(time.iloc[-1]) + offset
+        return self.offsets
+
+    # Yields the rows of each segment within [start, end] (dataset time) with the requested columns, one frame per
+    # segment overlapping the range. Only the rows within the range are read.
+    def segments(self, columns=None, start=None, end=None):
+        if columns is None:
+            columns = read_header(self.paths[0])
+        for path, offset, time in zip(self.paths, self.segment_offsets(), self.ends):
+            if time.empty or (start is not None and time.iloc[-1] + offset < start) or (
+                    end is not None and time.iloc[0] + offset > end):
+                continue
+            frame = read_segment(path, columns, None if start is None else start - offset,
+                                 None if end is None else end - offset)
+            frame = frame[[column for column in columns if column in frame]]
+            if TIME_COLUMN in frame:
+                frame = frame.assign(**{TIME_COLUMN: frame[TIME_COLUMN] + offset})
+            yield frame
+
+    # Returns the requested columns and time range of the whole flight as one frame, built from the windows of the
+    # segments once and then served from the frame cache. The charts and the phase and disconnect detection need one
+    # continuous time axis, consumers which can work segment by segment use segments() instead.
+    def frame(self, columns=None, start=None, end=None):
+        if columns is None:
+            columns = read_header(self.paths[0])
+        return frame_cache.flight(self.paths, columns, start, end, lambda: self.join(columns, start, end))
+
+    # Stitches the segments column by column. Each segment is read, its columns are copied out and the segment frame
+    # is released before the next one is read. Then every column is joined and its parts are released right away, so
+    # the flight is not held twice like pd.concat of all segment frames would (the segments and the result). A column
+    # missing in a segment is filled with NaN.
+    def join(self, columns, start, end):
+        parts = {}
+        rows = []
+        for frame in self.segments(columns, start, end):
+            for column in frame:
+                parts.setdefault(column, {})[len(rows)] = frame[column].to_numpy(copy=True)
+            rows.append(len(frame))
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        joined = {}
+        for column in [column for column in columns if column in parts]:
+            pieces = parts.pop(column)
+            joined[column] = np.concatenate([pieces.pop(number) if number in pieces else np.full(count, np.nan)
+                                             for number, count in enumerate(rows)])
+        return pd.DataFrame(joined, copy=False)
+
+
+# Loads the whole flight the given file belongs to (all split files) with the requested columns, optionally only the
+# time range [start, end] of the stitched flight.
+@fdr_profile.traced('load')
+def load_flight(path, columns=None, start=None, end=None):
+    return load_segments(find_flight(path), columns, start, end)
+
+
+# Loads the files of one flight (see find_flight() and flight_files()) as one frame with the requested columns and
+# time range.
+def load_segments(paths, columns=None, start=None, end=None):
+    if len(paths) == 1:
+        if columns is None:
+            columns = read_header(paths[0])
+        return load_range(paths[0], columns, start, end)
+    print("Flight split into {} files: {}".format(len(paths), ', '.join(os.path.basename(name) for name in paths)))
+    return FlightDataset(paths).frame(columns, start, end)
@@ -0,0 +1,277 @@
+import gzip
+import os
+import struct
+
+import numpy as np
+
+import fdr_schema
+
+# Directory with the frame layout descriptors of the FDR format versions (vNN.txt, e.g. v23.txt).
+#
+# A .fdr file is a gzip stream with the format version (uint64) followed by one frame per recorded sample. A frame
+# is the raw memory of the recorded C structs (ap_sm, ap_law, athr, data, engine, ...) written one after the other,
+# so its layout follows the struct definitions of the aircraft version which recorded it. A descriptor lists these
+# structs in recording order with their size and the offset, C type and name of every member the fdr2csv exe of the
+# version writes, in the column order of the exe:
+#
+#   # comment
+#   struct ap_sm 1208
+#     0 double time.dt
+#     8 double time.simulation_time
+#     1177 boolean_T output.mode_reversion
+#   end
+#
+# Column names are the struct name and the member name joined with a dot (ap_sm.time.dt). A column the exe writes
+# twice is named like pandas names the second one (name.1). The descriptors are written by fdr_descriptor.py from the
+# fdr2csv exes.
+FORMATS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fdr_formats')
+
+# C types used in descriptors and their numpy types
+C_TYPES = {
+    'double': 'f8',
+    'real_T': 'f8',
+    'real64_T': 'f8',
+    'float': 'f4',
+    'real32_T': 'f4',
+    'bool': '?',
+    'boolean_T': '?',
+    'int8_T': 'i1',
+    'uint8_T': 'u1',
+    'int16_T': 'i2',
+    'uint16_T': 'u2',
+    'int32_T': 'i4',
+    'uint32_T': 'u4',
+    'int': 'i4',
+    'unsigned': 'u4',
+    'int64_T': 'i8',
+    'uint64_T': 'u8',
+}
+
+# Size of the version header at the start of the decompressed stream
+HEADER_SIZE = 8
+
+# Number of frames decoded per chunk when streaming a file
+CHUNK_FRAMES = 16384
+
+
+class FormatError(Exception):
+    pass
+
+
+class ConversionCancelled(Exception):
+    pass
+
+
+# Frame layout of one FDR format version.
+class FdrFormat:
+    def __init__(self, version, names, formats, offsets, itemsize):
+        self.version = version
+        self.columns = names
+        self.dtype = np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': itemsize})
+
+
+# Parses a descriptor file into a list of (struct, size, members) with (offset, C type, name) members.
+def parse_descriptor(path):
+    structs = []
+    members = None
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            words = line.split()
+            if words[0] == 'struct' and len(words) == 3 and words[2].isdigit() and members is None:
+                members = []
+                structs.append((words[1], int(words[2]), members))
+            elif words[0] == 'end' and len(words) == 1 and members is not None:
+                members = None
+            elif len(words) == 3 and words[0].isdigit() and words[1] in C_TYPES and members is not None:
+                members.append((int(words[0]), words[1], words[2]))
+            else:
+                raise FormatError("{}:{}: invalid line '{}'".format(path, number, line))
+    if members is not None:
+        raise FormatError("{}: missing 'end'".format(path))
+    return structs
+
+
+# Name of a column the exe writes again, numbered like pandas numbers duplicate CSV columns.
+def unique_name(name, names):
+    unique = name
+    number = 0
+    while unique in names:
+        number += 1
+        unique = '{}.{}'.format(name, number)
+    return unique
+
+
+# Path of the descriptor file of a format version.
+def format_path(version):
+    return os.path.join(FORMATS_DIR, 'v{:02d}.txt'.format(int(version)))
+
+
+# Returns True if a descriptor for the format version is available.
+def has_format(version):
+    return os.path.isfile(format_path(version))
+
+
+# Loads the frame layout of a format version from its descriptor file.
+def load_format(version):
+    path = format_path(version)
+    if not os.path.isfile(path):
+        raise FormatError("No format descriptor for version {} ({})".format(version, path))
+    names, formats, offsets = [], [], []
+    itemsize = 0
+    # each top level struct is written separately, directly after the previous one
+    for struct_name, size, members in parse_descriptor(path):
+        for offset, member_type, name in members:
+            if offset + np.dtype(C_TYPES[member_type]).itemsize > size:
+                raise FormatError("{}: {}.{} is outside the struct".format(path, struct_name, name))
+            names.append(unique_name(struct_name + '.' + name, names))
+            formats.append(C_TYPES[member_type])
+            offsets.append(itemsize + offset)
+        itemsize += size
+    return FdrFormat(int(version), names, formats, offsets, itemsize)
+
+
+# Opens a FDR file and reads its version header. Returns the raw file, the decompressing stream and the version.
+def open_fdr(path):
+    raw = open(path, 'rb')
+    stream = gzip.GzipFile(fileobj=raw, mode='rb')
+    try:
+        header = stream.read(HEADER_SIZE)
+    except (OSError, EOFError):
+        header = b''
+    if len(header) != HEADER_SIZE:
+        stream.close()
+        raw.close()
+        raise FormatError("Failed to read the header of " + path)
+    return raw, stream, struct.unpack('<Q', header)[0]
+
+
+# Returns the format version of a FDR file.
+def read_version(path):
+    raw, stream, version = open_fdr(path)
+    stream.close()
+    raw.close()
+    return version
+
+
+# Streams the frames of a FDR file as numpy structured arrays of up to chunk_frames frames. An incomplete last frame
+# (e.g. the sim was closed while recording) is dropped. The optional progress function is called after every chunk
+# with the number of compressed bytes read so far and the file size.
+def iter_frames(path, chunk_frames=CHUNK_FRAMES, progress=None):
+    total = os.path.getsize(path)
+    raw, stream, version = open_fdr(path)
+    try:
+        fdr_format = load_format(version)
+        chunk_size = chunk_frames * fdr_format.dtype.itemsize
+        rest = b''
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            complete = len(data) // fdr_format.dtype.itemsize * fdr_format.dtype.itemsize
+            rest = data[complete:]
+            if complete:
+                yield np.frombuffer(data, dtype=fdr_format.dtype, count=complete // fdr_format.dtype.itemsize)
+            if progress:
+                progress(raw.tell(), total)
+        if rest:
+            print("Dropped incomplete frame at the end of " + path)
+    finally:
+        stream.close()
+        raw.close()
+
+
+# Returns the column names of a FDR file from the descriptor of its version.
+def read_header(path):
+    return load_format(read_version(path)).columns
+
+
+# Returns the type a field of the given C type is decoded to: its schema type if that holds every value of the C
+# type (float fields always get the float type of the schema, like in fdr_data.apply_schema()), otherwise the C type,
+# so no value wraps or is truncated. The type does not depend on the values, so all chunks of a file agree on it. The
+# loaders convert the remaining columns to the schema type where their values allow it (fdr_data.apply_schema()).
+def field_type(dtype, column):
+    schema_type = np.dtype(fdr_schema.field_type(column))
+    if np.can_cast(dtype, schema_type, 'safe') or (dtype.kind == 'f' and schema_type.kind == 'f'):
+        return schema_type
+    return dtype
+
+
+# Converts the selected fields of a chunk of frames into a frame, with the compact types of the field schema where
+# the conversion is lossless (see field_type()).
+# pandas is imported by the functions building frames, so reading the version of a file does not import it.
+def frames_to_frame(frames, columns):
+    import pandas as pd
+    return pd.DataFrame({column: frames[column].astype(field_type(frames.dtype[column], column))
+                         for column in columns})
+
+
+# Returns a frame without rows with the columns and types a FDR file of the given version is decoded to.
+def empty_frame(version, columns):
+    return frames_to_frame(np.zeros(0, dtype=load_format(version).dtype), columns)
+
+
+# Decodes the given columns (all if None) of a FDR file into a frame without an intermediate CSV file.
+def read_fdr(path, columns=None):
+    import pandas as pd
+    if columns is None:
+        columns = read_header(path)
+    chunks = [frames_to_frame(frames, columns) for frames in iter_frames(path)]
+    if not chunks:
+        return empty_frame(read_version(path), columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Decodes a FDR file chunk by chunk into a Parquet file if pyarrow is available, otherwise into a CSV file. Returns
+# the name of the written file. Progress is reported like for iter_frames(). Setting the optional cancel event
+# (threading.Event) stops the conversion with ConversionCancelled and removes the partially written file.
+def convert(fdrfile, progress=None, cancel=None):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        pyarrow = None
+
+    columns = read_header(fdrfile)
+    outfile = os.path.splitext(fdrfile)[0] + ('.csv' if pyarrow is None else '.parquet')
+    tmpfile = outfile + '.tmp'
+    chunks = decoded_chunks(fdrfile, columns, progress, cancel)
+    try:
+        if pyarrow is None:
+            header = True
+            with open(tmpfile, 'w', newline='') as file:
+                for chunk in chunks:
+                    chunk.to_csv(file, header=header, index=False)
+                    header = False
+                if header:
+                    empty_frame(read_version(fdrfile), columns).to_csv(file, index=False)
+        else:
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pyarrow.parquet.ParquetWriter(tmpfile, table.schema)
+                    writer.write_table(table)
+                if writer is None:
+                    empty = empty_frame(read_version(fdrfile), columns)
+                    pyarrow.parquet.write_table(pyarrow.Table.from_pandas(empty, preserve_index=False), tmpfile)
+            finally:
+                if writer is not None:
+                    writer.close()
+    except BaseException:
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+        raise
+    os.replace(tmpfile, outfile)
+    return outfile
+
+
+def decoded_chunks(fdrfile, columns, progress, cancel):
+    for frames in iter_frames(fdrfile, progress=progress):
+        if cancel is not None and cancel.is_set():
+            raise ConversionCancelled("Conversion cancelled: " + fdrfile)
+        yield frames_to_frame(frames, columns)
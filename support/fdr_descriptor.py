@@ -0,0 +1,549 @@
+import argparse
+import os
+import re
+import struct
+import subprocess
+import sys
+from collections import Counter
+
+import numpy as np
+
+import fdr_decoder
+
+# Writes the format descriptors of fdr_formats (see fdr_decoder.py) from the fdr2csv exes and checks the built-in
+# decoder against a CSV file written by an exe:
+#
+#   python fdr_descriptor.py -versions 00 23 25
+#   python fdr_descriptor.py -check FILE.fdr FILE.csv
+#
+# The exes are the only specification of the recorded frames, so the layout is taken from their machine code (this
+# needs objdump of GNU binutils, it runs on Linux or in MSYS2/WSL). An exe reads the version header, then every top
+# level struct with its own istream::read(SIZE) and writes the CSV header from a list of "name" (or "name{}") string
+# literals and each frame with one write call per column. The writer gets the structs as arguments, so the loads of
+# the writer tell the struct (the argument) and the offset of every column and the type of the load and of the write
+# call tell its C type:
+#
+#   v00-v19: std::ostream operator<< (double, int, unsigned, uint64 members and char for one byte members)
+#   v20-v25: fmt::format("{}{}", delimiter, value) directly or through one helper function per type
+#
+# The fields are checked before writing the descriptor: every column typed, aligned, inside the size read for its
+# struct, no overlapping fields (except columns written twice) and as many written values as header names. v26 and
+# later are written by a different (reflection based) generator and are not supported, these files still need the
+# fdr2csv exe.
+
+EXE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fdr2csv')
+
+OBJDUMP = os.environ.get('OBJDUMP', 'objdump')
+
+# Oldest and newest exe version with a supported writer
+FIRST_VERSION = 0
+LAST_VERSION = 25
+
+# CSV header names as string literals
+NAME_PATTERN = re.compile(rb'^[A-Za-z_][A-Za-z0-9_.()]*\.[A-Za-z0-9_.()]+(\{\})?$')
+
+# Memory operand: optional size, base register and displacement
+MEMORY_PATTERN = re.compile(r'(?:(BYTE|WORD|DWORD|QWORD|XMMWORD) PTR )?\[([a-z0-9]+)(?:([+-])0x([0-9a-f]+))?\]$')
+
+# Store of a fmt argument descriptor (0xdX: the delimiter string and a value of type X)
+FMT_DESC_PATTERN = re.compile(r'QWORD PTR \[.*\],0x(d[0-9a-f])$')
+
+WIDTHS = {'BYTE': 1, 'WORD': 2, 'DWORD': 4, 'QWORD': 8, 'XMMWORD': 16}
+
+# fmt type ids of the written values (low nibble of the argument descriptor)
+FMT_INT = 1
+FMT_UINT = 2
+FMT_LONG_LONG = 3
+FMT_ULONG_LONG = 4
+FMT_BOOL = 7
+FMT_FLOAT = 9
+FMT_DOUBLE = 10
+FMT_CUSTOM = 15
+
+# Mangled parameter type of the imported ostream::operator<< and the fmt type id and register of the written value
+OSTREAM_OPERATORS = {
+    'N@Z': (FMT_DOUBLE, 'xmm1'),
+    'M@Z': (FMT_FLOAT, 'xmm1'),
+    'H@Z': (FMT_INT, 'rdx'),
+    'I@Z': (FMT_UINT, 'rdx'),
+    'J@Z': (FMT_INT, 'rdx'),
+    'K@Z': (FMT_UINT, 'rdx'),
+    'F@Z': (FMT_INT, 'rdx'),
+    'G@Z': (FMT_UINT, 'rdx'),
+    '_J@Z': (FMT_LONG_LONG, 'rdx'),
+    '_K@Z': (FMT_ULONG_LONG, 'rdx'),
+    '_N@Z': (FMT_BOOL, 'rdx'),
+}
+
+# Registers which are not preserved by calls (x64 calling convention)
+VOLATILE_REGISTERS = ['rax', 'rcx', 'rdx', 'r8', 'r9', 'r10', 'r11'] + ['xmm{}'.format(i) for i in range(6)]
+
+# Full register of every partial register name
+REGISTERS = {}
+for letter in 'abcd':
+    for partial in ('r{}x', 'e{}x', '{}x', '{}l'):
+        REGISTERS[partial.format(letter)] = 'r{}x'.format(letter)
+for base in ('si', 'di', 'bp', 'sp'):
+    for partial in ('r' + base, 'e' + base, base, base + 'l'):
+        REGISTERS[partial] = 'r' + base
+for number in range(8, 16):
+    for partial in ('r{}', 'r{}d', 'r{}w', 'r{}b'):
+        REGISTERS[partial.format(number)] = 'r{}'.format(number)
+
+# Relative tolerance of -check for floating point columns (the exes print 6 significant digits)
+CHECK_TOLERANCE = 1e-5
+
+
+class DescriptorError(Exception):
+    pass
+
+
+# Sections, exception table and imports of a PE32+ file.
+class PeFile:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = file.read()
+        if self.data[:2] != b'MZ':
+            raise DescriptorError("Not an exe file: " + path)
+        header = struct.unpack_from('<I', self.data, 0x3c)[0]
+        sections = struct.unpack_from('<H', self.data, header + 6)[0]
+        optional_size = struct.unpack_from('<H', self.data, header + 20)[0]
+        optional = header + 24
+        self.base = struct.unpack_from('<Q', self.data, optional + 24)[0]
+        self.directories = [struct.unpack_from('<II', self.data, optional + 112 + 8 * i) for i in range(16)]
+        self.sections = []
+        for i in range(sections):
+            size, address, raw_size, raw = struct.unpack_from('<IIII', self.data, optional + optional_size + 40 * i + 8)
+            self.sections.append((address, max(size, raw_size), raw))
+
+    # File offset of a virtual address, None outside the sections.
+    def offset(self, address):
+        relative = address - self.base
+        for start, size, raw in self.sections:
+            if start <= relative < start + size:
+                return relative - start + raw
+        return None
+
+    # Zero terminated string at a virtual address, None if there is none.
+    def string(self, address):
+        offset = self.offset(address)
+        if offset is None:
+            return None
+        end = self.data.find(b'\0', offset, offset + 256)
+        return self.data[offset:end] if end >= 0 else None
+
+    # Start and end address of every function from the exception table.
+    def functions(self):
+        address, size = self.directories[3]
+        offset = self.offset(self.base + address)
+        return sorted((self.base + start, self.base + end) for start, end, _ in
+                      (struct.unpack_from('<III', self.data, offset + 12 * i) for i in range(size // 12)))
+
+    # Imported function names by the address of their import address table slot.
+    def imports(self):
+        result = {}
+        offset = self.offset(self.base + self.directories[1][0])
+        while True:
+            lookup, _, _, _, thunks = struct.unpack_from('<IIIII', self.data, offset)
+            if not thunks:
+                return result
+            table = self.offset(self.base + (lookup or thunks))
+            i = 0
+            thunk = struct.unpack_from('<Q', self.data, table)[0]
+            while thunk:
+                # imports by ordinal have no name
+                if not thunk >> 63:
+                    name = self.offset(self.base + thunk) + 2
+                    result[self.base + thunks + 8 * i] = self.data[name:self.data.index(b'\0', name)].decode()
+                i += 1
+                thunk = struct.unpack_from('<Q', self.data, table + 8 * i)[0]
+            offset += 20
+
+
+# Disassembles the code of an exe into (address, mnemonic, operands, target) tuples. The target is the address of
+# a direct call or of a rip relative operand.
+def disassemble(path):
+    try:
+        output = subprocess.run([OBJDUMP, '-d', '-M', 'intel', '--no-show-raw-insn', path], capture_output=True,
+                                text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError) as error:
+        raise DescriptorError("Failed to disassemble {} with {}: {}".format(path, OBJDUMP, error))
+    code = []
+    for line in output.splitlines():
+        match = re.match(r'\s+([0-9a-f]+):\t(\S+)\s*(.*)$', line)
+        if not match:
+            continue
+        operands, target = match.group(3), None
+        if '#' in operands:
+            operands, comment = operands.split('#', 1)
+            address = re.search(r'0x([0-9a-f]+)', comment)
+            target = int(address.group(1), 16) if address else None
+        operands = operands.strip()
+        if match.group(2) == 'call' and operands.startswith('0x'):
+            target = int(operands, 16)
+        code.append((int(match.group(1), 16), match.group(2), operands, target))
+    return code
+
+
+# Returns (width or None, register, displacement) of a memory operand, None for other operands.
+def memory_operand(operand):
+    match = MEMORY_PATTERN.search(operand)
+    if not match:
+        return None
+    displacement = int(match.group(4), 16) if match.group(4) else 0
+    if match.group(3) == '-':
+        displacement = -displacement
+    return WIDTHS.get(match.group(1)), REGISTERS.get(match.group(2), match.group(2)), displacement
+
+
+# Follows the values of a function from its entry to every call. Registers and stack slots (relative to the stack
+# pointer at the entry) hold ('pointer', argument, displacement), ('load', argument, offset, mnemonic, width) for a
+# value loaded from a struct argument or ('stack', slot) for a pointer to a stack slot. Yields (address, target,
+# registers, stack, desc, value) at every call, desc and value are the last fmt argument descriptor and struct value
+# stored to the stack since the previous call.
+def trace(code):
+    registers = {'rcx': ('pointer', 0, 0), 'rdx': ('pointer', 1, 0), 'r8': ('pointer', 2, 0), 'r9': ('pointer', 3, 0)}
+    stack = {0x28 + 8 * (argument - 4): ('pointer', argument, 0) for argument in range(4, 32)}
+    frame = {'rsp': 0}
+    desc, value = None, None
+
+    def slot(operand):
+        if operand and operand[1] in frame:
+            return frame[operand[1]] + operand[2]
+        return None
+
+    for address, mnemonic, operands, target in code:
+        parts = operands.split(',', 1) if operands else []
+        if mnemonic == 'push' or operands.startswith('push'):
+            frame['rsp'] -= 8
+        elif mnemonic == 'sub' and parts and parts[0] == 'rsp':
+            frame['rsp'] -= int(parts[1], 16)
+        elif mnemonic == 'lea' and parts and parts[0] == 'rbp' and 'rbp' not in frame:
+            operand = memory_operand(parts[1])
+            frame['rbp'] = frame[operand[1]] + operand[2]
+        elif mnemonic == 'mov' and operands == 'rbp,rsp' and 'rbp' not in frame:
+            frame['rbp'] = frame['rsp']
+        elif mnemonic == 'call':
+            yield address, target, registers, stack, desc, value
+            desc, value = None, None
+            for register in VOLATILE_REGISTERS:
+                registers.pop(register, None)
+        elif len(parts) == 2:
+            match = FMT_DESC_PATTERN.match(operands)
+            if mnemonic == 'mov' and match:
+                desc = int(match.group(1), 16) & 0xf
+                continue
+            destination, source = memory_operand(parts[0]), memory_operand(parts[1])
+            register = REGISTERS.get(parts[0], parts[0])
+            if destination:
+                if slot(destination) is not None:
+                    stored = registers.get(REGISTERS.get(parts[1], parts[1]))
+                    stack[slot(destination)] = stored
+                    if stored and stored[0] != 'stack' and stored[1] >= 2:
+                        value = stored
+            elif mnemonic == 'lea' and source:
+                base = registers.get(source[1])
+                if slot(source) is not None:
+                    registers[register] = ('stack', slot(source))
+                elif base and base[0] == 'pointer':
+                    registers[register] = ('pointer', base[1], base[2] + source[2])
+                else:
+                    registers.pop(register, None)
+            elif source:
+                base = registers.get(source[1])
+                if slot(source) is not None:
+                    registers[register] = stack.get(slot(source))
+                elif base and base[0] == 'pointer' and base[1] >= 2:
+                    registers[register] = ('load', base[1], base[2] + source[2], mnemonic, source[0])
+                else:
+                    registers.pop(register, None)
+            elif mnemonic in ('mov', 'movsd', 'movss', 'movaps', 'movups', 'movq') and \
+                    REGISTERS.get(parts[1], parts[1]) in registers:
+                registers[register] = registers[REGISTERS.get(parts[1], parts[1])]
+            else:
+                registers.pop(register, None)
+
+
+# Machine code of an exe with lookups of the functions, strings and imports.
+class Program:
+    def __init__(self, path):
+        self.pe = PeFile(path)
+        self.code = disassemble(path)
+        self.index = {address: i for i, (address, _, _, _) in enumerate(self.code)}
+        self.bounds = self.pe.functions()
+        self.imports = self.pe.imports()
+
+    # Start and end address of the function containing an address.
+    def function(self, address):
+        for start, end in self.bounds:
+            if start <= address < end:
+                return start, end
+        return None
+
+    def body(self, bounds):
+        return self.code[self.index[bounds[0]]:self.index.get(bounds[1], len(self.code))]
+
+    # Addresses of the code referencing the string.
+    def references(self, string):
+        return [address for address, _, _, target in self.code
+                if target is not None and self.pe.string(target) == string]
+
+
+# Returns the CSV header names of an exe from the function referencing the most name literals.
+def header_names(program):
+    references = []
+    for address, _, _, target in program.code:
+        string = program.pe.string(target) if target is not None else None
+        if string and NAME_PATTERN.match(string):
+            references.append((address, string.decode()))
+    if not references:
+        raise DescriptorError("No CSV header names found")
+    header = Counter(program.function(address) for address, _ in references).most_common(1)[0][0]
+    return [name[:-2] if name.endswith('{}') else name for address, name in references
+            if program.function(address) == header]
+
+
+# Returns the written values of an exe using std::ostream as (fmt type id, load, source) tuples.
+def ostream_writes(program):
+    operators = {}
+    for address, name in program.imports.items():
+        parameter = name.split('QEAAAEAV01@')[-1]
+        if name.startswith('??6?$basic_ostream') and parameter in OSTREAM_OPERATORS:
+            operators[address] = OSTREAM_OPERATORS[parameter]
+    calls = Counter(program.function(address) for address, mnemonic, _, target in program.code
+                    if mnemonic == 'call' and target in operators)
+    if not calls:
+        raise DescriptorError("No CSV writer found")
+    writes = []
+    for address, target, registers, stack, _, _ in trace(program.body(calls.most_common(1)[0][0])):
+        if target in operators:
+            fmt_type, register = operators[target]
+            writes.append((fmt_type, None, registers.get(register)))
+        elif registers.get('rdx') and registers['rdx'][0] == 'load':
+            # operator<<(std::ostream &, char) of a one byte member
+            writes.append((FMT_UINT, None, registers['rdx']))
+    return writes
+
+
+# Returns the written values of an exe using fmt as (fmt type id, load, source) tuples. The writer calls a helper
+# function per value type (value pointer in r8) or formats the value itself.
+def fmt_writes(program, sites):
+    writer = program.function(sites[0])[0], program.function(sites[-1])[1]
+    body = program.body(writer)
+    helpers, vformat = {}, None
+    for target in {target for _, mnemonic, _, target in body if mnemonic == 'call' and target}:
+        bounds = program.function(target)
+        if not bounds or bounds[0] != target:
+            continue
+        load = None
+        code = program.body(bounds)
+        for i, (address, mnemonic, operands, _) in enumerate(code):
+            source = memory_operand(operands.split(',', 1)[1]) if ',' in operands else None
+            if source and source[1] == 'r8' and source[2] == 0 and load is None:
+                load = (mnemonic, source[0])
+            match = FMT_DESC_PATTERN.match(operands)
+            if mnemonic == 'mov' and match:
+                helpers[target] = (int(match.group(1), 16) & 0xf, load)
+                vformat = next(call for _, name, _, call in code[i:] if name == 'call')
+                break
+    writes = []
+    for address, target, registers, stack, desc, value in trace(body):
+        if target in helpers:
+            fmt_type, load = helpers[target]
+            source = registers.get('r8')
+            if source and source[0] == 'stack':
+                source = stack.get(source[1])
+            writes.append((fmt_type, load, source))
+        elif target == vformat and desc is not None:
+            writes.append((desc, None, value))
+    return writes
+
+
+# Returns the sizes read with istream::read in code order.
+def read_sizes(program):
+    reads = {address for address, name in program.imports.items() if name.startswith('?read@?$basic_istream')}
+    sizes = []
+    size = None
+    for _, mnemonic, operands, target in program.code:
+        match = re.match(r'r8d,0x([0-9a-f]+)$', operands)
+        if mnemonic == 'mov' and match:
+            size = int(match.group(1), 16)
+        elif mnemonic == 'call':
+            if size and target in reads:
+                sizes.append(size)
+            size = None
+    return sizes
+
+
+# C type of a written value from its fmt type and the instruction loading it, None if unknown.
+def c_type(fmt_type, load, source):
+    if source is None or source[0] == 'stack':
+        return None
+    if source[0] == 'load':
+        mnemonic, width = source[3], source[4]
+    elif fmt_type == FMT_CUSTOM:
+        # enums are written with operator<<(int)
+        return 'int32_T'
+    elif load is None:
+        return None
+    else:
+        mnemonic, width = load
+    if mnemonic in ('movsd', 'cvttsd2si') and width == 8 or mnemonic == 'mov' and width == 8 and fmt_type == FMT_DOUBLE:
+        return 'double'
+    if mnemonic in ('movss', 'cvtss2sd', 'cvttss2si') or fmt_type == FMT_FLOAT and width == 4:
+        return 'float'
+    if fmt_type == FMT_BOOL and width == 1:
+        return 'boolean_T'
+    if width not in (1, 2, 4, 8):
+        return None
+    signed = mnemonic in ('movsx', 'movsxd') or mnemonic == 'mov' and fmt_type in (FMT_INT, FMT_LONG_LONG, FMT_CUSTOM)
+    return '{}int{}_T'.format('' if signed else 'u', width * 8)
+
+
+# Reads the frame layout of an exe. Returns the format version, the (struct, size) list and the (column, struct,
+# offset, C type) list in CSV column order.
+def exe_layout(path):
+    program = Program(path)
+    names = header_names(program)
+    sites = program.references(b'{}{}')
+    writes = fmt_writes(program, sites) if sites else ostream_writes(program)
+    if len(names) != len(writes):
+        raise DescriptorError("{}: {} header names but {} written values".format(path, len(names), len(writes)))
+    structs = list(dict.fromkeys(name.split('.', 1)[0] for name in names))
+    sizes = read_sizes(program)[-len(structs):]
+    if len(sizes) != len(structs):
+        raise DescriptorError("{}: {} structs but {} reads".format(path, len(structs), len(sizes)))
+    arguments = {}
+    fields = []
+    for name, (fmt_type, load, source) in zip(names, writes):
+        struct_name = name.split('.', 1)[0]
+        ctype = c_type(fmt_type, load, source)
+        if ctype is None:
+            raise DescriptorError("{}: unknown type of {}".format(path, name))
+        if arguments.setdefault(struct_name, source[1]) != source[1]:
+            raise DescriptorError("{}: {} is not read from struct {}".format(path, name, struct_name))
+        fields.append((name, struct_name, source[2], ctype))
+    version = int(re.search(r'(\d+)\.exe$', path, re.IGNORECASE).group(1))
+    check_layout(path, list(zip(structs, sizes)), fields)
+    return version, list(zip(structs, sizes)), fields
+
+
+# Raises DescriptorError if a field is misaligned, outside its struct or overlaps another field.
+def check_layout(path, structs, fields):
+    sizes = dict(structs)
+    spans = {}
+    for name, struct_name, offset, ctype in fields:
+        size = np.dtype(fdr_decoder.C_TYPES[ctype]).itemsize
+        if offset % size or offset < 0 or offset + size > sizes[struct_name]:
+            raise DescriptorError("{}: {} at {} does not fit a {} of struct {}".format(path, name, offset, ctype,
+                                                                                          struct_name))
+        spans.setdefault(struct_name, []).append((offset, offset + size, ctype, name))
+    for items in spans.values():
+        items.sort()
+        for first, second in zip(items, items[1:]):
+            # a column written twice reads the same field
+            if first[1] > second[0] and first[:3] != second[:3]:
+                raise DescriptorError("{}: {} overlaps {}".format(path, first[3], second[3]))
+
+
+# Writes the descriptor of a format version.
+def write_descriptor(path, version, exe, structs, fields):
+    with open(path, 'w', newline='\n') as file:
+        file.write("# FDR format version {}, written by fdr_descriptor.py from {}\n".format(version, exe))
+        file.write("# struct NAME SIZE, then OFFSET TYPE MEMBER for every CSV column of the struct\n")
+        for struct_name, size in structs:
+            file.write("struct {} {}\n".format(struct_name, size))
+            for name, member_struct, offset, ctype in fields:
+                if member_struct == struct_name:
+                    file.write("  {} {} {}\n".format(offset, ctype, name[len(struct_name) + 1:]))
+            file.write("end\n")
+
+
+# Path of the fdr2csv exe of a format version.
+def exe_path(version):
+    return os.path.join(EXE_DIR, 'fdr2csv_v{:02d}.exe'.format(int(version)))
+
+
+# Writes the descriptors of the given versions (all supported if empty) into the formats directory.
+def generate(versions, directory=fdr_decoder.FORMATS_DIR):
+    if not versions:
+        versions = [version for version in range(FIRST_VERSION, LAST_VERSION + 1) if os.path.isfile(exe_path(version))]
+    os.makedirs(directory, exist_ok=True)
+    for version in versions:
+        if not FIRST_VERSION <= int(version) <= LAST_VERSION:
+            raise DescriptorError("Version {} is not supported (only {}-{})".format(version, FIRST_VERSION,
+                                                                                    LAST_VERSION))
+        exe = exe_path(version)
+        version, structs, fields = exe_layout(exe)
+        path = os.path.join(directory, 'v{:02d}.txt'.format(version))
+        write_descriptor(path, version, os.path.basename(exe), structs, fields)
+        print("Written {} ({} columns, {} bytes per frame)".format(path, len(fields),
+                                                                     sum(size for _, size in structs)))
+
+
+# Decodes a FDR file with the built-in decoder and compares it with the CSV file an fdr2csv exe wrote from the same
+# file. Returns the list of (column, problem) differences.
+def check(fdrfile, csvfile):
+    import pandas as pd
+
+    # the frames with the recorded types, without the compact types of the field schema
+    chunks = list(fdr_decoder.iter_frames(fdrfile))
+    decoded = np.concatenate(chunks) if chunks else np.zeros(0, fdr_decoder.load_format(
+        fdr_decoder.read_version(fdrfile)).dtype)
+    expected = pd.read_csv(csvfile)
+    columns = list(decoded.dtype.names)
+    problems = []
+    if columns != list(expected.columns):
+        missing = [column for column in expected.columns if column not in columns]
+        extra = [column for column in columns if column not in expected.columns]
+        problems.append(('columns', "missing {}, extra {}".format(missing, extra)))
+    if len(decoded) != len(expected):
+        problems.append(('rows', "{} decoded, {} in the CSV file".format(len(decoded), len(expected))))
+    rows = min(len(decoded), len(expected))
+    for column in columns:
+        if column not in expected.columns:
+            continue
+        actual = decoded[column][:rows]
+        values = expected[column].to_numpy()[:rows]
+        if values.dtype == object:
+            # one byte members written as a character
+            values = np.array([ord(value) if isinstance(value, str) and len(value) == 1 else np.nan
+                               for value in values])
+        values = values.astype('f8')
+        actual = actual.astype('f8')
+        # some exes write doubles as integers
+        equal = np.isclose(actual, values, rtol=CHECK_TOLERANCE, atol=CHECK_TOLERANCE, equal_nan=True) | \
+            (np.trunc(actual) == values)
+        if not equal.all():
+            row = int(np.argmin(equal))
+            problems.append((column, "{} rows differ, first at row {}: {} decoded, {} in the CSV file".format(
+                int((~equal).sum()), row, actual[row], values[row])))
+    return problems
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='FDR format descriptors from the fdr2csv exes')
+    parser.add_argument('-versions', nargs='*', default=[],
+                        help='Format versions to write (default: all exes from v{:02d} to v{})'.format(
+                            FIRST_VERSION, LAST_VERSION))
+    parser.add_argument('-d', '-directory', dest='directory', default=fdr_decoder.FORMATS_DIR,
+                        help='Output directory (default: fdr_formats)')
+    parser.add_argument('-check', nargs=2, metavar=('FDR', 'CSV'),
+                        help='Compare the decoded FDR file with the CSV file written by the fdr2csv exe')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.check:
+            problems = check(*args.check)
+            for column, problem in problems:
+                print("{}: {}".format(column, problem))
+            print("{} differences".format(len(problems)) if problems else "Decoded file matches the CSV file")
+            sys.exit(1 if problems else 0)
+        generate(args.versions, args.directory)
+    except (DescriptorError, fdr_decoder.FormatError, OSError) as error:
+        print(error)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
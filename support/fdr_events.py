@@ -0,0 +1,441 @@
+import json
+import os
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+import fdr_data
+import fdr_phase
+import fdr_profile
+import fdr_schema
+
+
+# Enums of the mode fields, used to decode the event table and the cursor values of the charts (fdr_analyser_ui)
+class LateralMode(Enum):
+    NONE = 0
+    HDG = 10
+    TRACK = 11
+    NAV = 20
+    LOC_CPT = 30
+    LOC_TRACK = 31
+    LAND = 32
+    FLARE = 33
+    ROLLOUT = 34
+    RWY = 40
+    RWY_TRACK = 41
+    GA_TRACK = 50
+
+
+class LateralArmed(Enum):
+    NONE = 0
+    NAV = 1
+    LOC = 2
+    NAVLOC = 3
+
+
+class VerticalMode(Enum):
+    NONE = 0
+    ALT = 10
+    ALT_CPT = 11
+    OP_CLB = 12
+    OP_DES = 13
+    VS = 14
+    FPA = 15
+    ALT_CST = 20
+    ALT_CST_CPT = 21
+    CLB = 22
+    DES = 23
+    GS_CPT = 30
+    GS_TRACK = 31
+    LAND = 32
+    FLARE = 33
+    ROLLOUT = 34
+    SRS = 40
+    SRS_GA = 41
+
+
+class VerticalArmed(Enum):
+    NONE = 0
+    ALT = 1
+    ALT_CST = 2
+    ALT_ALT_CST = 3
+    CLB = 4
+    ALT_CLB = 5
+    DES = 8
+    GS = 16
+    ALT_GS = 17
+    ALT_CST_GS = 18
+    CLB_GS = 20
+    DES_GS = 24
+
+
+class AutothrustRequestedMode(Enum):
+    NONE = 0
+    SPEED = 1
+    THRUST_IDLE = 2
+    THRUST_CLB = 3
+
+
+class AutothrustStatus(Enum):
+    DISENGAGED = 0
+    ENGAGED_ARMED = 1
+    ENGAGED_ACTIVE = 2
+
+
+class AutothrustMode(Enum):
+    NONE = 0
+    MAN_TOGA = 1
+    MAN_GA_SOFT = 2
+    MAN_FLEX = 3
+    MAN_DTO = 4
+    MAN_MCT = 5
+    MAN_THR = 6
+    SPEED = 7
+    MACH = 8
+    THR_MCT = 9
+    THR_CLB = 10
+    THR_LVR = 11
+    THR_IDLE = 12
+    A_FLOOR = 13
+    TOGA_LK = 14
+
+
+class AutothrustModeMessage(Enum):
+    NONE = 0
+    THRLK = 1
+    LVRTOGA = 2
+    LVRCLB = 3
+    LVRMCT = 4
+    LVRASYM = 5
+
+
+class AutothrustThrustLimit(Enum):
+    NONE = 0
+    CLB = 1
+    MCT = 2
+    FLEX = 3
+    TOGA = 4
+    REVERSE = 5
+
+
+# Defined in fdr_phase, which the command line parsers import without pandas
+FlightPhase = fdr_phase.FlightPhase
+
+
+# Enums used to decode the values of mode fields in the event table
+FIELD_ENUMS = {
+    'ap_sm.data.flight_phase': FlightPhase,
+    'ap_sm.output.lateral_mode': LateralMode,
+    'ap_sm.output.lateral_mode_armed': LateralArmed,
+    'ap_sm.output.vertical_mode': VerticalMode,
+    'ap_sm.output.vertical_mode_armed': VerticalArmed,
+    'ap_sm.output.autothrust_mode': AutothrustRequestedMode,
+    'athr.output.status': AutothrustStatus,
+    'athr.output.mode': AutothrustMode,
+    'athr.output.mode_message': AutothrustModeMessage,
+    'athr.output.thrust_limit_type': AutothrustThrustLimit,
+}
+
+# Field types which hold discrete states (modes, switches, flags). Transitions are extracted for these fields.
+EVENT_TYPES = ('bool', 'int8')
+
+
+# Returns the fields of a header which hold discrete states.
+def event_columns(header):
+    return [column for column in header
+            if column != fdr_data.TIME_COLUMN and fdr_schema.field_type(column) in EVENT_TYPES]
+
+
+# Returns the name of a field value, decoded through the enum of the field if there is one.
+def value_name(field, value):
+    enum = FIELD_ENUMS.get(field)
+    if enum is not None:
+        try:
+            return enum(int(value)).name
+        except ValueError:
+            pass
+    if fdr_schema.field_type(field) == 'bool':
+        return str(bool(value))
+    return str(int(value))
+
+
+# Extracts all value changes of the given fields (all discrete fields of the frame if None) as an event table with
+# one row per change: time, field, old and new value and the decoded names of the values, ordered by time. The time
+# of an event is the time of the first sample with the new value.
+@fdr_profile.traced('derive')
+def extract_events(fdr, columns=None):
+    if columns is None:
+        columns = event_columns(fdr.columns)
+    time = fdr[fdr_data.TIME_COLUMN].to_numpy()
+    times, fields, old, new = [], [], [], []
+    for number, column in enumerate(columns):
+        if column not in fdr:
+            continue
+        values = fdr[column].to_numpy()
+        changes = np.flatnonzero(values[1:] != values[:-1])
+        if not len(changes):
+            continue
+        times.append(time[changes + 1])
+        fields.append(np.full(len(changes), number, dtype=np.int32))
+        old.append(values[changes].astype(np.float64))
+        new.append(values[changes + 1].astype(np.float64))
+    if not times:
+        return pd.DataFrame({'time': pd.Series(dtype=time.dtype), 'field': pd.Series(dtype=object),
+                             'old': pd.Series(dtype=np.float64), 'new': pd.Series(dtype=np.float64),
+                             'old_name': pd.Series(dtype=object), 'new_name': pd.Series(dtype=object)})
+    times, fields, old, new = (np.concatenate(values) for values in (times, fields, old, new))
+    order = np.lexsort((fields, times))
+    events = pd.DataFrame({
+        'time': times[order],
+        'field': pd.Categorical.from_codes(fields[order], categories=list(columns)),
+        'old': old[order],
+        'new': new[order],
+    })
+    events['old_name'] = decode(events['field'], events['old'])
+    events['new_name'] = decode(events['field'], events['new'])
+    return events
+
+
+# Decodes the values of an event table column, one lookup per distinct (field, value) pair.
+def decode(fields, values):
+    pairs = pd.MultiIndex.from_arrays([fields.astype(object), values])
+    names = {pair: value_name(*pair) for pair in pairs.unique()}
+    return pd.Series([names[pair] for pair in pairs], index=fields.index, dtype=object)
+
+
+# Loads the discrete fields of a file (or of the whole flight), optionally only of the time range [start, end], and
+# extracts their events.
+def load_events(path, flight=False, start=None, end=None):
+    columns = event_columns(fdr_data.read_header(path))
+    if flight:
+        fdr = fdr_data.load_flight(path, [fdr_data.TIME_COLUMN] + columns, start, end)
+    else:
+        fdr = fdr_data.load_range(path, [fdr_data.TIME_COLUMN] + columns, start, end)
+    return extract_events(fdr, columns)
+
+
+# Returns the events of one field or of the fields whose name contains the given text.
+def find_events(events, text):
+    return events[events['field'].astype(str).str.contains(text, regex=False)]
+
+
+# Seconds before an autopilot disconnect in which the inputs below are checked to explain it
+DISCONNECT_LOOKBACK = 1.0
+
+# Inputs which explain an autopilot disconnect
+PILOT_DISCONNECT_COLUMNS = ['ap_sm.input.AP_DISCONNECT_push', 'ap_sm.input.AP_1_push', 'ap_sm.input.AP_2_push']
+PROTECTION_DISCONNECT_COLUMNS = ['data.high_aoa_protection', 'data.alpha_floor_condition']
+
+# Sidestick inputs and the deflection above which the pilot overrides the autopilot
+SIDESTICK_COLUMNS = ['data.inputElevator', 'data.inputAileron']
+SIDESTICK_OVERRIDE = 0.5
+
+DISCONNECT_COLUMNS = ([fdr_data.TIME_COLUMN, 'ap_law.ap_on'] + PILOT_DISCONNECT_COLUMNS + PROTECTION_DISCONNECT_COLUMNS
+                      + SIDESTICK_COLUMNS)
+
+
+# Finds every autopilot disconnect (ap_law.ap_on 1 -> 0) and classifies it by the inputs active during the lookback
+# before it: 'pilot' (disconnect or AP push button, sidestick override), 'protection' (high AoA protection, alpha
+# floor) or 'unexplained'. Returns a table with time, cause and the active inputs of each disconnect. Missing input
+# fields (older format versions) are ignored.
+@fdr_profile.traced('derive')
+def find_disconnects(fdr, lookback=DISCONNECT_LOOKBACK):
+    time = fdr[fdr_data.TIME_COLUMN].to_numpy()
+    ap_on = fdr['ap_law.ap_on'].to_numpy() != 0
+    edges = np.flatnonzero(ap_on[:-1] & ~ap_on[1:]) + 1
+    starts = np.searchsorted(time, time[edges] - lookback, side='left')
+    active = {}
+    for column in PILOT_DISCONNECT_COLUMNS + PROTECTION_DISCONNECT_COLUMNS + SIDESTICK_COLUMNS:
+        if column not in fdr:
+            continue
+        values = fdr[column].to_numpy()
+        if column in SIDESTICK_COLUMNS:
+            values = np.abs(values) > SIDESTICK_OVERRIDE
+        # number of samples in [start, edge] where the input is set, from the running count
+        counts = np.concatenate(([0], np.cumsum(values != 0)))
+        active[column] = counts[edges + 1] - counts[starts] > 0
+    pilot = np.zeros(len(edges), dtype=bool)
+    protection = np.zeros(len(edges), dtype=bool)
+    for column, hits in active.items():
+        if column in PROTECTION_DISCONNECT_COLUMNS:
+            protection |= hits
+        else:
+            pilot |= hits
+    cause = np.where(protection, 'protection', np.where(pilot, 'pilot', 'unexplained'))
+    inputs = [', '.join(column for column, hits in active.items() if hits[number]) for number in range(len(edges))]
+    return pd.DataFrame({'time': time[edges], 'cause': cause, 'inputs': inputs})
+
+
+# Writes the samples within +- seconds around each disconnect to <file>_disconnects/<time>.csv with the given columns
+# and returns the written file names.
+def export_windows(path, fdr, disconnects, seconds, columns=None):
+    directory = os.path.splitext(path)[0] + '_disconnects'
+    os.makedirs(directory, exist_ok=True)
+    time = fdr[fdr_data.TIME_COLUMN].to_numpy()
+    if columns is not None:
+        fdr = fdr[[column for column in columns if column in fdr]]
+    starts = np.searchsorted(time, disconnects['time'].to_numpy() - seconds, side='left')
+    stops = np.searchsorted(time, disconnects['time'].to_numpy() + seconds, side='right')
+    files = []
+    for disconnect, start, stop in zip(disconnects.itertuples(), starts, stops):
+        windowfile = os.path.join(directory, '{:.2f}_{}.csv'.format(disconnect.time, disconnect.cause))
+        fdr.iloc[start:stop].to_csv(windowfile, index=False)
+        files.append(windowfile)
+    return files
+
+
+# Finds and classifies the autopilot disconnects of a file (or of all converted files of a directory) and exports
+# the windows around them. With flight the files of a split flight are scanned once as one flight, reported and
+# exported under its first file. With a phase only the disconnects within that flight phase are found, files without
+# the phase are skipped. Returns one table of all disconnects with the file they were found in.
+def scan_disconnects(path, seconds, columns=None, flight=False, phase=None):
+    tables = []
+    for files in fdr_data.scanned_files(path, flight):
+        datafile = files[0]
+        header = fdr_data.read_header(datafile)
+        if fdr_data.TIME_COLUMN not in header or 'ap_law.ap_on' not in header:
+            continue
+        times = scanned_range(files, phase)
+        if times is None:
+            continue
+        wanted = [column for column in dict.fromkeys(DISCONNECT_COLUMNS + list(columns or [])) if column in header]
+        fdr = fdr_data.load_segments(files, wanted, *times)
+        disconnects = find_disconnects(fdr)
+        export_windows(datafile, fdr, disconnects, seconds, columns)
+        disconnects.insert(0, 'file', os.path.basename(datafile))
+        tables.append(disconnects)
+    if not tables:
+        return pd.DataFrame(columns=['file', 'time', 'cause', 'inputs'])
+    return pd.concat(tables, ignore_index=True)
+
+
+# Returns the time range a scan reads of the flight recorded in the given files: (None, None) for the whole flight
+# without a phase, the range of the phase or None if the flight does not have the phase.
+def scanned_range(files, phase=None):
+    if not phase:
+        return None, None
+    times = files_phase(files, phase)
+    if times is None:
+        print("{}: flight phase not found: {}".format(os.path.basename(files[0]), phase))
+    return times
+
+
+# Fields the flight phase segments are built from
+PHASE_COLUMNS = [fdr_data.TIME_COLUMN, 'ap_sm.data.flight_phase', 'ap_sm.data.on_ground',
+                 'ap_sm.data_computed.time_since_lift_off', 'ap_sm.data_computed.time_since_touchdown']
+
+# Seconds before and after lift-off and touchdown covered by the liftoff and touchdown segments
+PHASE_EVENT_MARGIN = 30.0
+
+
+# Splits a flight into segments of constant flight phase and ground state and adds the segments 'liftoff' and
+# 'touchdown' around each lift-off and touchdown. The exact lift-off and touchdown times are taken from the time since
+# lift-off/touchdown counters where they are recorded. Returns a table with the phase name, on_ground and the first
+# and last time of each segment, ordered by time.
+@fdr_profile.traced('derive')
+def flight_phases(fdr):
+    time = fdr[fdr_data.TIME_COLUMN].to_numpy(dtype=np.float64)
+    phase = fdr['ap_sm.data.flight_phase'].to_numpy().astype(np.int16)
+    on_ground = fdr['ap_sm.data.on_ground'].to_numpy() != 0
+    if not len(time):
+        return pd.DataFrame({'phase': pd.Series(dtype=object), 'on_ground': pd.Series(dtype=bool),
+                             'start': pd.Series(dtype=np.float64), 'end': pd.Series(dtype=np.float64)})
+    # a segment starts at the first sample and wherever the phase or the ground state changes
+    starts = np.flatnonzero(np.concatenate(([True], (phase[1:] != phase[:-1]) | (on_ground[1:] != on_ground[:-1]))))
+    ends = np.concatenate((starts[1:] - 1, [len(time) - 1]))
+    segments = pd.DataFrame({
+        'phase': [value_name('ap_sm.data.flight_phase', value).lower() for value in phase[starts]],
+        'on_ground': on_ground[starts],
+        'start': time[starts],
+        'end': time[ends],
+    })
+    events = []
+    for name, edges, counter in (
+            ('liftoff', np.flatnonzero(on_ground[:-1] & ~on_ground[1:]) + 1, 'ap_sm.data_computed.time_since_lift_off'),
+            ('touchdown', np.flatnonzero(~on_ground[:-1] & on_ground[1:]) + 1,
+             'ap_sm.data_computed.time_since_touchdown')):
+        moments = time[edges]
+        if counter in fdr:
+            since = fdr[counter].to_numpy(dtype=np.float64)[edges]
+            moments = np.where((since >= 0) & (since < PHASE_EVENT_MARGIN), moments - since, moments)
+        for moment in moments:
+            events.append({'phase': name, 'on_ground': name == 'touchdown',
+                           'start': moment - PHASE_EVENT_MARGIN, 'end': moment + PHASE_EVENT_MARGIN})
+    if events:
+        segments = pd.concat([segments, pd.DataFrame(events)], ignore_index=True)
+    return segments.sort_values('start', kind='stable', ignore_index=True)
+
+
+# Path of the phase segment table stored next to a converted file (and its cache).
+def phases_path(path):
+    return path + '.phases'
+
+
+# Returns the phase segments of a file, built once and stored next to it. Returns None if the file does not have
+# the flight phase fields.
+def load_phases(path):
+    phasesfile = phases_path(path)
+    if os.path.isfile(phasesfile) and os.path.getmtime(phasesfile) >= os.path.getmtime(path):
+        with open(phasesfile) as file:
+            return pd.DataFrame(json.load(file), columns=['phase', 'on_ground', 'start', 'end'])
+    header = fdr_data.read_header(path)
+    if any(column not in header for column in PHASE_COLUMNS[:3]):
+        return None
+    segments = flight_phases(fdr_data.load_frame(path, [column for column in PHASE_COLUMNS if column in header]))
+    with open(phasesfile, 'w') as file:
+        json.dump(segments.to_dict('records'), file, indent=1, default=float)
+    return segments
+
+
+# Returns the time ranges [start, end] of a phase (e.g. 'approach', 'liftoff'), one per contiguous part of the
+# flight in that phase, ordered by time. Segments of a flight phase which only differ in the ground state are joined,
+# lift-off and touchdown segments are joined only where they overlap. A flight with a go-around has two approaches.
+def phase_ranges(segments, name):
+    name = name.lower()
+    ranges = []
+    joined = False
+    for phase, start, end in zip(segments['phase'], segments['start'], segments['end']):
+        if phase == name:
+            if ranges and (joined or start <= ranges[-1][1]):
+                ranges[-1][1] = max(ranges[-1][1], float(end))
+            else:
+                ranges.append([float(start), float(end)])
+            joined = name not in fdr_phase.PHASE_EVENTS
+        elif phase not in fdr_phase.PHASE_EVENTS:
+            joined = False
+    return [(start, end) for start, end in ranges]
+
+
+# Returns the time range of one occurrence of a phase (see phase_ranges(), 0 for the first, -1 for the last) or None
+# if the flight has no such occurrence.
+def phase_range(segments, name, occurrence=0):
+    ranges = phase_ranges(segments, name)
+    if not -len(ranges) <= occurrence < len(ranges):
+        return None
+    return ranges[occurrence]
+
+
+# Names of the phases of the phase segment table
+PHASE_NAMES = fdr_phase.PHASE_NAMES
+
+
+# Returns the time range of a phase of a file, or of the whole flight the file belongs to, or None if the file does
+# not record flight phases or has no such phase. A phase the flight passes more than once (e.g. the approach before
+# and after a go-around) is taken at the given occurrence, the charts, the scans and the scripts use the first one.
+def find_phase(path, name, flight=False, occurrence=0):
+    return files_phase(fdr_data.find_flight(path) if flight else [path], name, occurrence)
+
+
+# Returns the time range of a phase of the flight recorded in the given files (see fdr_data.scanned_files()) or None
+# if the files do not record flight phases or the flight has no such phase (see find_phase() for the occurrence).
+def files_phase(files, name, occurrence=0):
+    header = fdr_data.read_header(files[0])
+    if any(column not in header for column in PHASE_COLUMNS[:3]):
+        return None
+    if len(files) == 1:
+        segments = load_phases(files[0])
+    else:
+        columns = [column for column in PHASE_COLUMNS if column in header]
+        segments = flight_phases(fdr_data.load_segments(files, columns))
+    return phase_range(segments, name, occurrence)
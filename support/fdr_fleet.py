@@ -0,0 +1,175 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import fdr_data
+import fdr_events
+
+# Fleet statistics are computed map-reduce style: a reducer turns the fields of one file into a partial result, a dict
+#
+#   {'files': 1, 'counts': {'land_engagements': 3, ...}, 'values': {'land_engagement_radio_altitude_ft': [...]}}
+#
+# and the partial results of all files are merged by adding the files and counts and concatenating the values. The
+# files are reduced on a process pool in any order, only the small partial results are sent back. The values are the
+# measurements at events (a few per flight), so the quantiles are computed exactly from all of them.
+
+# Radio altitude below which a LAND mode engagement counts as low
+LAND_RADIO_ALTITUDE = 400
+
+# Seconds after touchdown in which the peak load factor is taken
+TOUCHDOWN_WINDOW = 2.0
+
+# Quantiles reported for the values
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+# Bin edges of the histograms of the values
+HISTOGRAM_BINS = {
+    'land_engagement_radio_altitude_ft': np.arange(0, 1600, 100),
+    'speed_idle_altitude_ft': np.arange(0, 42000, 2000),
+    'touchdown_load_factor_g': np.arange(0.8, 2.05, 0.05),
+}
+
+
+# Number of LAND mode engagements, of those below LAND_RADIO_ALTITUDE and the radio altitude of every engagement.
+def land_engagement(fdr, fields):
+    mode = fdr[fields['mode']].to_numpy()
+    radio = fdr[fields['radio']].to_numpy(dtype=np.float64)
+    land = mode == fdr_events.VerticalMode.LAND.value
+    engaged = np.flatnonzero(land[1:] & ~land[:-1]) + 1
+    return {
+        'counts': {'land_engagements': len(engaged),
+                   'land_engagements_below_{}ft'.format(LAND_RADIO_ALTITUDE):
+                       int((radio[engaged] < LAND_RADIO_ALTITUDE).sum())},
+        'values': {'land_engagement_radio_altitude_ft': radio[engaged]},
+    }
+
+
+# Altitude of every A/THR transition from SPEED directly to THR_IDLE.
+def speed_idle_transition(fdr, fields):
+    mode = fdr[fields['mode']].to_numpy()
+    altitude = fdr[fields['altitude']].to_numpy(dtype=np.float64)
+    transitions = np.flatnonzero((mode[:-1] == fdr_events.AutothrustMode.SPEED.value)
+                                 & (mode[1:] == fdr_events.AutothrustMode.THR_IDLE.value)) + 1
+    return {
+        'counts': {'speed_idle_transitions': len(transitions)},
+        'values': {'speed_idle_altitude_ft': altitude[transitions]},
+    }
+
+
+# Peak load factor within TOUCHDOWN_WINDOW after every touchdown.
+def touchdown_load_factor(fdr, fields):
+    time = fdr[fields['time']].to_numpy(dtype=np.float64)
+    on_ground = fdr[fields['on_ground']].to_numpy() != 0
+    nz = fdr[fields['nz']].to_numpy(dtype=np.float64)
+    touchdowns = np.flatnonzero(on_ground[1:] & ~on_ground[:-1]) + 1
+    stops = np.searchsorted(time, time[touchdowns] + TOUCHDOWN_WINDOW, side='right')
+    return {
+        'counts': {'touchdowns': len(touchdowns)},
+        'values': {'touchdown_load_factor_g': np.array([nz[start:stop].max()
+                                                        for start, stop in zip(touchdowns, stops)])},
+    }
+
+
+# Reducers by name: the fields they use (canonical names, older format versions are read through their aliases) and
+# the function computing the partial result of a file.
+REDUCERS = {
+    'land': ({
+        'mode': 'ap_sm.output.vertical_mode',
+        'radio': 'ap_sm.data.H_radio_ft',
+    }, land_engagement),
+    'athr_idle': ({
+        'mode': 'athr.output.mode',
+        'altitude': 'athr.data.H_ind_ft',
+    }, speed_idle_transition),
+    'touchdown': ({
+        'time': fdr_data.TIME_COLUMN,
+        'on_ground': 'ap_sm.data.on_ground',
+        'nz': 'athr.data.nz_g',
+    }, touchdown_load_factor),
+}
+
+
+# Returns the fields of a reducer or None if the header does not have them.
+def reducer_fields(header, fields):
+    if not all(name in header for name in fields.values()):
+        return None
+    return fields
+
+
+def empty_result():
+    return {'files': 0, 'counts': {}, 'values': {}}
+
+
+# Merges the partial result b into a and returns a.
+def merge(a, b):
+    a['files'] += b['files']
+    for name, count in b['counts'].items():
+        a['counts'][name] = a['counts'].get(name, 0) + int(count)
+    for name, values in b['values'].items():
+        a['values'][name] = np.concatenate((a['values'].get(name, np.empty(0)), np.asarray(values, dtype=np.float64)))
+    return a
+
+
+# Reduces one file with the given reducers, reading only the fields they use (not through the frame cache, every
+# file is read once). Files without a reducer's fields are counted as skipped for it, files without the time field
+# are not recordings and not counted.
+def reduce_file(path, names):
+    header = fdr_data.read_header(path)
+    if fdr_data.TIME_COLUMN not in header:
+        return empty_result()
+    fields = {name: reducer_fields(header, REDUCERS[name][0]) for name in names}
+    columns = list(dict.fromkeys(column for present in fields.values() if present for column in present.values()))
+    fdr = fdr_data.read_columns(path, columns) if columns else None
+    result = empty_result()
+    result['files'] = 1
+    for name in names:
+        if fields[name] is None:
+            partial = {'counts': {name + '_skipped': 1}, 'values': {}}
+        else:
+            partial = REDUCERS[name][1](fdr, fields[name])
+        merge(result, dict(files=0, **partial))
+    return result
+
+
+# Summarizes a merged result: the counts and for every value its number, mean, quantiles and histogram.
+def summarize(result):
+    summary = {'files': result['files'], 'counts': result['counts'], 'values': {}}
+    for name, values in result['values'].items():
+        values = values[np.isfinite(values)]
+        entry = {'count': int(len(values))}
+        if len(values):
+            entry['mean'] = float(values.mean())
+            entry['quantiles'] = {'p{:02.0f}'.format(q * 100): float(v)
+                                  for q, v in zip(QUANTILES, np.quantile(values, QUANTILES))}
+        if name in HISTOGRAM_BINS:
+            counts, edges = np.histogram(values, bins=HISTOGRAM_BINS[name])
+            entry['histogram'] = {'edges': [float(edge) for edge in edges], 'counts': counts.tolist()}
+        summary['values'][name] = entry
+    return summary
+
+
+# Reduces all converted files of a directory on a process pool (one file per task) and merges the partial results
+# as they complete. Only recordings are submitted (see fdr_data.data_files()), the tables the tools write into the
+# directory are neither read nor counted. Files which cannot be read are counted as failed. Returns the summary.
+def aggregate(directory, names=None, jobs=None):
+    names = list(names or REDUCERS)
+    datafiles = fdr_data.data_files(directory)
+    print("Found {} files in {}".format(len(datafiles), directory))
+    result = empty_result()
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {executor.submit(reduce_file, datafile, names): datafile for datafile in datafiles}
+        for future in as_completed(futures):
+            try:
+                merge(result, future.result())
+            except (OSError, ValueError) as error:
+                merge(result, {'files': 0, 'counts': {'failed': 1}, 'values': {}})
+                print("{}: {}".format(os.path.basename(futures[future]), error))
+    return summarize(result)
+
+
+def write_summary(path, summary):
+    with open(path, 'w') as file:
+        json.dump(summary, file, indent=2)
+    return path
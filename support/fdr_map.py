@@ -0,0 +1,169 @@
+import json
+
+import numpy as np
+
+import fdr_profile
+
+EARTH_RADIUS = 6371000.0
+
+# Default deviation in metres the simplified track may have from the recorded track
+DEFAULT_TOLERANCE = 25.0
+
+LAT_COLUMN = 'ap_sm.data.aircraft_position.lat'
+LON_COLUMN = 'ap_sm.data.aircraft_position.lon'
+
+# Fields the track can be coloured by and the colour of each value
+TRACK_COLOURS = {
+    'phase': ('ap_sm.data.flight_phase', {
+        0: 'gray', 1: 'orange', 2: 'green', 3: 'blue', 4: 'purple', 5: 'red', 6: 'magenta', 7: 'gray'}),
+    'ap': ('ap_law.ap_on', {0: 'blue', 1: 'green'}),
+}
+DEFAULT_COLOUR = 'blue'
+
+# Width and height in pixels of the offline SVG map (a thumbnail, the lines stay sharp when it is scaled up)
+MAP_SIZE = 400
+MAP_MARGIN = 10
+
+
+# Projects positions onto a local plane in metres (equirectangular, good enough for tolerances of some metres).
+def local_xy(lat, lon):
+    lat = np.radians(lat)
+    return EARTH_RADIUS * np.radians(lon) * np.cos(lat), EARTH_RADIUS * lat
+
+
+# Douglas-Peucker simplification of the points [first, last]: returns a mask of the points to keep so that no
+# dropped point is further than tolerance from the simplified line. Straight stretches (en route) keep only their
+# ends while turns keep as many points as needed.
+def douglas_peucker(x, y, first, last, tolerance, keep):
+    stack = [(first, last)]
+    while stack:
+        first, last = stack.pop()
+        keep[first] = keep[last] = True
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1:last] - x[first], y[first + 1:last] - y[first]
+        length = np.hypot(dx, dy)
+        if length == 0:
+            distances = np.hypot(px, py)
+        else:
+            distances = np.abs(px * dy - py * dx) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            middle = first + 1 + farthest
+            stack.append((first, middle))
+            stack.append((middle, last))
+    return keep
+
+
+# Returns the indices of the valid positions (finite, not the 0/0 position before the sim has loaded).
+def valid_positions(lat, lon):
+    return np.flatnonzero(np.isfinite(lat) & np.isfinite(lon) & ((lat != 0) | (lon != 0)))
+
+
+# Simplifies a track to the given tolerance in metres. The points where the category (e.g. flight phase) changes are
+# always kept so the track can be coloured by it. Returns the indices of the kept points.
+def simplify(lat, lon, tolerance=DEFAULT_TOLERANCE, categories=None):
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    valid = valid_positions(lat, lon)
+    if len(valid) < 3:
+        return valid
+    x, y = local_xy(lat[valid], lon[valid])
+    keep = np.zeros(len(valid), dtype=bool)
+    breaks = [0, len(valid) - 1]
+    if categories is not None:
+        values = np.asarray(categories)[valid]
+        breaks += list(np.flatnonzero(values[1:] != values[:-1]) + 1)
+    breaks = sorted(set(breaks))
+    for first, last in zip(breaks[:-1], breaks[1:]):
+        douglas_peucker(x, y, first, last, tolerance, keep)
+    return valid[keep]
+
+
+# Splits a simplified track into runs of constant category. Neighbouring runs share their boundary point so the track
+# stays continuous. Returns a list of (category, indices).
+def track_runs(indices, categories=None):
+    if categories is None or not len(indices):
+        return [(None, indices)]
+    values = np.asarray(categories)[indices]
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    stops = np.concatenate((starts[1:], [len(indices) - 1]))
+    return [(values[start], indices[start:stop + 1]) for start, stop in zip(starts, stops)]
+
+
+# Returns the simplified runs of a flight's track with their colours, coloured by 'phase', 'ap' or not at all (None
+# or the field not recorded).
+@fdr_profile.traced('derive')
+def coloured_track(fdr, colour_by='phase', tolerance=DEFAULT_TOLERANCE):
+    column, colours = TRACK_COLOURS.get(colour_by, (None, {}))
+    categories = fdr[column].to_numpy() if column in fdr else None
+    lat, lon = fdr[LAT_COLUMN].to_numpy(), fdr[LON_COLUMN].to_numpy()
+    indices = simplify(lat, lon, tolerance, categories)
+    return [(colours.get(int(category), DEFAULT_COLOUR) if category is not None else DEFAULT_COLOUR,
+             lat[run], lon[run]) for category, run in track_runs(indices, categories)]
+
+
+# Projects the runs of a track onto one local plane in metres (around the middle latitude of the whole track, so the
+# runs fit together). Returns x and y of each run and the bounds (xmin, ymin, xmax, ymax).
+def project_runs(runs):
+    lat = np.concatenate([run_lat for _, run_lat, _ in runs])
+    reference = np.cos(np.radians((lat.min() + lat.max()) / 2))
+    projected = [(EARTH_RADIUS * np.radians(run_lon) * reference, EARTH_RADIUS * np.radians(run_lat))
+                 for _, run_lat, run_lon in runs]
+    xs = np.concatenate([x for x, _ in projected])
+    ys = np.concatenate([y for _, y in projected])
+    return projected, (xs.min(), ys.min(), xs.max(), ys.max())
+
+
+# Writes the runs of a track as GeoJSON (one LineString per run, with its colour as "stroke" like geojson.io and
+# most viewers expect). Returns the file name.
+def write_geojson(path, runs):
+    features = [{
+        'type': 'Feature',
+        'properties': {'stroke': colour, 'stroke-width': 2.5},
+        'geometry': {'type': 'LineString',
+                     'coordinates': [[round(float(lon), 6), round(float(lat), 6)] for lat, lon in zip(lats, lons)]},
+    } for colour, lats, lons in runs]
+    with open(path, 'w') as file:
+        json.dump({'type': 'FeatureCollection', 'features': features}, file)
+    return path
+
+
+# Returns the runs of a track as a self-contained SVG document of size x size pixels: north up, same scale in both
+# directions, start marked with a circle. No map tiles, so nothing is fetched from the network.
+def track_svg(runs, size=MAP_SIZE):
+    projected, (xmin, ymin, xmax, ymax) = project_runs(runs)
+    scale = (size - 2 * MAP_MARGIN) / max(xmax - xmin, ymax - ymin, 1.0)
+    # centre the track in the square
+    left = (size - (xmax - xmin) * scale) / 2
+    top = (size - (ymax - ymin) * scale) / 2
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{0}" viewBox="0 0 {0} {0}">'.format(size),
+             '<rect width="100%" height="100%" fill="white"/>']
+    for number, ((colour, _, _), (x, y)) in enumerate(zip(runs, projected)):
+        px = left + (x - xmin) * scale
+        py = size - top - (y - ymin) * scale
+        points = ' '.join('{:.1f},{:.1f}'.format(*point) for point in zip(px, py))
+        lines.append('<polyline points="{}" fill="none" stroke="{}" stroke-width="2" stroke-linejoin="round"/>'.format(
+            points, colour))
+        if number == 0:
+            lines.append('<circle cx="{:.1f}" cy="{:.1f}" r="4" fill="{}"/>'.format(px[0], py[0], colour))
+    lines.append('</svg>')
+    return '\n'.join(lines)
+
+
+def write_svg(path, runs, size=MAP_SIZE):
+    with open(path, 'w') as file:
+        file.write(track_svg(runs, size))
+    return path
+
+
+# Draws the runs of a track into matplotlib axes in longitude/latitude with the aspect of the local projection, so the
+# track has its true shape.
+def plot_track(axes, runs):
+    for colour, lats, lons in runs:
+        axes.plot(lons, lats, color=colour, linewidth=2)
+    axes.plot(runs[0][2][0], runs[0][1][0], 'o', color=runs[0][0])
+    lat = np.concatenate([lats for _, lats, _ in runs])
+    axes.set_aspect(1 / np.cos(np.radians((lat.min() + lat.max()) / 2)))
+    axes.set_xlabel('Longitude')
+    axes.set_ylabel('Latitude')
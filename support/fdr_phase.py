@@ -0,0 +1,22 @@
+# The flight phases recorded in ap_sm.data.flight_phase. They have no dependencies, so the command line parsers can
+# offer the phase names without importing pandas (see fdr_startup.py).
+
+from enum import Enum
+
+
+class FlightPhase(Enum):
+    PREFLIGHT = 0
+    TAKEOFF = 1
+    CLIMB = 2
+    CRUISE = 3
+    DESCENT = 4
+    APPROACH = 5
+    GOAROUND = 6
+    DONE = 7
+
+
+# Segments around a moment of the flight, they overlap the segments of the flight phases
+PHASE_EVENTS = ['liftoff', 'touchdown']
+
+# Names of the phases of the phase segment table
+PHASE_NAMES = [phase.name.lower() for phase in FlightPhase] + PHASE_EVENTS
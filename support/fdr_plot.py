@@ -0,0 +1,95 @@
+import weakref
+
+import numpy as np
+
+import fdr_profile
+
+# Number of points drawn per pixel of the axes width. Every bucket of samples is drawn with its minimum and maximum
+# sample, so spikes stay visible even if many samples fall on one pixel.
+POINTS_PER_PIXEL = 2
+
+# Filled areas registered with fill_between(), per axes: list of (collection, x, y)
+fills = weakref.WeakKeyDictionary()
+
+
+# Returns the indices of the samples to draw for the samples [start, stop) when at most the given number of buckets
+# can be distinguished: the first and last sample and the minimum and maximum of every bucket. All indices are
+# returned if there are not more samples than needed.
+def minmax_indices(y, start, stop, buckets):
+    count = stop - start
+    if buckets < 1 or count <= POINTS_PER_PIXEL * buckets:
+        return np.arange(start, stop)
+    size = -(-count // buckets)
+    full = count // size * size
+    blocks = y[start:start + full].reshape(-1, size)
+    offsets = start + np.arange(len(blocks)) * size
+    indices = [offsets + np.argmin(blocks, axis=1), offsets + np.argmax(blocks, axis=1), [start, stop - 1]]
+    if full < count:
+        rest = y[start + full:stop]
+        indices.append([start + full + np.argmin(rest), start + full + np.argmax(rest)])
+    return np.unique(np.concatenate(indices))
+
+
+# Returns the range [start, stop) of the samples visible between xmin and xmax including one sample on each side,
+# so lines leave the axes at the right slope. Unsorted data (e.g. a map track) is always used completely.
+def visible_range(x, xmin, xmax, ordered):
+    if not ordered:
+        return 0, len(x)
+    start = max(int(np.searchsorted(x, xmin, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, xmax, side='right')) + 1, len(x))
+    return start, stop
+
+
+# Replaces the area between y and 0 of an axes like axes.fill_between() but registers the full data, so decimate()
+# can update it with the lines.
+@fdr_profile.traced('plot')
+def fill_between(axes, x, y, **kwargs):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    collection = axes.fill_between(x, y, **kwargs)
+    fills.setdefault(axes, []).append((collection, x, y))
+    return collection
+
+
+# Decimates all lines (and fills registered with fill_between()) of a figure to about POINTS_PER_PIXEL points per pixel
+# of the visible x range and redoes this whenever the x range (zoom, pan) or the window size changes. When zoomed in
+# far enough all samples are drawn. Call it after all data has been plotted, before plt.show() or savefig().
+@fdr_profile.traced('render')
+def decimate(figure):
+    series = []
+    lines = set()
+    for axes in figure.axes:
+        # apply the pending autoscaling while the lines still have all samples
+        axes.get_xlim()
+        for line in axes.get_lines():
+            x = np.asarray(line.get_xdata(), dtype=float)
+            y = np.asarray(line.get_ydata(), dtype=float)
+            if len(x) > 1 and len(x) == len(y):
+                series.append((axes, line, x, y, bool(np.all(np.diff(x) >= 0))))
+                lines.add(line)
+        for collection, x, y in fills.get(axes, []):
+            series.append((axes, collection, x, y, bool(np.all(np.diff(x) >= 0))))
+        axes.set_autoscalex_on(False)
+    shown = {}
+
+    def update(_=None):
+        for axes, artist, x, y, ordered in series:
+            xmin, xmax = sorted(axes.get_xlim())
+            width = int(axes.bbox.width)
+            if shown.get(artist) == (xmin, xmax, width):
+                continue
+            shown[artist] = (xmin, xmax, width)
+            start, stop = visible_range(x, xmin, xmax, ordered)
+            indices = minmax_indices(y, start, stop, width)
+            if artist in lines:
+                artist.set_data(x[indices], y[indices])
+            else:
+                artist.set_verts([np.column_stack((np.concatenate((x[indices], x[indices][::-1])),
+                                                   np.concatenate((y[indices], np.zeros(len(indices))))))])
+
+    update()
+    for axes in figure.axes:
+        axes.callbacks.connect('xlim_changed', update)
+    figure.canvas.mpl_connect('resize_event', update)
+    # keep the callback alive as long as the figure
+    figure.fdr_decimate = update
@@ -0,0 +1,271 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Timing spans and memory samples written as a Chrome trace (open in chrome://tracing or https://ui.perfetto.dev) when
+# a tool is run with --profile FILE:
+#
+#   with fdr_profile.span('derive', 'frame_health'):    # a span in a function
+#   @fdr_profile.traced('plot')                         # a span around every call of a function
+#   fdr_profile.phase('plot')                           # ends the running phase of a script and starts the next
+#
+# The spans are grouped by their category: load (getting the data of a chart), parse (reading a file), derive
+# (computing from the data), plot (building a chart) and render (drawing a chart). Spans nest, the summary reports
+# the total time of each category and its own time without the spans inside. The resident memory (RSS) of the process
+# is sampled in the background, its peak is part of the summary. The time a chart window is open is traced as a
+# window span and does not count for the spans around it. Without --profile all calls do nothing.
+#
+# Only the process which was started with --profile is traced, not the workers of batch, render and fleet mode.
+
+# Trace file written by --profile without a file name
+DEFAULT_PROFILE = 'fdr_profile.json'
+
+# Seconds between two memory samples
+SAMPLE_INTERVAL = 0.05
+
+CATEGORIES = ['load', 'parse', 'derive', 'plot', 'render']
+
+# Category of the spans in which the user looks at a chart window
+WINDOW_CATEGORY = 'window'
+
+
+# Collects the spans and memory samples of the process.
+class Profiler:
+    def __init__(self):
+        self.path = None
+        self.spans = []
+        self.samples = []
+        self.peak = 0
+        self.origin = time.perf_counter()
+        self.local = threading.local()
+        self.stopped = threading.Event()
+
+    # Starts profiling into the given trace file. The file is written when finish() is called and at exit.
+    def start(self, path, interval=SAMPLE_INTERVAL):
+        if not path or self.path:
+            return
+        self.path = path
+        self.origin = time.perf_counter()
+        threading.Thread(target=self.sample, args=(interval,), daemon=True).start()
+        atexit.register(self.write)
+
+    # Microseconds since the start.
+    def now(self):
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def sample(self, interval):
+        while not self.stopped.is_set():
+            rss = current_rss()
+            if rss is not None:
+                self.peak = max(self.peak, rss)
+                self.samples.append((self.now(), rss))
+            self.stopped.wait(interval)
+
+    def begin(self, category, name=None, **args):
+        stack = self.stack()
+        nested = any(span['cat'] == category for span in stack)
+        stack.append({'name': name or category, 'cat': category, 'ts': self.now(), 'args': args,
+                      'tid': threading.get_ident(), 'inner': 0.0, 'idle': 0.0, 'nested': nested})
+
+    # Ends the innermost span of the calling thread.
+    def end(self):
+        stack = self.stack()
+        if not stack:
+            return
+        span = stack.pop()
+        span['dur'] = self.now() - span['ts']
+        if stack:
+            stack[-1]['inner'] += span['dur']
+            stack[-1]['idle'] += span['idle'] + (span['dur'] if span['cat'] == WINDOW_CATEGORY else 0)
+        rss = current_rss()
+        if rss is not None:
+            span['args']['rss_mb'] = round(rss / 1e6, 1)
+        self.spans.append(span)
+
+    # Ends the running phase (a span started by phase()) and starts the next one.
+    def phase(self, category, name=None, **args):
+        if getattr(self.local, 'phase', False):
+            self.end()
+        self.begin(category, name, **args)
+        self.local.phase = True
+
+    # Returns the total and own seconds and the number of spans of every category and of every span name. Window spans
+    # inside a span are not counted for its total, nor are spans inside a span of the same category for the category.
+    def summary(self):
+        categories = {}
+        names = {}
+        for span in self.spans:
+            for key, table in ((span['cat'], categories), (span['cat'] + ':' + span['name'], names)):
+                entry = table.setdefault(key, {'count': 0, 'total_s': 0.0, 'self_s': 0.0})
+                entry['count'] += 1
+                if table is names or not span['nested']:
+                    entry['total_s'] += (span['dur'] - span['idle']) / 1e6
+                entry['self_s'] += (span['dur'] - span['inner']) / 1e6
+        peak = max(self.peak, os_peak_rss() or 0)
+        return {'categories': categories, 'spans': names, 'peak_rss_mb': round(peak / 1e6, 1) if peak else None}
+
+    # Writes the finished spans and the memory samples as a Chrome trace with the summary as its metadata. Returns
+    # the file name.
+    def write(self):
+        if not self.path:
+            return None
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': os.path.basename(sys.argv[0])}}]
+        events += [{'name': span['name'], 'cat': span['cat'], 'ph': 'X', 'ts': round(span['ts'], 1),
+                    'dur': round(span['dur'], 1), 'pid': pid, 'tid': span['tid'], 'args': span['args']}
+                   for span in list(self.spans)]
+        events += [{'name': 'RSS', 'ph': 'C', 'ts': round(ts, 1), 'pid': pid, 'args': {'MB': round(rss / 1e6, 1)}}
+                   for ts, rss in list(self.samples)]
+        trace = {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': dict(self.summary(), command=' '.join(sys.argv), python=platform.python_version(),
+                              platform=platform.platform()),
+        }
+        tmpfile = self.path + '.tmp'
+        with open(tmpfile, 'w') as file:
+            json.dump(trace, file)
+        os.replace(tmpfile, self.path)
+        return self.path
+
+
+# Session wide profiler, enabled by start().
+profiler = Profiler()
+
+
+def start(path):
+    profiler.start(path)
+
+
+def enabled():
+    return profiler.path is not None
+
+
+# Returns a context manager timing its block as a span.
+def span(category, name=None, **args):
+    if not enabled():
+        return contextlib.nullcontext()
+    return timed(category, name, **args)
+
+
+@contextlib.contextmanager
+def timed(category, name=None, **args):
+    profiler.begin(category, name, **args)
+    try:
+        yield
+    finally:
+        profiler.end()
+
+
+# Decorator timing every call of a function as a span named after the function.
+def traced(category):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return function(*args, **kwargs)
+            with timed(category, function.__name__):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Ends the running phase of a script and starts the next.
+def phase(category, name=None, **args):
+    if enabled():
+        profiler.phase(category, name, **args)
+
+
+# Writes the trace without ending the running spans, e.g. before a chart window blocks.
+def flush():
+    if enabled():
+        profiler.write()
+
+
+# Draws a figure once as a render span (the window draws it again when shown, the time spent looking at the window
+# is not traced), ends all running spans of the calling thread, writes the trace and prints the summary.
+def finish(figure=None):
+    if not enabled():
+        return
+    if figure is not None:
+        phase('render', 'draw')
+        figure.canvas.draw()
+    while profiler.stack():
+        profiler.end()
+    profiler.local.phase = False
+    path = profiler.write()
+    print_summary(profiler.summary())
+    print("Profile written: " + path)
+
+
+def print_summary(summary):
+    print("{:10s} {:>10s} {:>10s} {:>6s}".format('Profile', 'Total s', 'Self s', 'Spans'))
+    for category in CATEGORIES + sorted(set(summary['categories']) - set(CATEGORIES)):
+        entry = summary['categories'].get(category)
+        if entry:
+            print("{:10s} {:10.3f} {:10.3f} {:6d}".format(category, entry['total_s'], entry['self_s'], entry['count']))
+    if summary['peak_rss_mb']:
+        print("Peak RSS   {:.0f} MB".format(summary['peak_rss_mb']))
+
+
+# Resident memory of the process in bytes, None if it cannot be determined.
+def current_rss():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform == 'win32':
+        return windows_memory()[0]
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Peak resident memory of the process in bytes as recorded by the system, None if not available.
+def os_peak_rss():
+    if sys.platform == 'win32':
+        return windows_memory()[1]
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+# Working set and peak working set of the process on Windows in bytes.
+def windows_memory():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess
+    process.restype = wintypes.HANDLE
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process(), ctypes.byref(counters), counters.cb):
+        return None, None
+    return counters.WorkingSetSize, counters.PeakWorkingSetSize
@@ -0,0 +1,605 @@
+# Compact column types for all FDR fields (see docs/data_fields.txt for the current and the old pre v23 layout).
+#
+# All loaders apply these types so pandas does not have to infer them and booleans and enums do not use eight bytes
+# per sample. Positions and the simulation time are kept as float64 as float32 is not precise enough for them, all
+# other values are float32. Fields which are not listed are read as DEFAULT_TYPE.
+
+DEFAULT_TYPE = 'float32'
+
+FIELD_TYPES = {
+    'ap_law.Nosewheel_c': 'float32',
+    'ap_law.Phi_loc_c': 'float32',
+    'ap_law.ap_on': 'bool',
+    'ap_law.autopilot.Beta_c_deg': 'float32',
+    'ap_law.autopilot.Phi_c_deg': 'float32',
+    'ap_law.autopilot.Theta_c_deg': 'float32',
+    'ap_law.flare_law.H_dot_c_fpm': 'float32',
+    'ap_law.flare_law.H_dot_radio_fpm': 'float32',
+    'ap_law.flare_law.condition_Flare': 'bool',
+    'ap_law.flare_law.delta_Theta_H_dot_deg': 'float32',
+    'ap_law.flare_law.delta_Theta_beta_c_deg': 'float32',
+    'ap_law.flare_law.delta_Theta_bx_deg': 'float32',
+    'ap_law.flare_law.delta_Theta_bz_deg': 'float32',
+    'ap_law.flight_director.Beta_c_deg': 'float32',
+    'ap_law.flight_director.Phi_c_deg': 'float32',
+    'ap_law.flight_director.Theta_c_deg': 'float32',
+    'ap_sm.data.H_dot_ft_min': 'float32',
+    'ap_sm.data.H_ft': 'float32',
+    'ap_sm.data.H_ind_ft': 'float32',
+    'ap_sm.data.H_radio_ft': 'float32',
+    'ap_sm.data.Phi_deg': 'float32',
+    'ap_sm.data.Psi_magnetic_deg': 'float32',
+    'ap_sm.data.Psi_magnetic_track_deg': 'float32',
+    'ap_sm.data.Psi_true_deg': 'float32',
+    'ap_sm.data.Theta_deg': 'float32',
+    'ap_sm.data.V2_kn': 'float32',
+    'ap_sm.data.VAPP_kn': 'float32',
+    'ap_sm.data.VLS_kn': 'float32',
+    'ap_sm.data.V_gnd_kn': 'float32',
+    'ap_sm.data.V_ias_kn': 'float32',
+    'ap_sm.data.V_mach': 'float32',
+    'ap_sm.data.V_tas_kn': 'float32',
+    'ap_sm.data.acceleration_altitude': 'float32',
+    'ap_sm.data.acceleration_altitude_engine_out': 'float32',
+    'ap_sm.data.acceleration_altitude_go_around': 'float32',
+    'ap_sm.data.aircraft_position.alt': 'float32',
+    'ap_sm.data.aircraft_position.lat': 'float64',
+    'ap_sm.data.aircraft_position.lon': 'float64',
+    'ap_sm.data.alpha_deg': 'float32',
+    'ap_sm.data.altitude_constraint_ft': 'float32',
+    'ap_sm.data.beta_deg': 'float32',
+    'ap_sm.data.bx_m_s2': 'float32',
+    'ap_sm.data.by_m_s2': 'float32',
+    'ap_sm.data.bz_m_s2': 'float32',
+    'ap_sm.data.cruise_altitude': 'float32',
+    'ap_sm.data.flaps_handle_index': 'int8',
+    'ap_sm.data.flight_guidance_phi_deg': 'float32',
+    'ap_sm.data.flight_guidance_phi_limit_deg': 'float32',
+    'ap_sm.data.flight_guidance_tae_deg': 'float32',
+    'ap_sm.data.flight_guidance_xtk_nmi': 'float32',
+    'ap_sm.data.flight_phase': 'int8',
+    'ap_sm.data.is_flight_plan_available': 'bool',
+    'ap_sm.data.nav_dme_nmi': 'float32',
+    'ap_sm.data.nav_dme_valid': 'bool',
+    'ap_sm.data.nav_e_gs_error_deg': 'float32',
+    'ap_sm.data.nav_e_gs_valid': 'bool',
+    'ap_sm.data.nav_e_loc_error_deg': 'float32',
+    'ap_sm.data.nav_e_loc_valid': 'bool',
+    'ap_sm.data.nav_gs_error_deg': 'float32',
+    'ap_sm.data.nav_gs_position.alt': 'float32',
+    'ap_sm.data.nav_gs_position.lat': 'float64',
+    'ap_sm.data.nav_gs_position.lon': 'float64',
+    'ap_sm.data.nav_gs_valid': 'bool',
+    'ap_sm.data.nav_loc_deg': 'float32',
+    'ap_sm.data.nav_loc_error_deg': 'float32',
+    'ap_sm.data.nav_loc_magvar_deg': 'float32',
+    'ap_sm.data.nav_loc_position.alt': 'float32',
+    'ap_sm.data.nav_loc_position.lat': 'float64',
+    'ap_sm.data.nav_loc_position.lon': 'float64',
+    'ap_sm.data.nav_loc_valid': 'bool',
+    'ap_sm.data.nav_valid': 'bool',
+    'ap_sm.data.on_ground': 'bool',
+    'ap_sm.data.pk_deg_s': 'float32',
+    'ap_sm.data.qk_deg_s': 'float32',
+    'ap_sm.data.rk_deg_s': 'float32',
+    'ap_sm.data.throttle_lever_1_pos': 'float32',
+    'ap_sm.data.throttle_lever_2_pos': 'float32',
+    'ap_sm.data.thrust_reduction_altitude': 'float32',
+    'ap_sm.data.thrust_reduction_altitude_go_around': 'float32',
+    'ap_sm.data.total_weight_kg': 'float32',
+    'ap_sm.data.zeta_deg': 'float32',
+    'ap_sm.data_computed.H_constraint_valid': 'bool',
+    'ap_sm.data_computed.H_fcu_in_selection': 'bool',
+    'ap_sm.data_computed.Psi_fcu_in_selection': 'bool',
+    'ap_sm.data_computed.V_fcu_in_selection': 'bool',
+    'ap_sm.data_computed.gs_convergent_towards_beam': 'bool',
+    'ap_sm.data_computed.time_since_SRS': 'float32',
+    'ap_sm.data_computed.time_since_lift_off': 'float32',
+    'ap_sm.data_computed.time_since_touchdown': 'float32',
+    'ap_sm.input.ALT_pull': 'bool',
+    'ap_sm.input.ALT_push': 'bool',
+    'ap_sm.input.APPR_push': 'bool',
+    'ap_sm.input.AP_1_push': 'bool',
+    'ap_sm.input.AP_2_push': 'bool',
+    'ap_sm.input.AP_DISCONNECT_push': 'bool',
+    'ap_sm.input.ATHR_engaged': 'bool',
+    'ap_sm.input.DIR_TO_trigger': 'bool',
+    'ap_sm.input.EXPED_push': 'bool',
+    'ap_sm.input.FDR_event': 'bool',
+    'ap_sm.input.FD_active': 'bool',
+    'ap_sm.input.FM_H_c_ft': 'float32',
+    'ap_sm.input.FM_H_dot_c_fpm': 'float32',
+    'ap_sm.input.FM_final_des_can_engage': 'bool',
+    'ap_sm.input.FM_requested_vertical_mode': 'int8',
+    'ap_sm.input.FM_rnav_appr_selected': 'bool',
+    'ap_sm.input.FPA_fcu_deg': 'float32',
+    'ap_sm.input.HDG_pull': 'bool',
+    'ap_sm.input.HDG_push': 'bool',
+    'ap_sm.input.H_constraint_ft': 'float32',
+    'ap_sm.input.H_dot_fcu_fpm': 'float32',
+    'ap_sm.input.H_fcu_ft': 'float32',
+    'ap_sm.input.LOC_push': 'bool',
+    'ap_sm.input.MACH_mode': 'bool',
+    'ap_sm.input.Psi_fcu_deg': 'float32',
+    'ap_sm.input.Slew_trigger': 'bool',
+    'ap_sm.input.TCAS_advisory_state': 'int8',
+    'ap_sm.input.TCAS_advisory_target_max_fpm': 'float32',
+    'ap_sm.input.TCAS_advisory_target_min_fpm': 'float32',
+    'ap_sm.input.TCAS_mode_available': 'bool',
+    'ap_sm.input.TRK_FPA_mode': 'bool',
+    'ap_sm.input.VS_pull': 'bool',
+    'ap_sm.input.VS_push': 'bool',
+    'ap_sm.input.V_c_kn': 'float32',
+    'ap_sm.input.is_FLX_active': 'bool',
+    'ap_sm.input.is_SPEED_managed': 'bool',
+    'ap_sm.lateral.armed.LOC': 'bool',
+    'ap_sm.lateral.armed.NAV': 'bool',
+    'ap_sm.lateral.condition.FLARE': 'bool',
+    'ap_sm.lateral.condition.GA_TRACK': 'bool',
+    'ap_sm.lateral.condition.LAND': 'bool',
+    'ap_sm.lateral.condition.LOC_CPT': 'bool',
+    'ap_sm.lateral.condition.LOC_TRACK': 'bool',
+    'ap_sm.lateral.condition.NAV': 'bool',
+    'ap_sm.lateral.condition.ROLL_OUT': 'bool',
+    'ap_sm.lateral.output.Psi_c_deg': 'float32',
+    'ap_sm.lateral.output.law': 'int8',
+    'ap_sm.lateral.output.mode': 'int8',
+    'ap_sm.lateral.output.mode_reversion': 'bool',
+    'ap_sm.lateral.output.mode_reversion_TRK_FPA': 'bool',
+    'ap_sm.lateral_previous.armed.LOC': 'bool',
+    'ap_sm.lateral_previous.armed.NAV': 'bool',
+    'ap_sm.lateral_previous.condition.FLARE': 'bool',
+    'ap_sm.lateral_previous.condition.GA_TRACK': 'bool',
+    'ap_sm.lateral_previous.condition.LAND': 'bool',
+    'ap_sm.lateral_previous.condition.LOC_CPT': 'bool',
+    'ap_sm.lateral_previous.condition.LOC_TRACK': 'bool',
+    'ap_sm.lateral_previous.condition.NAV': 'bool',
+    'ap_sm.lateral_previous.condition.ROLL_OUT': 'bool',
+    'ap_sm.lateral_previous.output.Psi_c_deg': 'float32',
+    'ap_sm.lateral_previous.output.law': 'int8',
+    'ap_sm.lateral_previous.output.mode': 'int8',
+    'ap_sm.lateral_previous.output.mode_reversion': 'bool',
+    'ap_sm.lateral_previous.output.mode_reversion_TRK_FPA': 'bool',
+    'ap_sm.output.ALT_soft_mode_active': 'bool',
+    'ap_sm.output.EXPED_mode_active': 'bool',
+    'ap_sm.output.FD_disconnect': 'bool',
+    'ap_sm.output.FPA_c_deg': 'float32',
+    'ap_sm.output.H_c_ft': 'float32',
+    'ap_sm.output.H_dot_c_fpm': 'float32',
+    'ap_sm.output.Psi_c_deg': 'float32',
+    'ap_sm.output.TCAS_message_RA_inhibit': 'bool',
+    'ap_sm.output.TCAS_message_TRK_FPA_deselection': 'bool',
+    'ap_sm.output.TCAS_message_disarm': 'bool',
+    'ap_sm.output.V_c_kn': 'float32',
+    'ap_sm.output.autothrust_mode': 'int8',
+    'ap_sm.output.enabled_AP1': 'bool',
+    'ap_sm.output.enabled_AP2': 'bool',
+    'ap_sm.output.lateral_law': 'int8',
+    'ap_sm.output.lateral_mode': 'int8',
+    'ap_sm.output.lateral_mode_armed': 'int8',
+    'ap_sm.output.mode_reversion_TRK_FPA': 'bool',
+    'ap_sm.output.mode_reversion_fma': 'bool',
+    'ap_sm.output.mode_reversion_lateral': 'bool',
+    'ap_sm.output.mode_reversion_triple_click': 'bool',
+    'ap_sm.output.mode_reversion_vertical': 'bool',
+    'ap_sm.output.mode_reversion_vertical_target_fpm': 'float32',
+    'ap_sm.output.speed_protection_mode': 'int8',
+    'ap_sm.output.vertical_law': 'int8',
+    'ap_sm.output.vertical_mode': 'int8',
+    'ap_sm.output.vertical_mode_armed': 'int8',
+    'ap_sm.time.dt': 'float32',
+    'ap_sm.time.simulation_time': 'float64',
+    'ap_sm.vertical.armed.ALT': 'bool',
+    'ap_sm.vertical.armed.ALT_CST': 'bool',
+    'ap_sm.vertical.armed.CLB': 'bool',
+    'ap_sm.vertical.armed.DES': 'bool',
+    'ap_sm.vertical.armed.FINAL_DES': 'bool',
+    'ap_sm.vertical.armed.GS': 'bool',
+    'ap_sm.vertical.armed.TCAS': 'bool',
+    'ap_sm.vertical.condition.ALT': 'bool',
+    'ap_sm.vertical.condition.ALT_CPT': 'bool',
+    'ap_sm.vertical.condition.ALT_CST': 'bool',
+    'ap_sm.vertical.condition.ALT_CST_CPT': 'bool',
+    'ap_sm.vertical.condition.CLB': 'bool',
+    'ap_sm.vertical.condition.DES': 'bool',
+    'ap_sm.vertical.condition.FINAL_DES': 'bool',
+    'ap_sm.vertical.condition.FLARE': 'bool',
+    'ap_sm.vertical.condition.GS_CPT': 'bool',
+    'ap_sm.vertical.condition.GS_TRACK': 'bool',
+    'ap_sm.vertical.condition.H_fcu_active': 'bool',
+    'ap_sm.vertical.condition.LAND': 'bool',
+    'ap_sm.vertical.condition.ROLL_OUT': 'bool',
+    'ap_sm.vertical.condition.SRS': 'bool',
+    'ap_sm.vertical.condition.SRS_GA': 'bool',
+    'ap_sm.vertical.condition.TCAS': 'bool',
+    'ap_sm.vertical.condition.THR_RED': 'bool',
+    'ap_sm.vertical.output.ALT_soft_mode_active': 'bool',
+    'ap_sm.vertical.output.EXPED_mode_active': 'bool',
+    'ap_sm.vertical.output.FD_disconnect': 'bool',
+    'ap_sm.vertical.output.FPA_c_deg': 'float32',
+    'ap_sm.vertical.output.H_c_ft': 'float32',
+    'ap_sm.vertical.output.H_dot_c_fpm': 'float32',
+    'ap_sm.vertical.output.TCAS_message_RA_inhibit': 'bool',
+    'ap_sm.vertical.output.TCAS_message_TRK_FPA_deselection': 'bool',
+    'ap_sm.vertical.output.TCAS_message_disarm': 'bool',
+    'ap_sm.vertical.output.TCAS_sub_mode': 'int8',
+    'ap_sm.vertical.output.TCAS_sub_mode_compatible': 'bool',
+    'ap_sm.vertical.output.V_c_kn': 'float32',
+    'ap_sm.vertical.output.law': 'int8',
+    'ap_sm.vertical.output.mode': 'int8',
+    'ap_sm.vertical.output.mode_autothrust': 'int8',
+    'ap_sm.vertical.output.mode_reversion': 'bool',
+    'ap_sm.vertical.output.mode_reversion_TRK_FPA': 'bool',
+    'ap_sm.vertical.output.mode_reversion_target_fpm': 'float32',
+    'ap_sm.vertical_previous.armed.ALT': 'bool',
+    'ap_sm.vertical_previous.armed.ALT_CST': 'bool',
+    'ap_sm.vertical_previous.armed.CLB': 'bool',
+    'ap_sm.vertical_previous.armed.DES': 'bool',
+    'ap_sm.vertical_previous.armed.FINAL_DES': 'bool',
+    'ap_sm.vertical_previous.armed.GS': 'bool',
+    'ap_sm.vertical_previous.armed.TCAS': 'bool',
+    'ap_sm.vertical_previous.condition.ALT': 'bool',
+    'ap_sm.vertical_previous.condition.ALT_CPT': 'bool',
+    'ap_sm.vertical_previous.condition.ALT_CST': 'bool',
+    'ap_sm.vertical_previous.condition.ALT_CST_CPT': 'bool',
+    'ap_sm.vertical_previous.condition.CLB': 'bool',
+    'ap_sm.vertical_previous.condition.DES': 'bool',
+    'ap_sm.vertical_previous.condition.FINAL_DES': 'bool',
+    'ap_sm.vertical_previous.condition.FLARE': 'bool',
+    'ap_sm.vertical_previous.condition.GS_CPT': 'bool',
+    'ap_sm.vertical_previous.condition.GS_TRACK': 'bool',
+    'ap_sm.vertical_previous.condition.H_fcu_active': 'bool',
+    'ap_sm.vertical_previous.condition.LAND': 'bool',
+    'ap_sm.vertical_previous.condition.ROLL_OUT': 'bool',
+    'ap_sm.vertical_previous.condition.SRS': 'bool',
+    'ap_sm.vertical_previous.condition.SRS_GA': 'bool',
+    'ap_sm.vertical_previous.condition.TCAS': 'bool',
+    'ap_sm.vertical_previous.condition.THR_RED': 'bool',
+    'ap_sm.vertical_previous.output.ALT_soft_mode_active': 'bool',
+    'ap_sm.vertical_previous.output.EXPED_mode_active': 'bool',
+    'ap_sm.vertical_previous.output.FD_disconnect': 'bool',
+    'ap_sm.vertical_previous.output.FPA_c_deg': 'float32',
+    'ap_sm.vertical_previous.output.H_c_ft': 'float32',
+    'ap_sm.vertical_previous.output.H_dot_c_fpm': 'float32',
+    'ap_sm.vertical_previous.output.TCAS_message_RA_inhibit': 'bool',
+    'ap_sm.vertical_previous.output.TCAS_message_TRK_FPA_deselection': 'bool',
+    'ap_sm.vertical_previous.output.TCAS_message_disarm': 'bool',
+    'ap_sm.vertical_previous.output.TCAS_sub_mode': 'int8',
+    'ap_sm.vertical_previous.output.TCAS_sub_mode_compatible': 'bool',
+    'ap_sm.vertical_previous.output.V_c_kn': 'float32',
+    'ap_sm.vertical_previous.output.law': 'int8',
+    'ap_sm.vertical_previous.output.mode': 'int8',
+    'ap_sm.vertical_previous.output.mode_autothrust': 'int8',
+    'ap_sm.vertical_previous.output.mode_reversion': 'bool',
+    'ap_sm.vertical_previous.output.mode_reversion_TRK_FPA': 'bool',
+    'ap_sm.vertical_previous.output.mode_reversion_target_fpm': 'float32',
+    'athr.data.H_dot_fpm': 'float32',
+    'athr.data.H_ft': 'float32',
+    'athr.data.H_ind_ft': 'float32',
+    'athr.data.H_radio_ft': 'float32',
+    'athr.data.ISA_degC': 'float32',
+    'athr.data.OAT_degC': 'float32',
+    'athr.data.Phi_deg': 'float32',
+    'athr.data.Psi_magnetic_deg': 'float32',
+    'athr.data.Psi_magnetic_track_deg': 'float32',
+    'athr.data.TAT_degC': 'float32',
+    'athr.data.Theta_deg': 'float32',
+    'athr.data.V_gnd_kn': 'float32',
+    'athr.data.V_ias_kn': 'float32',
+    'athr.data.V_mach': 'float32',
+    'athr.data.V_tas_kn': 'float32',
+    'athr.data.alpha_deg': 'float32',
+    'athr.data.ambient_density_kg_per_m3': 'float32',
+    'athr.data.ax_m_s2': 'float32',
+    'athr.data.ay_m_s2': 'float32',
+    'athr.data.az_m_s2': 'float32',
+    'athr.data.bx_m_s2': 'float32',
+    'athr.data.by_m_s2': 'float32',
+    'athr.data.bz_m_s2': 'float32',
+    'athr.data.commanded_engine_N1_1_percent': 'float32',
+    'athr.data.commanded_engine_N1_2_percent': 'float32',
+    'athr.data.engine_N1_1_percent': 'float32',
+    'athr.data.engine_N1_2_percent': 'float32',
+    'athr.data.flap_handle_index': 'int8',
+    'athr.data.is_engine_operative_1': 'bool',
+    'athr.data.is_engine_operative_2': 'bool',
+    'athr.data.nz_g': 'float32',
+    'athr.data.on_ground': 'bool',
+    'athr.data_computed.ATHR_disabled': 'bool',
+    'athr.data_computed.ATHR_push': 'bool',
+    'athr.data_computed.TLA_in_active_range': 'bool',
+    'athr.data_computed.alpha_floor_inhibited': 'bool',
+    'athr.data_computed.is_FLX_active': 'bool',
+    'athr.data_computed.time_since_touchdown': 'float32',
+    'athr.input.ATHR_disconnect': 'bool',
+    'athr.input.ATHR_push': 'bool',
+    'athr.input.ATHR_reset_disable': 'bool',
+    'athr.input.FD_active': 'bool',
+    'athr.input.TLA_1_deg': 'float32',
+    'athr.input.TLA_2_deg': 'float32',
+    'athr.input.V_LS_kn': 'float32',
+    'athr.input.V_MAX_kn': 'float32',
+    'athr.input.V_c_kn': 'float32',
+    'athr.input.alpha_floor_condition': 'bool',
+    'athr.input.flex_temperature_degC': 'float32',
+    'athr.input.is_SRS_GA_mode_active': 'bool',
+    'athr.input.is_SRS_TO_mode_active': 'bool',
+    'athr.input.is_TCAS_active': 'bool',
+    'athr.input.is_air_conditioning_1_active': 'bool',
+    'athr.input.is_air_conditioning_2_active': 'bool',
+    'athr.input.is_anti_ice_engine_1_active': 'bool',
+    'athr.input.is_anti_ice_engine_2_active': 'bool',
+    'athr.input.is_anti_ice_wing_active': 'bool',
+    'athr.input.is_approach_mode_active': 'bool',
+    'athr.input.is_mach_mode_active': 'bool',
+    'athr.input.mode_requested': 'int8',
+    'athr.input.target_TCAS_RA_rate_fpm': 'float32',
+    'athr.input.thrust_limit_CLB_percent': 'float32',
+    'athr.input.thrust_limit_FLEX_percent': 'float32',
+    'athr.input.thrust_limit_IDLE_percent': 'float32',
+    'athr.input.thrust_limit_MCT_percent': 'float32',
+    'athr.input.thrust_limit_REV_percent': 'float32',
+    'athr.input.thrust_limit_TOGA_percent': 'float32',
+    'athr.input.thrust_reduction_altitude': 'float32',
+    'athr.input.thrust_reduction_altitude_go_around': 'float32',
+    'athr.output.N1_TLA_1_percent': 'float32',
+    'athr.output.N1_TLA_2_percent': 'float32',
+    'athr.output.N1_c_1_percent': 'float32',
+    'athr.output.N1_c_2_percent': 'float32',
+    'athr.output.is_in_reverse_1': 'bool',
+    'athr.output.is_in_reverse_2': 'bool',
+    'athr.output.mode': 'int8',
+    'athr.output.mode_message': 'int8',
+    'athr.output.sim_throttle_lever_1_pos': 'float32',
+    'athr.output.sim_throttle_lever_2_pos': 'float32',
+    'athr.output.sim_thrust_mode_1': 'int8',
+    'athr.output.sim_thrust_mode_2': 'int8',
+    'athr.output.status': 'int8',
+    'athr.output.thrust_lever_warning_flex': 'bool',
+    'athr.output.thrust_lever_warning_toga': 'bool',
+    'athr.output.thrust_limit_percent': 'float32',
+    'athr.output.thrust_limit_type': 'int8',
+    'data.IsisLsActive': 'bool',
+    'data.aiAutoTrimActive': 'bool',
+    'data.aiControlsActive': 'bool',
+    'data.assistanceLandingEnabled': 'bool',
+    'data.assistanceTakeoffEnabled': 'bool',
+    'data.autobrake_armed_mode': 'int8',
+    'data.autobrake_decel_light': 'bool',
+    'data.brake_left_sim_pos': 'float32',
+    'data.brake_pedal_left_pos': 'float32',
+    'data.brake_pedal_right_pos': 'float32',
+    'data.brake_right_sim_pos': 'float32',
+    'data.corrected_engine_N1_1_percent': 'float32',
+    'data.corrected_engine_N1_2_percent': 'float32',
+    'data.flaps_handle_configuration_index': 'int8',
+    'data.flaps_handle_index': 'int8',
+    'data.flaps_handle_percent': 'float32',
+    'data.flaps_handle_sim_index': 'int8',
+    'data.gear_handle_pos': 'float32',
+    'data.ground_spoilers_active': 'bool',
+    'data.hydraulic_blue_pressure': 'float32',
+    'data.hydraulic_green_pressure': 'float32',
+    'data.hydraulic_yellow_pressure': 'float32',
+    'data.ls1Active': 'bool',
+    'data.ls2Active': 'bool',
+    'data.master_caution_active': 'bool',
+    'data.master_warning_active': 'bool',
+    'data.noseWheelPosition': 'float32',
+    'data.park_brake_lever_pos': 'float32',
+    'data.realisticTillerEnabled': 'bool',
+    'data.spoilers_armed': 'bool',
+    'data.spoilers_handle_pos': 'float32',
+    'data.spoilers_handle_sim_pos': 'float32',
+    'data.syncFoEfisEnabled': 'bool',
+    'data.throttle_lever_1_pos': 'float32',
+    'data.throttle_lever_2_pos': 'float32',
+    'data.tillerHandlePosition': 'float32',
+    'engine.engineEngine1EGT': 'float32',
+    'engine.engineEngine1FF': 'float32',
+    'engine.engineEngine1N1': 'float32',
+    'engine.engineEngine1N2': 'float32',
+    'engine.engineEngine1Oil': 'float32',
+    'engine.engineEngine1PreFF': 'float32',
+    'engine.engineEngine1State': 'int8',
+    'engine.engineEngine1Timer': 'float32',
+    'engine.engineEngine1TotalOil': 'float32',
+    'engine.engineEngine2EGT': 'float32',
+    'engine.engineEngine2FF': 'float32',
+    'engine.engineEngine2N1': 'float32',
+    'engine.engineEngine2N2': 'float32',
+    'engine.engineEngine2Oil': 'float32',
+    'engine.engineEngine2PreFF': 'float32',
+    'engine.engineEngine2State': 'int8',
+    'engine.engineEngine2Timer': 'float32',
+    'engine.engineEngine2TotalOil': 'float32',
+    'engine.engineEngineCycleTime': 'float32',
+    'engine.engineEngineIdleEGT': 'float32',
+    'engine.engineEngineIdleFF': 'float32',
+    'engine.engineEngineIdleN1': 'float32',
+    'engine.engineEngineIdleN2': 'float32',
+    'engine.engineEngineImbalance': 'float32',
+    'engine.engineFuelAuxLeftPre': 'float32',
+    'engine.engineFuelAuxRightPre': 'float32',
+    'engine.engineFuelCenterPre': 'float32',
+    'engine.engineFuelLeftPre': 'float32',
+    'engine.engineFuelRightPre': 'float32',
+    'engine.engineFuelUsedLeft': 'float32',
+    'engine.engineFuelUsedRight': 'float32',
+    'engine.fuelTankCapacityAuxLeft': 'float32',
+    'engine.fuelTankCapacityAuxRight': 'float32',
+    'engine.fuelTankCapacityCenter': 'float32',
+    'engine.fuelTankCapacityMainLeft': 'float32',
+    'engine.fuelTankCapacityMainRight': 'float32',
+    'engine.fuelTankQuantityAuxLeft': 'float32',
+    'engine.fuelTankQuantityAuxRight': 'float32',
+    'engine.fuelTankQuantityCenter': 'float32',
+    'engine.fuelTankQuantityMainLeft': 'float32',
+    'engine.fuelTankQuantityMainRight': 'float32',
+    'engine.fuelTankQuantityTotal': 'float32',
+    'engine.fuelWeightPerGallon': 'float32',
+    'engine.generalEngineElapsedTime_1': 'float32',
+    'engine.generalEngineElapsedTime_2': 'float32',
+    'engine.simOnGround': 'bool',
+    'engine.standardAtmTemperature': 'float32',
+    'engine.turbineEngineCorrectedFuelFlow_1': 'float32',
+    'engine.turbineEngineCorrectedFuelFlow_2': 'float32',
+    'fbw.output.eta_pos': 'float32',
+    'fbw.output.eta_trim_deg': 'float32',
+    'fbw.output.eta_trim_deg_should_write': 'bool',
+    'fbw.output.xi_pos': 'float32',
+    'fbw.output.zeta_pos': 'float32',
+    'fbw.output.zeta_trim_pos': 'float32',
+    'fbw.output.zeta_trim_pos_should_write': 'bool',
+    'fbw.pitch.data_computed.delta_eta_deg': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_limit_lo': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_limit_up': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_rate_limit_lo_deg_s': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_rate_limit_up_deg_s': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_reset': 'bool',
+    'fbw.pitch.data_computed.eta_trim_deg_reset_deg': 'float32',
+    'fbw.pitch.data_computed.eta_trim_deg_should_freeze': 'bool',
+    'fbw.pitch.data_computed.eta_trim_deg_should_write': 'bool',
+    'fbw.pitch.data_computed.flare_Theta_c_deg': 'float32',
+    'fbw.pitch.data_computed.flare_Theta_c_rate_deg_s': 'float32',
+    'fbw.pitch.data_computed.flare_Theta_deg': 'float32',
+    'fbw.pitch.data_computed.in_flare': 'bool',
+    'fbw.pitch.data_computed.in_flight': 'bool',
+    'fbw.pitch.data_computed.in_flight_gain': 'float32',
+    'fbw.pitch.data_computed.in_rotation': 'bool',
+    'fbw.pitch.data_computed.in_rotation_gain': 'float32',
+    'fbw.pitch.data_computed.nz_limit_lo_g': 'float32',
+    'fbw.pitch.data_computed.nz_limit_up_g': 'float32',
+    'fbw.pitch.integrated.eta_deg': 'float32',
+    'fbw.pitch.law_normal.Cstar_g': 'float32',
+    'fbw.pitch.law_normal.eta_dot_deg_s': 'float32',
+    'fbw.pitch.law_normal.nz_c_g': 'float32',
+    'fbw.pitch.law_normal.protection_V_c_kn': 'float32',
+    'fbw.pitch.law_normal.protection_alpha_c_deg': 'float32',
+    'fbw.pitch.law_rotation.eta_deg': 'float32',
+    'fbw.pitch.law_rotation.qk_c_deg_s': 'float32',
+    'fbw.pitch.output.eta_deg': 'float32',
+    'fbw.pitch.output.eta_trim_deg': 'float32',
+    'fbw.pitch.vote.eta_dot_deg_s': 'float32',
+    'fbw.roll.data_computed.beta_target_deg': 'float32',
+    'fbw.roll.data_computed.delta_xi_deg': 'float32',
+    'fbw.roll.data_computed.delta_zeta_deg': 'float32',
+    'fbw.roll.data_computed.in_flight': 'bool',
+    'fbw.roll.data_computed.in_flight_gain': 'float32',
+    'fbw.roll.data_computed.zeta_trim_deg_should_write': 'bool',
+    'fbw.roll.law_normal.Phi_c_deg': 'float32',
+    'fbw.roll.law_normal.pk_c_deg_s': 'float32',
+    'fbw.roll.law_normal.xi_deg': 'float32',
+    'fbw.roll.law_normal.zeta_deg': 'float32',
+    'fbw.roll.law_normal.zeta_tc_yd_deg': 'float32',
+    'fbw.roll.output.xi_deg': 'float32',
+    'fbw.roll.output.zeta_deg': 'float32',
+    'fbw.roll.output.zeta_trim_deg': 'float32',
+    'fbw.sim.data.CG_percent_MAC': 'float32',
+    'fbw.sim.data.H_ft': 'float32',
+    'fbw.sim.data.H_ind_ft': 'float32',
+    'fbw.sim.data.H_radio_ft': 'float32',
+    'fbw.sim.data.Phi_deg': 'float32',
+    'fbw.sim.data.Theta_deg': 'float32',
+    'fbw.sim.data.V_ias_kn': 'float32',
+    'fbw.sim.data.V_mach': 'float32',
+    'fbw.sim.data.V_tas_kn': 'float32',
+    'fbw.sim.data.alpha_deg': 'float32',
+    'fbw.sim.data.alpha_stall_deg': 'float32',
+    'fbw.sim.data.alpha_zero_lift_deg': 'float32',
+    'fbw.sim.data.ambient_density_kg_per_m3': 'float32',
+    'fbw.sim.data.ambient_pressure_mbar': 'float32',
+    'fbw.sim.data.ambient_temperature_celsius': 'float32',
+    'fbw.sim.data.ambient_wind_direction_deg': 'float32',
+    'fbw.sim.data.ambient_wind_velocity_kn': 'float32',
+    'fbw.sim.data.ambient_wind_x_kn': 'float32',
+    'fbw.sim.data.ambient_wind_y_kn': 'float32',
+    'fbw.sim.data.ambient_wind_z_kn': 'float32',
+    'fbw.sim.data.autopilot_custom_Beta_c_deg': 'float32',
+    'fbw.sim.data.autopilot_custom_Phi_c_deg': 'float32',
+    'fbw.sim.data.autopilot_custom_Theta_c_deg': 'float32',
+    'fbw.sim.data.autopilot_custom_on': 'bool',
+    'fbw.sim.data.autopilot_master_on': 'bool',
+    'fbw.sim.data.beta_deg': 'float32',
+    'fbw.sim.data.beta_dot_deg_s': 'float32',
+    'fbw.sim.data.engine_1_thrust_lbf': 'float32',
+    'fbw.sim.data.engine_2_thrust_lbf': 'float32',
+    'fbw.sim.data.eta_deg': 'float32',
+    'fbw.sim.data.eta_trim_deg': 'float32',
+    'fbw.sim.data.flaps_handle_index': 'int8',
+    'fbw.sim.data.gear_strut_compression_0': 'float32',
+    'fbw.sim.data.gear_strut_compression_1': 'float32',
+    'fbw.sim.data.gear_strut_compression_2': 'float32',
+    'fbw.sim.data.ice_structure_percent': 'float32',
+    'fbw.sim.data.latitude_deg': 'float64',
+    'fbw.sim.data.linear_cl_alpha_per_deg': 'float32',
+    'fbw.sim.data.longitude_deg': 'float64',
+    'fbw.sim.data.nz_g': 'float32',
+    'fbw.sim.data.p_deg_s': 'float32',
+    'fbw.sim.data.pause_on': 'bool',
+    'fbw.sim.data.pk_deg_s': 'float32',
+    'fbw.sim.data.pk_dot_deg_s2': 'float32',
+    'fbw.sim.data.psi_magnetic_deg': 'float32',
+    'fbw.sim.data.psi_true_deg': 'float32',
+    'fbw.sim.data.q_deg_s': 'float32',
+    'fbw.sim.data.qk_deg_s': 'float32',
+    'fbw.sim.data.qk_dot_deg_s2': 'float32',
+    'fbw.sim.data.r_deg_s': 'float32',
+    'fbw.sim.data.rk_deg_s': 'float32',
+    'fbw.sim.data.rk_dot_deg_s2': 'float32',
+    'fbw.sim.data.simulation_rate': 'float32',
+    'fbw.sim.data.slew_on': 'bool',
+    'fbw.sim.data.spoilers_left_pos': 'float32',
+    'fbw.sim.data.spoilers_right_pos': 'float32',
+    'fbw.sim.data.thrust_lever_1_pos': 'float32',
+    'fbw.sim.data.thrust_lever_2_pos': 'float32',
+    'fbw.sim.data.total_air_temperature_celsius': 'float32',
+    'fbw.sim.data.total_weight_kg': 'float32',
+    'fbw.sim.data.tracking_mode_on_override': 'bool',
+    'fbw.sim.data.xi_deg': 'float32',
+    'fbw.sim.data.zeta_deg': 'float32',
+    'fbw.sim.data.zeta_trim_deg': 'float32',
+    'fbw.sim.data_computed.alpha_floor_command': 'bool',
+    'fbw.sim.data_computed.high_aoa_prot_active': 'bool',
+    'fbw.sim.data_computed.high_speed_prot_active': 'bool',
+    'fbw.sim.data_computed.high_speed_prot_high_kn': 'float32',
+    'fbw.sim.data_computed.high_speed_prot_low_kn': 'float32',
+    'fbw.sim.data_computed.on_ground': 'bool',
+    'fbw.sim.data_computed.protection_ap_disc': 'bool',
+    'fbw.sim.data_computed.tracking_mode_on': 'bool',
+    'fbw.sim.data_speeds_aoa.alpha_filtered_deg': 'float32',
+    'fbw.sim.data_speeds_aoa.alpha_floor_deg': 'float32',
+    'fbw.sim.data_speeds_aoa.alpha_max_deg': 'float32',
+    'fbw.sim.data_speeds_aoa.alpha_prot_deg': 'float32',
+    'fbw.sim.data_speeds_aoa.v_alpha_max_kn': 'float32',
+    'fbw.sim.data_speeds_aoa.v_alpha_prot_kn': 'float32',
+    'fbw.sim.input.delta_eta_pos': 'float32',
+    'fbw.sim.input.delta_xi_pos': 'float32',
+    'fbw.sim.input.delta_zeta_pos': 'float32',
+    'fbw.sim.time.dt': 'float32',
+    'fbw.sim.time.monotonic_time': 'float64',
+    'fbw.sim.time.simulation_time': 'float64',
+    'data.inputElevator': 'float32',
+    'data.inputAileron': 'float32',
+    'data.inputRudder': 'float32',
+    'data.ambient_wind_velocity_kn': 'float32',
+    'data.ambient_pressure_mbar': 'float32',
+    'data.total_air_temperature_celsius': 'float32',
+    'data.ice_structure_percent': 'float32',
+    'data.high_aoa_protection': 'bool',
+    'data.alpha_floor_condition': 'bool',
+    'data.failuresActive': 'bool',
+    'data.wasPaused': 'bool',
+    'data.slew_on': 'bool',
+    'data.simulation_rate': 'float32',
+}
+
+
+# Returns the compact type of a field.
+def field_type(field):
+    return FIELD_TYPES.get(field, DEFAULT_TYPE)
+
+
+# Returns a column to type mapping for the given columns as accepted by read_csv(dtype=...) and DataFrame.astype().
+def dtypes(columns):
+    return {column: field_type(column) for column in columns}
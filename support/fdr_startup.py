@@ -0,0 +1,86 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Measures the start-up of fdr_analyser_ui.py with python -X importtime and checks it against a budget:
+#
+#   python fdr_startup.py                  # --help and -c version, which load no data
+#   python fdr_startup.py -c events -csv FILE
+#
+# Prints the wall time, the total import time and the slowest imports. Exits with 1 if the import time exceeds the
+# budget, if a module only needed by the charts and the window is imported by --help or -c version, or if pandas is,
+# so a new top level import is noticed.
+
+UI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fdr_analyser_ui.py')
+
+# Seconds the imports of a headless command may take (pandas and numpy take most of it)
+STARTUP_BUDGET = 0.6
+
+# Commands measured by default. They load no data, so they import neither the chart nor the data modules.
+DEFAULT_COMMANDS = [['--help'], ['-c', 'version']]
+
+# Modules only needed to draw a chart or open the window
+CHART_MODULES = ['matplotlib', 'mplcursors', 'gmplot', 'PySimpleGUI']
+
+# Modules only needed to load data
+DATA_MODULES = ['pandas', 'pyarrow']
+
+
+# Parses the -X importtime report (stderr) into a list of (module, self seconds, cumulative seconds, depth).
+def parse_importtime(report):
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6, depth))
+    return imports
+
+
+# Runs the UI script with the given arguments and returns the wall time and the parsed import report.
+def measure(arguments):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', UI_SCRIPT] + arguments,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - started, parse_importtime(result.stderr)
+
+
+# Measures one command and prints the report. Returns True if the command failed the budget, or if it imported a
+# chart, window or data module and strict is set (the default commands, which load no data).
+def check(arguments, budget, count, strict):
+    wall, imports = measure(arguments)
+    total = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+    print("Command:     fdr_analyser_ui.py " + ' '.join(arguments))
+    print("Wall time:   {:.3f} s".format(wall))
+    print("Import time: {:.3f} s (budget {:.3f} s)".format(total, budget))
+    slowest = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2])
+    for name, _, cumulative, _ in slowest[:count]:
+        print("  {:30s} {:.3f} s".format(name, cumulative))
+
+    failed = total > budget
+    for title, modules in (("Chart and window", CHART_MODULES), ("Data", DATA_MODULES)):
+        imported = [name for name in modules if any(entry[0] == name for entry in imports)]
+        if imported:
+            print("{} modules imported: {}".format(title, ', '.join(imported)))
+            failed = failed or strict
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Start-up time of fdr_analyser_ui.py', allow_abbrev=False)
+    parser.add_argument('-budget', type=float, default=STARTUP_BUDGET,
+                        help='Import time budget in seconds (default: {})'.format(STARTUP_BUDGET))
+    parser.add_argument('-slowest', type=int, default=10, help='Number of slowest imports shown (default: 10)')
+    args, arguments = parser.parse_known_args()
+
+    failed = False
+    for command in [arguments] if arguments else DEFAULT_COMMANDS:
+        failed = check(command, args.budget, args.slowest, not arguments) or failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
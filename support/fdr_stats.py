@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import fdr_data
+import fdr_events
+import fdr_profile
+
+# Fields used by the frame rate analysis (canonical names, older format versions are read through their aliases)
+FRAME_FIELDS = {
+    'time': fdr_data.TIME_COLUMN,
+    'dt': 'ap_sm.time.dt',
+    'rate': 'data.simulation_rate',
+}
+
+# Frame rates below these are shown orange and red in the time chart
+LOW_RATE = 15
+STALL_RATE = 10
+
+# Seconds around a simulation rate change in which a stall counts as caused by the change
+RATE_CHANGE_WINDOW = 1.0
+
+
+# Returns the columns of a header to use for the frame rate analysis as a dict like FRAME_FIELDS or None if the
+# header does not have them.
+def frame_columns(header):
+    if not all(name in header for name in FRAME_FIELDS.values()):
+        return None
+    return dict(FRAME_FIELDS)
+
+
+# Computes the frame rate health of a flight: percentiles of the frame time (simulation time step divided by the
+# simulation rate, so the real time of a frame), the share of the real time spent below LOW_RATE and STALL_RATE frames
+# per second, the longest frame and the longest stretch below STALL_RATE, and how the stalls relate to changes of the
+# simulation rate. Returns a dict of the numbers. Durations are real seconds, the time of an event is the
+# simulation time.
+@fdr_profile.traced('derive')
+def frame_health(fdr, columns=None):
+    if columns is None:
+        columns = frame_columns(fdr.columns)
+    time = fdr[columns['time']].to_numpy(dtype=np.float64)
+    dt = fdr[columns['dt']].to_numpy(dtype=np.float64)
+    rate = fdr[columns['rate']].to_numpy(dtype=np.float64)
+    valid = (dt > 0) & (rate > 0)
+    time, rate = time[valid], rate[valid]
+    dt = dt[valid] / rate
+    if not len(dt):
+        return {'samples': 0}
+    total = dt.sum()
+    p50, p95, p99 = np.percentile(dt, [50, 95, 99])
+    stalls = dt > 1 / STALL_RATE
+
+    # longest stretch of consecutive stalled frames
+    edges = np.diff(np.concatenate(([0], stalls.astype(np.int8), [0])))
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    elapsed = np.concatenate(([0], np.cumsum(dt)))
+    durations = elapsed[stops] - elapsed[starts]
+    longest_stretch = int(np.argmax(durations)) if len(durations) else None
+
+    # frames within RATE_CHANGE_WINDOW of a simulation rate change
+    changes = time[np.flatnonzero(np.diff(rate)) + 1]
+    if len(changes):
+        nearest = np.searchsorted(changes, time)
+        before = np.abs(time - changes[np.clip(nearest - 1, 0, len(changes) - 1)])
+        after = np.abs(changes[np.clip(nearest, 0, len(changes) - 1)] - time)
+        near_change = np.minimum(before, after) <= RATE_CHANGE_WINDOW
+    else:
+        near_change = np.zeros(len(time), dtype=bool)
+    stalls_near_change = near_change[stalls].mean() if stalls.any() else 0.0
+    frames_near_change = near_change.mean()
+
+    return {
+        'samples': int(len(dt)),
+        'duration': float(total),
+        'frame_time_p50': float(p50),
+        'frame_time_p95': float(p95),
+        'frame_time_p99': float(p99),
+        'share_below_{}hz'.format(LOW_RATE): float(dt[dt > 1 / LOW_RATE].sum() / total),
+        'share_below_{}hz'.format(STALL_RATE): float(dt[stalls].sum() / total),
+        'longest_frame': float(dt.max()),
+        'longest_frame_time': float(time[np.argmax(dt)]),
+        'longest_stall': float(durations[longest_stretch]) if longest_stretch is not None else 0.0,
+        'longest_stall_time': float(time[starts[longest_stretch]]) if longest_stretch is not None else None,
+        'stalls': int(len(starts)),
+        'rate_changes': int(len(changes)),
+        'stalls_near_rate_change': float(stalls_near_change),
+        # how much more likely a stalled frame is near a rate change than any frame (1 = unrelated)
+        'rate_change_stall_lift': float(stalls_near_change / frames_near_change) if frames_near_change else None,
+        'frame_time_rate_correlation': float(np.corrcoef(dt, rate)[0, 1]) if dt.std() and rate.std() else None,
+    }
+
+
+# Computes the frame rate health of a file or of all converted files of a directory. Returns a table with one row
+# per file, with flight one row per flight named after its first file. With a phase only the frames within that
+# flight phase are rated, files without the phase are skipped.
+def scan_health(path, flight=False, phase=None):
+    rows = []
+    for files in fdr_data.scanned_files(path, flight):
+        datafile = files[0]
+        columns = frame_columns(fdr_data.read_header(datafile))
+        if columns is None:
+            continue
+        times = fdr_events.scanned_range(files, phase)
+        if times is None:
+            continue
+        fdr = fdr_data.load_segments(files, list(columns.values()), *times)
+        rows.append(dict(file=os.path.basename(datafile), **frame_health(fdr, columns)))
+    return pd.DataFrame(rows)
@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import fdr_schema
+
+# A store is a directory next to the converted file (2021-11-15-12-57-13.fdrcols) with one file per field holding
+# the raw values of the field as one contiguous typed array, and an index file listing the fields:
+#
+#   {"rows": 1234567, "columns": [{"name": "ap_sm.time.simulation_time", "dtype": "float64", "file": "0.bin"}, ...]}
+#
+# The arrays are memory mapped when reading, so only the pages of the fields and rows used are read from disk and a
+# store can be larger than the memory.
+STORE_EXTENSION = '.fdrcols'
+INDEX_FILE = 'columns.json'
+
+# Rows parsed per chunk when writing a store from a CSV file
+CHUNK_ROWS = 262144
+
+
+def store_path(path):
+    return os.path.splitext(path)[0] + STORE_EXTENSION
+
+
+def is_store(path):
+    return path.lower().rstrip('/\\').endswith(STORE_EXTENSION)
+
+
+# Returns the store of a converted file if it exists and is at least as new as the file.
+def fresh_store(path):
+    storepath = store_path(path)
+    indexfile = os.path.join(storepath, INDEX_FILE)
+    if os.path.isfile(indexfile) and os.path.getmtime(indexfile) >= os.path.getmtime(path):
+        return storepath
+    return None
+
+
+def read_index(storepath):
+    with open(os.path.join(storepath, INDEX_FILE)) as file:
+        return json.load(file)
+
+
+def read_store_header(storepath):
+    return [column['name'] for column in read_index(storepath)['columns']]
+
+
+# Writes frames (e.g. the chunks of a CSV file) into a new store. The types of the first frame are used for all
+# frames. The store is written to a temporary directory first so a cancelled write never leaves a broken store.
+def write_store(storepath, frames):
+    tmppath = storepath + '.tmp'
+    if os.path.isdir(tmppath):
+        shutil.rmtree(tmppath)
+    os.makedirs(tmppath)
+    columns = None
+    files = []
+    rows = 0
+    try:
+        for frame in frames:
+            if columns is None:
+                columns = [{'name': name, 'dtype': str(frame[name].dtype), 'file': '{}.bin'.format(number)}
+                           for number, name in enumerate(frame.columns)]
+                files = [open(os.path.join(tmppath, column['file']), 'wb') for column in columns]
+            for column, file in zip(columns, files):
+                file.write(np.ascontiguousarray(frame[column['name']].to_numpy(dtype=column['dtype'])).tobytes())
+            rows += len(frame)
+    except BaseException:
+        for file in files:
+            file.close()
+        shutil.rmtree(tmppath)
+        raise
+    for file in files:
+        file.close()
+    with open(os.path.join(tmppath, INDEX_FILE), 'w') as file:
+        json.dump({'rows': rows, 'columns': columns or []}, file)
+    if os.path.isdir(storepath):
+        shutil.rmtree(storepath)
+    os.replace(tmppath, storepath)
+    return storepath
+
+
+# Streams a CSV file chunk by chunk into a store next to it with the compact types of the field schema. Returns the
+# store path.
+def write_csv_store(csvfile):
+    columns = list(pd.read_csv(csvfile, nrows=0).columns)
+    try:
+        return write_store(store_path(csvfile), pd.read_csv(csvfile, dtype=fdr_schema.dtypes(columns),
+                                                            chunksize=CHUNK_ROWS))
+    except (ValueError, TypeError):
+        # values not matching the schema - keep full precision
+        return write_store(store_path(csvfile), pd.read_csv(csvfile, dtype='float64', chunksize=CHUNK_ROWS))
+
+
+# Returns the given columns (all if None) of a store as read-only memory mapped arrays.
+def open_store(storepath, columns=None):
+    index = read_index(storepath)
+    arrays = {}
+    for column in index['columns']:
+        if columns is not None and column['name'] not in columns:
+            continue
+        if index['rows']:
+            arrays[column['name']] = np.memmap(os.path.join(storepath, column['file']), dtype=column['dtype'],
+                                               mode='r', shape=(index['rows'],))
+        else:
+            arrays[column['name']] = np.empty(0, dtype=column['dtype'])
+    return arrays
+
+
+# Returns the rows [start, stop) of the given columns of a store as a frame backed by the memory mapped arrays
+# (no copy).
+def read_store(storepath, columns=None, start=None, stop=None):
+    arrays = open_store(storepath, columns)
+    if columns is not None:
+        arrays = {column: arrays[column] for column in columns if column in arrays}
+    return pd.DataFrame({name: array[start:stop] for name, array in arrays.items()}, copy=False)
+
+
+# Returns the row range [start, stop) of the samples with start_time <= time <= end_time. Only the pages of the time
+# column needed by the binary search are read.
+def time_range(storepath, time_column, start_time=None, end_time=None):
+    time = open_store(storepath, [time_column])[time_column]
+    start = 0 if start_time is None else int(np.searchsorted(time, start_time, side='left'))
+    stop = len(time) if end_time is None else int(np.searchsorted(time, end_time, side='right'))
+    return start, stop
+
+
+# Returns True if the values of a column are memory mapped from a store rather than held in memory.
+def is_mapped(series):
+    array = series.to_numpy()
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
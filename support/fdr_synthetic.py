@@ -0,0 +1,617 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import fdr_data
+import fdr_events
+import fdr_schema
+import fdr_store
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Writes synthetic FDR files for benchmarks (see fdr_benchmark.py) and for trying the charts without a recording:
+#
+#   python fdr_synthetic.py -d DIR -duration 5h -rate 30 -count 3 -cache -store
+#
+# A file holds one complete flight with the v23 fields of docs/data_fields.txt: taxi out, takeoff, climb, cruise (with
+# a step climb on long flights), descent, ILS approach with autoland or a manual landing, landing roll and taxi in.
+# The modes follow the sequences of the real aircraft (e.g. SRS -> CLB -> ALT_CPT -> ALT -> DES -> ... -> LAND ->
+# FLARE -> ROLLOUT), the continuous fields follow the flight profile with some noise and the frame times jitter like
+# a sim running at the given frame rate. The same seed always writes the same file.
+
+FIELDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docs', 'data_fields.txt')
+
+# Fields of the versions after v23 used by the charts (see fdr_alias for their names in older versions). They are
+# written unless only the v23 fields are requested.
+LATER_FIELDS = [
+    'data.inputElevator', 'data.inputAileron', 'data.inputRudder', 'data.ambient_wind_velocity_kn',
+    'data.ambient_pressure_mbar', 'data.total_air_temperature_celsius', 'data.ice_structure_percent',
+    'data.high_aoa_protection', 'data.alpha_floor_condition', 'data.failuresActive', 'data.wasPaused',
+    'data.slew_on', 'data.simulation_rate',
+]
+
+# Named durations accepted by -duration (any number of seconds or a number with h or min works as well)
+DURATIONS = {'1h': 3600, '5h': 5 * 3600, '12h': 12 * 3600}
+
+# Frames per second of the sim
+DEFAULT_RATE = 20
+
+# Recording start of the first file, the following files start a day later each
+START_TIME = datetime(2024, 1, 1, 8, 0, 0)
+
+# Rows written per chunk (one row group of the Parquet file)
+CHUNK_ROWS = fdr_data.ROW_GROUP_ROWS
+
+# Shortest flight with all phases
+MIN_DURATION = 1800
+
+# Flight profile: taxi times (shorter for flights under two hours), climb and descent rates, glide slope and speeds
+TAXI_OUT = 480
+TAXI_IN = 300
+TAKEOFF_ROLL = 35
+LANDING_ROLL = 30
+CLIMB_RATE = 2000
+DESCENT_RATE = 2200
+STEP_CLIMB = 2000
+GLIDE_SLOPE_RATE = 750
+APPROACH_HEIGHT = 3000
+APPROACH_LEVEL = 90
+MAX_CRUISE_ALTITUDE = 37000
+V2 = 145
+VAPP = 138
+VLS = 133
+
+
+# Reads the v23 fields from docs/data_fields.txt.
+def v23_fields(path=FIELDS_FILE):
+    fields = []
+    section = None
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line == 'v23':
+                section = line
+            elif line.startswith('# OLD'):
+                section = None
+            elif section and line and not line.startswith('#'):
+                fields.append(line)
+    return fields
+
+
+# Returns the fields of a synthetic file: the v23 fields and, unless v23_only, the later fields the charts use.
+def synthetic_fields(v23_only=False):
+    fields = v23_fields()
+    if not v23_only:
+        fields += [field for field in LATER_FIELDS if field not in fields]
+    return fields
+
+
+# Parses a duration like 1h, 90min, 5400 or one of DURATIONS into seconds.
+def parse_duration(text):
+    text = text.strip().lower()
+    if text in DURATIONS:
+        return DURATIONS[text]
+    for suffix, factor in (('min', 60), ('h', 3600), ('s', 1)):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * factor
+    return float(text)
+
+
+# Returns the values of a discrete field which changes to values[k] at times[k] (times in ascending order, the first
+# value holds from the start).
+def steps(time, times, values):
+    return np.asarray(values)[np.maximum(np.searchsorted(times, time, side='right') - 1, 0)]
+
+
+# Returns the values of a mode field from its sequence of (start time, enum member).
+def modes(time, sequence):
+    return steps(time, [start for start, _ in sequence], [mode.value for _, mode in sequence]).astype(np.int8)
+
+
+# Returns True for the samples within width seconds after each of the times (a button pushed for a moment).
+def pulses(time, times, width=0.3):
+    pushed = np.zeros(len(time), dtype=bool)
+    for start in times:
+        pushed[np.searchsorted(time, start):np.searchsorted(time, start + width)] = True
+    return pushed
+
+
+# Moving average over the given number of samples (engines spooling up, smooth noise).
+def smooth(values, samples):
+    samples = max(int(samples), 1)
+    if samples == 1:
+        return values
+    padded = np.concatenate((np.full(samples, values[0]), values))
+    total = np.cumsum(padded, dtype=np.float64)
+    return (total[samples:] - total[:-samples]) / samples
+
+
+# Frame times of the sim: frame durations jitter around 1 / rate and the sim stalls now and then. With a simulation
+# rate above 1 the middle half of the cruise (given in simulation time) runs accelerated. Returns the simulation time,
+# the simulation time step and the simulation rate of every frame.
+def frame_times(duration, rate, rng, accelerated=None, simulation_rate=1):
+    speedup = (accelerated[1] - accelerated[0]) * (1 - 1 / simulation_rate) if accelerated else 0
+    count = int((duration - speedup) * rate * 1.05) + 2
+    real_dt = 1 / rate * rng.uniform(0.85, 1.15, count)
+    real_dt[rng.integers(0, count, max(count // 20000, 1))] = 0.25
+    real = np.concatenate(([0.0], np.cumsum(real_dt)))
+    sim_rate = np.ones(len(real), dtype=np.float32)
+    if accelerated:
+        start = accelerated[0]
+        stop = start + (accelerated[1] - accelerated[0]) / simulation_rate
+        time = np.where(real < start, real, np.where(real < stop, start + (real - start) * simulation_rate,
+                                                     real + speedup))
+        sim_rate[(real >= start) & (real < stop)] = simulation_rate
+    else:
+        time = real
+    count = int(np.searchsorted(time, duration, side='right'))
+    time = time[:count]
+    return time, np.diff(time, prepend=0.0), sim_rate[:count]
+
+
+# Plans the flight: the times of its events in seconds from the start of the recording and the altitudes.
+def flight_plan(duration, rng):
+    if duration < MIN_DURATION:
+        raise ValueError("A synthetic flight takes at least {} seconds".format(MIN_DURATION))
+    scale = min(1.0, duration / 7200)
+    plan = {'departure_elevation': float(rng.uniform(0, 1500)), 'arrival_elevation': float(rng.uniform(0, 1500))}
+    plan['roll'] = TAXI_OUT * scale
+    plan['liftoff'] = plan['roll'] + TAKEOFF_ROLL
+    plan['end'] = duration
+    plan['stop'] = duration - TAXI_IN * scale
+    plan['touchdown'] = plan['stop'] - LANDING_ROLL
+    plan['glide_slope'] = plan['touchdown'] - APPROACH_HEIGHT / GLIDE_SLOPE_RATE * 60
+    plan['level'] = plan['glide_slope'] - APPROACH_LEVEL
+    # highest cruise altitude leaving at least 40% of the time between liftoff and approach for the cruise
+    available = 0.6 * (plan['level'] - plan['liftoff'])
+    approach_altitude = plan['arrival_elevation'] + APPROACH_HEIGHT
+    altitude = ((available + plan['departure_elevation'] * 60 / CLIMB_RATE + approach_altitude * 60 / DESCENT_RATE)
+                / (60 / CLIMB_RATE + 60 / DESCENT_RATE))
+    plan['cruise_altitude'] = float(min(MAX_CRUISE_ALTITUDE, max(5000, altitude // 1000 * 1000)))
+    plan['acceleration'] = plan['liftoff'] + 1500 / CLIMB_RATE * 60
+    plan['autopilot'] = plan['liftoff'] + 60
+    plan['top_of_climb'] = plan['liftoff'] + (plan['cruise_altitude'] - plan['departure_elevation']) / CLIMB_RATE * 60
+    plan['final_altitude'] = plan['cruise_altitude']
+    plan['top_of_descent'] = plan['level'] - (plan['cruise_altitude'] - approach_altitude) / DESCENT_RATE * 60
+    plan['step_climb'] = None
+    if plan['top_of_descent'] - plan['top_of_climb'] > 3 * 3600 and plan['cruise_altitude'] + STEP_CLIMB <= 39000:
+        plan['step_climb'] = (plan['top_of_climb'] + plan['top_of_descent']) / 2
+        plan['final_altitude'] = plan['cruise_altitude'] + STEP_CLIMB
+        plan['top_of_descent'] -= STEP_CLIMB / DESCENT_RATE * 60
+    plan['land'] = plan['glide_slope'] + (APPROACH_HEIGHT - 400) / GLIDE_SLOPE_RATE * 60
+    plan['flare'] = plan['glide_slope'] + (APPROACH_HEIGHT - 40) / GLIDE_SLOPE_RATE * 60
+    plan['retard'] = plan['glide_slope'] + (APPROACH_HEIGHT - 20) / GLIDE_SLOPE_RATE * 60
+    plan['approach'] = plan['level'] + 10
+    # half of the flights are landed manually, the AP is disconnected at 1000 ft
+    plan['autoland'] = bool(rng.random() < 0.5)
+    plan['disconnect'] = (plan['touchdown'] + 20 if plan['autoland'] else
+                          plan['glide_slope'] + (APPROACH_HEIGHT - 1000) / GLIDE_SLOPE_RATE * 60)
+    return plan
+
+
+# Altitude above mean sea level in feet.
+def altitude_profile(time, plan):
+    times = [0, plan['liftoff'], plan['top_of_climb']]
+    altitudes = [plan['departure_elevation'], plan['departure_elevation'], plan['cruise_altitude']]
+    if plan['step_climb']:
+        times += [plan['step_climb'], plan['step_climb'] + STEP_CLIMB / 1000 * 60]
+        altitudes += [plan['cruise_altitude'], plan['final_altitude']]
+    approach_altitude = plan['arrival_elevation'] + APPROACH_HEIGHT
+    times += [plan['top_of_descent'], plan['level'], plan['glide_slope'], plan['touchdown'], plan['end']]
+    altitudes += [plan['final_altitude'], approach_altitude, approach_altitude, plan['arrival_elevation'],
+                  plan['arrival_elevation']]
+    return np.interp(time, times, altitudes)
+
+
+# Indicated airspeed in knots: taxi, takeoff roll, speed schedule by altitude (limited by M 0.78 up high), approach and
+# landing roll.
+def speed_profile(time, plan, height, altitude):
+    climb = np.interp(height, [0, 1500, 3000, 10000, 10500], [150, 180, 250, 250, 290])
+    descent = np.interp(height, [APPROACH_HEIGHT, 6000, 10000, 10500], [210, 250, 250, 290])
+    airborne = np.where(time < plan['top_of_descent'], climb, descent)
+    airborne = np.minimum(airborne, 290 - np.maximum(altitude - 25000, 0) * 0.004)
+    approach = np.interp(time, [plan['level'], plan['glide_slope'], plan['touchdown'], plan['stop']],
+                         [210, VAPP + 5, VAPP - 3, 20])
+    taxi = np.where((time < 60) | (time > plan['end'] - 30), 0.0, 15.0)
+    roll = np.interp(time, [plan['roll'], plan['liftoff']], [0, 150])
+    return np.select([time < plan['roll'], time < plan['liftoff'], time < plan['level'], time < plan['stop']],
+                     [taxi, roll, airborne, approach], taxi)
+
+
+# Magnetic heading in degrees: turns at a standard rate in the air (a few course changes en route, the intercept of
+# the localizer) and faster on the ground while taxiing.
+def heading_profile(time, plan, rng):
+    runway = float(rng.uniform(0, 360))
+    turns = [(30.0, runway - 90), (plan['roll'] - 60, 90.0)]
+    turns.append((plan['liftoff'] + 90, float(rng.uniform(-90, 90))))
+    for start in np.arange(plan['top_of_climb'], plan['top_of_descent'], float(rng.uniform(900, 2400))):
+        turns.append((start, float(rng.uniform(-30, 30))))
+    turns.append((plan['level'] - 120, float(rng.uniform(-60, 60))))
+    # 30 degree localizer intercept
+    turns.append((plan['level'] + 30, 30.0))
+    turns.append((plan['glide_slope'] - 60, -30.0))
+    turns.append((plan['stop'] + 20, 90.0))
+    heading = np.full(len(time), runway)
+    for start, change in turns:
+        rate = 10.0 if start < plan['liftoff'] or start > plan['touchdown'] else 1.5
+        heading += np.clip((time - start) * rate, 0, abs(change)) * np.sign(change)
+    return heading
+
+
+# Adds a position to every sample by flying the ground speed along the heading from a random start.
+def track_profile(heading, ground_speed, dt, rng):
+    distance = ground_speed * 1852 / 3600 * dt
+    north = np.cumsum(distance * np.cos(np.radians(heading)))
+    east = np.cumsum(distance * np.sin(np.radians(heading)))
+    lat = float(rng.uniform(35, 60)) + np.degrees(north / 6371000.0)
+    lon = float(rng.uniform(-10, 30)) + np.degrees(east / (6371000.0 * np.cos(np.radians(lat))))
+    return lat, lon
+
+
+# Temperature (K) and pressure (mbar) of the standard atmosphere at an altitude in feet.
+def atmosphere(altitude):
+    temperature = np.maximum(288.15 - 0.0019812 * altitude, 216.65)
+    pressure = np.where(altitude < 36089, 1013.25 * (temperature / 288.15) ** 5.256,
+                        226.32 * np.exp(-(altitude - 36089) / 20806))
+    return temperature, pressure
+
+
+# Computes the fields of a synthetic flight. Returns the fields by full name and the fields recorded by several parts
+# of the system under the same name (e.g. ap_sm.data.V_ias_kn and athr.data.V_ias_kn) by their last name part.
+def flight_fields(duration, rate, seed, simulation_rate=1):
+    rng = np.random.default_rng(seed)
+    plan = flight_plan(duration, rng)
+    accelerated = None
+    if simulation_rate > 1:
+        quarter = (plan['top_of_descent'] - plan['top_of_climb']) / 4
+        accelerated = (plan['top_of_climb'] + quarter, plan['top_of_descent'] - quarter)
+    time, dt, sim_rate = frame_times(duration, rate, rng, accelerated, simulation_rate)
+    count = len(time)
+    second = max(int(rate), 1)
+
+    def noise(amplitude, seconds=1.0):
+        return smooth(rng.normal(0, amplitude, count), seconds * second) * np.sqrt(seconds * second)
+
+    def at(times, values):
+        return steps(time, times, values)
+
+    altitude = altitude_profile(time, plan)
+    ground_elevation = np.where(time < plan['top_of_descent'], plan['departure_elevation'], plan['arrival_elevation'])
+    height = np.maximum(altitude - ground_elevation, 0)
+    on_ground = (time < plan['liftoff']) | (time >= plan['touchdown'])
+    vertical_speed = smooth(np.gradient(altitude, time) * 60, 3 * second)
+    ias = smooth(speed_profile(time, plan, height, altitude), 5 * second)
+    ias = np.maximum(ias + noise(0.3) * ~on_ground, 0)
+    temperature, pressure = atmosphere(altitude)
+    isa = temperature - 273.15
+    oat = isa + float(rng.uniform(-10, 15))
+    tas = ias * (1 + 0.02 * altitude / 1000)
+    mach = tas / (661.47 * np.sqrt(temperature / 288.15))
+    tat = (oat + 273.15) * (1 + 0.2 * mach ** 2) - 273.15
+    wind = 5 + altitude / 1000 * 1.5 + noise(0.5, 10)
+    wind_direction = float(rng.uniform(0, 360))
+    heading = heading_profile(time, plan, rng)
+    headwind = wind * np.cos(np.radians(wind_direction - heading))
+    ground_speed = np.maximum(tas - headwind * ~on_ground, 0)
+    lat, lon = track_profile(heading, ground_speed, dt, rng)
+    turn_rate = np.gradient(heading, time)
+    bank = np.clip(np.degrees(np.arctan(tas * 0.5144 * np.radians(turn_rate) / 9.81)), -25, 25) * ~on_ground
+    bank = smooth(bank, 2 * second) + noise(0.2) * ~on_ground
+    path_angle = np.degrees(np.arcsin(np.clip(vertical_speed / 60 / np.maximum(tas * 1.688, 1), -1, 1)))
+    alpha = np.interp(ias, [120, 160, 250, 300], [9, 6, 3, 2]) * ~on_ground
+    rotation = np.interp(time, [plan['liftoff'] - 4, plan['liftoff']], [0, 1]) * (time < plan['liftoff'])
+    flare = np.interp(time, [plan['flare'], plan['touchdown']], [0, 3]) * (time < plan['touchdown'])
+    pitch = smooth(np.where(on_ground, 0, alpha + path_angle) + 12 * rotation + flare, second) + noise(0.1)
+    nz = 1 / np.cos(np.radians(bank)) + noise(0.01)
+    touchdown = np.searchsorted(time, plan['touchdown'])
+    nz[touchdown:touchdown + second // 2] += float(rng.uniform(0.1, 0.45))
+    track = (heading + float(rng.uniform(-3, 3)) * ~on_ground) % 360
+    heading %= 360
+
+    # thrust levers: FLX for takeoff, CL from the thrust reduction altitude, idle at the retard, reversers on landing
+    reverse = (time >= plan['touchdown'] + 1) & (time < plan['touchdown'] + 16)
+    thrust_reduction = plan['acceleration'] + 5
+    tla = at([0, plan['roll'], thrust_reduction, plan['retard'], plan['touchdown'] + 1, plan['touchdown'] + 16],
+             [0, 35, 25, 0, -20, 0])
+    n1_target = at([0, plan['roll'], thrust_reduction, plan['top_of_climb'], plan['top_of_descent'], plan['level'],
+                    plan['retard'], plan['touchdown'] + 1, plan['touchdown'] + 16],
+                   [19.5, 85, 88, 82, 25, 50, 22, 70, 19.5]).astype(np.float64)
+    if plan['step_climb']:
+        n1_target[(time >= plan['step_climb']) & (time < plan['step_climb'] + STEP_CLIMB / 1000 * 60)] = 88
+    n1 = smooth(n1_target, 5 * second) + noise(0.05)
+    fuel_flow = 200 + (n1 / 100) ** 3 * 3300
+    fuel = 5000 + duration / 3600 * 2600 - np.cumsum(2 * fuel_flow / 3600 * dt)
+    weight = 62000 + fuel
+
+    # autopilot, flight director and autothrust modes
+    vertical_mode = fdr_events.VerticalMode
+    lateral_mode = fdr_events.LateralMode
+    athr_mode = fdr_events.AutothrustMode
+    cruise_mode = athr_mode.MACH if plan['cruise_altitude'] > 25000 else athr_mode.SPEED
+    vertical = [(0, vertical_mode.NONE), (plan['roll'], vertical_mode.SRS), (plan['acceleration'], vertical_mode.CLB),
+                (plan['top_of_climb'] - 20, vertical_mode.ALT_CPT), (plan['top_of_climb'], vertical_mode.ALT)]
+    athr = [(0, athr_mode.NONE), (plan['roll'], athr_mode.MAN_FLEX), (thrust_reduction, athr_mode.THR_CLB),
+            (plan['top_of_climb'] - 20, cruise_mode)]
+    requested = fdr_events.AutothrustRequestedMode
+    athr_requested = [(0, requested.NONE), (plan['acceleration'], requested.THRUST_CLB),
+                      (plan['top_of_climb'] - 20, requested.SPEED)]
+    if plan['step_climb']:
+        level_off = plan['step_climb'] + STEP_CLIMB / 1000 * 60
+        vertical += [(plan['step_climb'], vertical_mode.OP_CLB), (level_off - 10, vertical_mode.ALT_CPT),
+                     (level_off, vertical_mode.ALT)]
+        athr += [(plan['step_climb'], athr_mode.THR_CLB), (level_off - 10, cruise_mode)]
+        athr_requested += [(plan['step_climb'], requested.THRUST_CLB), (level_off - 10, requested.SPEED)]
+    vertical += [(plan['top_of_descent'], vertical_mode.DES), (plan['level'] - 15, vertical_mode.ALT_CPT),
+                 (plan['level'], vertical_mode.ALT), (plan['glide_slope'] - 5, vertical_mode.GS_CPT),
+                 (plan['glide_slope'] + 20, vertical_mode.GS_TRACK), (plan['land'], vertical_mode.LAND),
+                 (plan['flare'], vertical_mode.FLARE), (plan['touchdown'], vertical_mode.ROLLOUT),
+                 (plan['stop'], vertical_mode.NONE)]
+    athr += [(plan['top_of_descent'], athr_mode.THR_IDLE), (plan['level'] - 15, athr_mode.SPEED),
+             (plan['retard'], athr_mode.THR_IDLE), (plan['touchdown'], athr_mode.NONE)]
+    athr_requested += [(plan['top_of_descent'], requested.THRUST_IDLE), (plan['level'] - 15, requested.SPEED),
+                       (plan['touchdown'], requested.NONE)]
+    lateral = [(0, lateral_mode.NONE), (plan['roll'], lateral_mode.RWY), (plan['liftoff'] + 2, lateral_mode.NAV),
+               (plan['glide_slope'] - 40, lateral_mode.LOC_CPT), (plan['glide_slope'] - 10, lateral_mode.LOC_TRACK),
+               (plan['land'], lateral_mode.LAND), (plan['flare'], lateral_mode.FLARE),
+               (plan['touchdown'], lateral_mode.ROLLOUT), (plan['stop'], lateral_mode.NONE)]
+    vertical_arm = fdr_events.VerticalArmed
+    vertical_armed = [(0, vertical_arm.NONE), (plan['roll'], vertical_arm.CLB),
+                      (plan['acceleration'], vertical_arm.ALT),
+                      (plan['top_of_climb'] - 20, vertical_arm.NONE), (plan['top_of_descent'], vertical_arm.ALT),
+                      (plan['level'] - 15, vertical_arm.NONE), (plan['approach'], vertical_arm.GS),
+                      (plan['glide_slope'] - 5, vertical_arm.NONE)]
+    lateral_arm = fdr_events.LateralArmed
+    lateral_armed = [(0, lateral_arm.NONE), (plan['roll'], lateral_arm.NAV), (plan['liftoff'] + 2, lateral_arm.NONE),
+                     (plan['approach'], lateral_arm.LOC), (plan['glide_slope'] - 40, lateral_arm.NONE)]
+    vertical = modes(time, vertical)
+    lateral = modes(time, lateral)
+    athr = modes(time, athr)
+    status = fdr_events.AutothrustStatus
+    athr_status = at([0, plan['roll'], thrust_reduction, plan['touchdown']],
+                     [status.DISENGAGED.value, status.ENGAGED_ARMED.value, status.ENGAGED_ACTIVE.value,
+                      status.DISENGAGED.value]).astype(np.int8)
+    ap_on = (time >= plan['autopilot']) & (time < plan['disconnect'])
+    phase = fdr_events.FlightPhase
+    flight_phase = at([0, plan['roll'], plan['acceleration'], plan['top_of_climb'], plan['top_of_descent'],
+                       plan['level'], plan['stop']],
+                      [phase.PREFLIGHT.value, phase.TAKEOFF.value, phase.CLIMB.value, phase.CRUISE.value,
+                       phase.DESCENT.value, phase.APPROACH.value, phase.DONE.value]).astype(np.int8)
+
+    # aircraft configuration and brakes
+    flaps = at([0, plan['roll'] - 300, plan['liftoff'] + 3000 / CLIMB_RATE * 60, plan['level'],
+                plan['level'] + 60, plan['glide_slope'] + 30, plan['glide_slope'] + 90, plan['stop']],
+               [0, 1, 0, 1, 2, 3, 4, 0]).astype(np.int8)
+    gear_down = (time < plan['liftoff'] + 5) | (time >= plan['glide_slope'])
+    spoilers_armed = (time >= plan['glide_slope']) & (time < plan['touchdown'])
+    spoilers = ((time >= plan['touchdown']) & (time < plan['stop'])).astype(np.float32)
+    park_brake = (time < 60) | (time > plan['end'] - 30)
+    pedals = np.clip(noise(0.3, 5), 0, 1) * ((time < plan['roll']) | (time > plan['stop'])) * ~park_brake
+    braking = np.clip(np.interp(time, [plan['touchdown'] + 2, plan['touchdown'] + 5], [0, 0.6]), 0, 0.6) * (
+        time < plan['stop'])
+    approach_mode = (time >= plan['approach']) & (time < plan['stop'])
+    ils = (time >= plan['level'] - 300) & (time < plan['stop'])
+
+    # side stick and rudder: still while the AP flies, rotation and flare and small corrections otherwise
+    manual = ~ap_on & ~on_ground
+    elevator = noise(0.02, 2) * manual - 0.5 * rotation - 0.3 * (flare / 3)
+    aileron = noise(0.03, 2) * manual
+    rudder = noise(0.05, 2) * ((time >= plan['roll']) & (time < plan['liftoff'] + 5) | reverse)
+
+    # localizer and glide slope deviations converging at the capture
+    loc_error = np.interp(time, [plan['level'], plan['glide_slope'] - 40, plan['glide_slope']], [2.5, 1.5, 0])
+    gs_error = np.interp(time, [plan['level'], plan['glide_slope'] - 5, plan['glide_slope'] + 20], [-0.8, -0.3, 0])
+    approach_altitude = plan['arrival_elevation'] + APPROACH_HEIGHT
+    distance = np.hypot((lat - lat[touchdown]) * 60, (lon - lon[touchdown]) * 60 * np.cos(np.radians(lat)))
+
+    shared = {
+        'H_ft': altitude, 'H_ind_ft': altitude, 'H_radio_ft': height, 'H_dot_ft_min': vertical_speed,
+        'H_dot_fpm': vertical_speed, 'Phi_deg': bank, 'Theta_deg': pitch, 'Psi_magnetic_deg': heading,
+        'Psi_magnetic_track_deg': track, 'Psi_true_deg': heading, 'V_gnd_kn': ground_speed, 'V_ias_kn': ias,
+        'V_mach': mach, 'V_tas_kn': tas, 'alpha_deg': alpha + noise(0.1) * ~on_ground, 'beta_deg': noise(0.1),
+        'on_ground': on_ground, 'nz_g': nz, 'ISA_degC': isa, 'OAT_degC': oat, 'TAT_degC': tat,
+        'flaps_handle_index': flaps, 'flap_handle_index': flaps, 'total_weight_kg': weight,
+        'throttle_lever_1_pos': tla, 'throttle_lever_2_pos': tla, 'TLA_1_deg': tla, 'TLA_2_deg': tla,
+        'FD_active': np.ones(count, dtype=bool), 'time_since_touchdown': np.maximum(time - plan['touchdown'], 0),
+        'is_FLX_active': time < thrust_reduction, 'V_c_kn': smooth(ias, 10 * second),
+        'thrust_reduction_altitude': np.full(count, plan['departure_elevation'] + 1500),
+    }
+    fields = {
+        fdr_data.TIME_COLUMN: time, 'ap_sm.time.dt': dt, 'data.simulation_rate': sim_rate,
+        'ap_sm.data.aircraft_position.lat': lat, 'ap_sm.data.aircraft_position.lon': lon,
+        'ap_sm.data.aircraft_position.alt': altitude, 'ap_sm.data.flight_phase': flight_phase,
+        'ap_sm.data.V2_kn': np.full(count, V2), 'ap_sm.data.VAPP_kn': np.full(count, VAPP),
+        'ap_sm.data.VLS_kn': np.full(count, VLS),
+        'ap_sm.data.acceleration_altitude': np.full(count, plan['departure_elevation'] + 1500),
+        'ap_sm.data.cruise_altitude': np.full(count, plan['cruise_altitude']),
+        'ap_sm.data.is_flight_plan_available': np.ones(count, dtype=bool),
+        'ap_sm.data.nav_valid': ils, 'ap_sm.data.nav_loc_valid': ils, 'ap_sm.data.nav_gs_valid': ils,
+        'ap_sm.data.nav_e_loc_valid': ils, 'ap_sm.data.nav_e_gs_valid': ils, 'ap_sm.data.nav_dme_valid': ils,
+        'ap_sm.data.nav_dme_nmi': distance * ils, 'ap_sm.data.nav_loc_error_deg': loc_error * ils,
+        'ap_sm.data.nav_e_loc_error_deg': loc_error * ils, 'ap_sm.data.nav_gs_error_deg': gs_error * ils,
+        'ap_sm.data.nav_e_gs_error_deg': gs_error * ils,
+        'ap_sm.data.nav_loc_position.lat': np.full(count, lat[touchdown]),
+        'ap_sm.data.nav_loc_position.lon': np.full(count, lon[touchdown]),
+        'ap_sm.data.nav_gs_position.lat': np.full(count, lat[touchdown]),
+        'ap_sm.data.nav_gs_position.lon': np.full(count, lon[touchdown]),
+        'ap_sm.data_computed.time_since_lift_off': np.where(on_ground, 0, time - plan['liftoff']),
+        'ap_sm.data_computed.time_since_SRS': (time - plan['roll']) * (vertical == vertical_mode.SRS.value),
+        'ap_law.ap_on': ap_on, 'ap_sm.output.enabled_AP1': ap_on, 'ap_sm.output.enabled_AP2': np.zeros(count, bool),
+        'ap_sm.input.AP_1_push': pulses(time, [plan['autopilot']]),
+        'ap_sm.input.AP_DISCONNECT_push': pulses(time, [plan['disconnect']]),
+        'ap_sm.input.APPR_push': pulses(time, [plan['approach']]),
+        'ap_sm.input.ATHR_engaged': athr_status != status.DISENGAGED.value,
+        'ap_sm.input.H_fcu_ft': at([0, plan['top_of_descent'] - 60],
+                                   [plan['final_altitude'], (approach_altitude + 99) // 100 * 100]),
+        'ap_sm.input.Psi_fcu_deg': heading, 'ap_sm.input.is_SPEED_managed': np.ones(count, dtype=bool),
+        'ap_sm.output.vertical_mode': vertical, 'ap_sm.vertical.output.mode': vertical,
+        'ap_sm.vertical_previous.output.mode': vertical,
+        'ap_sm.output.vertical_mode_armed': modes(time, vertical_armed),
+        'ap_sm.output.lateral_mode': lateral, 'ap_sm.lateral.output.mode': lateral,
+        'ap_sm.lateral_previous.output.mode': lateral,
+        'ap_sm.output.lateral_mode_armed': modes(time, lateral_armed),
+        'ap_sm.output.autothrust_mode': modes(time, athr_requested),
+        'ap_sm.vertical.output.mode_autothrust': modes(time, athr_requested),
+        'ap_sm.output.V_c_kn': smooth(ias, 10 * second), 'ap_sm.output.H_c_ft': altitude,
+        'ap_sm.output.Psi_c_deg': heading, 'ap_sm.vertical.condition.SRS': vertical == vertical_mode.SRS.value,
+        'ap_sm.vertical.condition.LAND': vertical == vertical_mode.LAND.value,
+        'ap_sm.lateral.condition.LAND': lateral == lateral_mode.LAND.value,
+        'athr.output.status': athr_status, 'athr.output.mode': athr,
+        'athr.output.mode_message': at([0, plan['acceleration'], thrust_reduction],
+                                       [0, fdr_events.AutothrustModeMessage.LVRCLB.value, 0]),
+        'athr.output.thrust_limit_type': at([0, thrust_reduction, plan['touchdown'] + 1, plan['touchdown'] + 16],
+                                            [3, 1, 5, 1]),
+        'athr.input.ATHR_disconnect': pulses(time, [plan['touchdown'] + 1]),
+        'athr.input.is_SRS_TO_mode_active': vertical == vertical_mode.SRS.value,
+        'athr.input.is_approach_mode_active': approach_mode,
+        'athr.input.is_mach_mode_active': athr == athr_mode.MACH.value,
+        'athr.input.mode_requested': modes(time, athr_requested),
+        'athr.output.is_in_reverse_1': reverse, 'athr.output.is_in_reverse_2': reverse,
+        'athr.output.sim_throttle_lever_1_pos': tla, 'athr.output.sim_throttle_lever_2_pos': tla,
+        'athr.output.N1_TLA_1_percent': n1_target, 'athr.output.N1_TLA_2_percent': n1_target,
+        'athr.output.N1_c_1_percent': n1_target, 'athr.output.N1_c_2_percent': n1_target,
+        'athr.output.thrust_limit_percent': np.where(time < thrust_reduction, 85.0, 88.0),
+        'athr.data.commanded_engine_N1_1_percent': n1_target, 'athr.data.commanded_engine_N1_2_percent': n1_target,
+        'athr.data.engine_N1_1_percent': n1, 'athr.data.engine_N1_2_percent': n1,
+        'athr.data.is_engine_operative_1': np.ones(count, dtype=bool),
+        'athr.data.is_engine_operative_2': np.ones(count, dtype=bool),
+        'athr.data.ambient_density_kg_per_m3': pressure * 100 / (287.05 * temperature),
+        'athr.data_computed.TLA_in_active_range': (tla > 0) & (tla <= 25),
+        'engine.engineEngine1N1': n1, 'engine.engineEngine2N1': n1,
+        'engine.engineEngine1N2': 58 + 0.42 * n1, 'engine.engineEngine2N2': 58 + 0.42 * n1,
+        'engine.engineEngine1EGT': 380 + 5.5 * n1, 'engine.engineEngine2EGT': 380 + 5.5 * n1,
+        'engine.engineEngine1FF': fuel_flow, 'engine.engineEngine2FF': fuel_flow,
+        'engine.engineEngine1State': np.ones(count), 'engine.engineEngine2State': np.ones(count),
+        'engine.engineFuelUsedLeft': np.cumsum(fuel_flow / 3600 * dt),
+        'engine.engineFuelUsedRight': np.cumsum(fuel_flow / 3600 * dt),
+        'engine.fuelTankQuantityTotal': fuel / 3.04, 'engine.fuelWeightPerGallon': np.full(count, 6.7),
+        'engine.simOnGround': on_ground, 'engine.standardAtmTemperature': isa,
+        'data.gear_handle_pos': gear_down.astype(np.float32), 'data.park_brake_lever_pos': park_brake,
+        'data.flaps_handle_percent': flaps / 4, 'data.flaps_handle_sim_index': flaps,
+        'data.flaps_handle_configuration_index': flaps, 'data.spoilers_armed': spoilers_armed,
+        'data.spoilers_handle_pos': spoilers, 'data.spoilers_handle_sim_pos': spoilers,
+        'data.ground_spoilers_active': spoilers > 0, 'data.brake_pedal_left_pos': pedals,
+        'data.brake_pedal_right_pos': pedals, 'data.brake_left_sim_pos': np.maximum(pedals, braking),
+        'data.brake_right_sim_pos': np.maximum(pedals, braking),
+        'data.autobrake_armed_mode': at([0, plan['level'], plan['stop']], [0, 2, 0]),
+        'data.autobrake_decel_light': braking > 0.5,
+        'data.hydraulic_blue_pressure': np.full(count, 3000), 'data.hydraulic_green_pressure': np.full(count, 3000),
+        'data.hydraulic_yellow_pressure': np.full(count, 3000),
+        'data.corrected_engine_N1_1_percent': n1, 'data.corrected_engine_N1_2_percent': n1,
+        'data.inputElevator': elevator, 'data.inputAileron': aileron, 'data.inputRudder': rudder,
+        'data.ambient_wind_velocity_kn': wind, 'data.ambient_pressure_mbar': pressure,
+        'data.total_air_temperature_celsius': tat, 'data.ice_structure_percent': np.zeros(count),
+    }
+    return fields, shared
+
+
+# Returns the value of a field for every sample: the computed value or zeros for the fields the synthetic flight does
+# not model, in the compact type of the field schema.
+def field_values(field, fields, shared, count):
+    values = fields.get(field)
+    if values is None:
+        values = shared.get(field.rsplit('.', 1)[-1])
+    dtype = fdr_schema.field_type(field)
+    if values is None:
+        return np.zeros(count, dtype=dtype)
+    return np.asarray(values).astype(dtype)
+
+
+# Yields the flight in frames of CHUNK_ROWS rows.
+def synthetic_chunks(columns, fields, shared):
+    count = len(fields[fdr_data.TIME_COLUMN])
+    values = {column: field_values(column, fields, shared, count) for column in columns}
+    for start in range(0, count, CHUNK_ROWS):
+        yield pd.DataFrame({column: values[column][start:start + CHUNK_ROWS] for column in columns})
+
+
+# Writes frames into a CSV file like fdr2csv (booleans as 0 and 1).
+def write_csv(path, chunks):
+    tmpfile = path + '.tmp'
+    with open(tmpfile, 'w', newline='') as file:
+        header = True
+        for chunk in chunks:
+            for column in chunk.columns[chunk.dtypes == bool]:
+                chunk[column] = chunk[column].astype(np.uint8)
+            chunk.to_csv(file, header=header, index=False)
+            header = False
+    os.replace(tmpfile, path)
+    return path
+
+
+# Writes frames into a Parquet file like the built-in decoder, one row group per frame.
+def write_parquet(path, chunks):
+    tmpfile = path + '.tmp'
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(tmpfile, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmpfile, path)
+    return path
+
+
+# Writes one synthetic flight to path (.csv or .parquet) and returns the path. With cache a columnar cache is written
+# next to a CSV file, with store a memory mapped store next to the file.
+def write_flight(path, duration, rate=DEFAULT_RATE, seed=0, v23_only=False, simulation_rate=1, cache=False,
+                 store=False):
+    columns = synthetic_fields(v23_only)
+    fields, shared = flight_fields(duration, rate, seed, simulation_rate)
+    if fdr_data.is_parquet(path):
+        if pyarrow is None:
+            raise ValueError("pyarrow is needed to write Parquet files")
+        write_parquet(path, synthetic_chunks(columns, fields, shared))
+    else:
+        write_csv(path, synthetic_chunks(columns, fields, shared))
+        if cache:
+            fdr_data.write_cache(path)
+    if store:
+        fdr_store.write_store(fdr_store.store_path(path), synthetic_chunks(columns, fields, shared))
+    return path
+
+
+# File name of the number-th synthetic file, named like the recordings so the directory tools find it.
+def flight_file(directory, number, extension='csv'):
+    start = START_TIME + timedelta(days=number)
+    return os.path.join(directory, start.strftime('%Y-%m-%d-%H-%M-%S') + '.' + extension)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Synthetic FDR files')
+    parser.add_argument('-d', '-directory', dest='directory', default='.', help='Output directory (default: .)')
+    parser.add_argument('-duration', default='1h',
+                        help='Flight duration: 1h, 5h, 12h or a number of seconds, minutes (90min) or hours (2.5h)')
+    parser.add_argument('-rate', type=float, default=DEFAULT_RATE,
+                        help='Frames per second of the sim (default: {})'.format(DEFAULT_RATE))
+    parser.add_argument('-count', type=int, default=1, help='Number of files, one flight each (default: 1)')
+    parser.add_argument('-seed', type=int, default=0, help='Seed of the first file (default: 0)')
+    parser.add_argument('-format', choices=['csv', 'parquet'], default='csv', help='File format (default: csv)')
+    parser.add_argument('-cache', action='store_true', help='Also write the columnar cache of CSV files')
+    parser.add_argument('-store', action='store_true', help='Also write the memory mapped store')
+    parser.add_argument('-simrate', type=float, default=1,
+                        help='Simulation rate of the middle of the cruise (default: 1)')
+    parser.add_argument('-v23', action='store_true', help='Only the v23 fields, without the later data.* fields')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    duration = parse_duration(args.duration)
+    for number in range(args.count):
+        path = flight_file(args.directory, number, args.format)
+        write_flight(path, duration, args.rate, args.seed + number, args.v23, args.simrate, args.cache, args.store)
+        print("Written {} ({:.1f} MB)".format(path, os.path.getsize(path) / 1e6))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
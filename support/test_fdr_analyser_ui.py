@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import fdr_synthetic
+
+UI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fdr_analyser_ui.py')
+
+
+# Runs the UI script with the given arguments and input and returns the finished process.
+def run_ui(arguments, stdin=''):
+    return subprocess.run([sys.executable, UI_SCRIPT] + arguments, input=stdin, capture_output=True, text=True,
+                          env=dict(os.environ, MPLBACKEND='Agg'), timeout=300)
+
+
+class CommandLineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.csvfile = fdr_synthetic.write_flight(fdr_synthetic.flight_file(cls.directory.name, 0),
+                                                 fdr_synthetic.MIN_DURATION, rate=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    # -cl has no -c command, -phase must not be checked against one before the menu opens
+    def test_commandline_with_phase(self):
+        result = run_ui(['-cl', '-csv', self.csvfile, '-phase', 'approach'], '0\n')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('Exit', result.stdout)
+
+    def test_phase_rejected_for_cache(self):
+        result = run_ui(['-c', 'cache', '-csv', self.csvfile, '-phase', 'approach'])
+        self.assertIn('-phase does not apply to the cache command', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()